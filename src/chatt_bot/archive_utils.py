@@ -0,0 +1,145 @@
+"""
+Module that contains archive utilities, such as parallel zip extraction.
+"""
+# Native libraries
+import concurrent.futures
+import fnmatch
+import os
+import shutil
+import threading
+import time
+import zipfile
+import zlib
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def file_matches_member(
+        file_name,
+        member_info
+):
+    """
+    Function that checks whether a file on disk already matches a zip member,
+    comparing size first and CRC-32 only if sizes match.
+
+    :param str file_name:
+            The extracted file on disk.
+    :param zipfile.ZipInfo member_info:
+            The zip member.
+    :return: bool:
+            True if the file has the member's size and CRC-32.
+    """
+    if not os.path.isfile(file_name) or os.path.getsize(file_name) != member_info.file_size:
+        return False
+    file_crc = 0
+    with open(file_name, 'rb') as existing_file:
+        for block in iter(lambda: existing_file.read(COPY_BUFFER_SIZE), b''):
+            file_crc = zlib.crc32(block, file_crc)
+    return file_crc == member_info.CRC
+
+
+def get_member_destination(
+        destination,
+        member_name
+):
+    """
+    Function that returns where a member is extracted, refusing paths
+    that would escape the destination folder.
+
+    :param str destination:
+            The extraction folder.
+    :param str member_name:
+            The member's name within the archive.
+    :return: str:
+            The member's destination path.
+    """
+    destination = os.path.abspath(destination)
+    member_destination = os.path.abspath(os.path.join(destination, member_name))
+    if os.path.commonpath([destination, member_destination]) != destination:
+        raise ValueError(
+            f"Archive member '{member_name}' would be extracted outside of '{destination}'."
+        )
+    return member_destination
+
+
+def extract_zip_archive(
+        archive_path,
+        destination,
+        patterns=None,
+        max_workers=4,
+        skip_unchanged=True
+):
+    """
+    Function that extracts a zip archive straight from disk, decompressing
+    members in parallel without temporary copies.
+
+    :param str archive_path:
+            Location of the zip archive.
+    :param str destination:
+            Folder the members are extracted into.
+    :param list patterns:
+            Glob patterns (e.g. ['*.csv']) members must match. If None, extracts all.
+    :param int max_workers:
+            Number of members extracted at once.
+    :param bool skip_unchanged:
+            Whether members whose file on disk already matches in size and
+            CRC-32 are skipped.
+    :return: dict:
+            Number of members matched/extracted/skipped, bytes written,
+            elapsed seconds and MB/s.
+    """
+    patterns = [patterns] if isinstance(patterns, str) else patterns
+    start_time = time.perf_counter()
+    with zipfile.ZipFile(archive_path) as archive:
+        member_infos = [
+            member_info for member_info in archive.infolist()
+            if not member_info.is_dir() and (
+                patterns is None or
+                any(fnmatch.fnmatch(member_info.filename, pattern) for pattern in patterns)
+            )
+        ]
+    summary = {
+        'archive': archive_path,
+        'members': len(member_infos),
+        'extracted': 0,
+        'skipped': 0,
+        'bytes': 0,
+        'elapsed': None,
+        'throughput_mb_s': None
+    }
+    # Each thread reads through its own handle, so members decompress independently.
+    thread_archives = threading.local()
+    open_archives = []
+    open_archives_lock = threading.Lock()
+
+    def extract_member(
+            member_info
+    ):
+        """Function that extracts one member, returning bytes written (None if skipped)."""
+        member_destination = get_member_destination(destination, member_info.filename)
+        if skip_unchanged and file_matches_member(member_destination, member_info):
+            return None
+        if not hasattr(thread_archives, 'archive'):
+            thread_archives.archive = zipfile.ZipFile(archive_path)
+            with open_archives_lock:
+                open_archives.append(thread_archives.archive)
+        os.makedirs(os.path.dirname(member_destination), exist_ok=True)
+        with thread_archives.archive.open(member_info) as member_file, \
+                open(member_destination, 'wb') as extracted_file:
+            shutil.copyfileobj(member_file, extracted_file, COPY_BUFFER_SIZE)
+        return member_info.file_size
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as member_pool:
+            for bytes_written in member_pool.map(extract_member, member_infos):
+                if bytes_written is None:
+                    summary['skipped'] += 1
+                else:
+                    summary['extracted'] += 1
+                    summary['bytes'] += bytes_written
+    finally:
+        for open_archive in open_archives:
+            open_archive.close()
+    summary['elapsed'] = time.perf_counter() - start_time
+    summary['throughput_mb_s'] = summary['bytes'] / (1024 * 1024) / max(summary['elapsed'], 1e-9)
+    return summary
@@ -0,0 +1,208 @@
+"""
+Module that compiles the additional argument specs of chatt_bot workflows into
+typed schemas, which validate, coerce and default a request's arguments.
+
+A spec is either a string, e.g. 'str or list, required' or
+'int, optional, default=4', or a dict, e.g.
+{'type': ['int'], 'required': False, 'default': 4}.
+"""
+# Native libraries
+import json
+
+TRUE_STRINGS = {'true', 'yes', 'y', '1', 'on'}
+FALSE_STRINGS = {'false', 'no', 'n', '0', 'off'}
+
+
+def coerce_bool(
+        value
+):
+    """Function that coerces a value such as 'true', 'no' or 1 to a bool."""
+    if isinstance(value, (int, float)):
+        return bool(value)
+    lowered_value = str(value).strip().lower()
+    if lowered_value in TRUE_STRINGS:
+        return True
+    if lowered_value in FALSE_STRINGS:
+        return False
+    raise ValueError(f'{value!r} is not a boolean.')
+
+
+def coerce_json(
+        expected_type
+):
+    """Function that builds a coercion parsing a JSON string into an expected type."""
+    def coerce(
+            value
+    ):
+        if isinstance(value, (list, tuple)) and expected_type is list:
+            return list(value)
+        coerced_value = json.loads(value) if isinstance(value, str) else value
+        if not isinstance(coerced_value, expected_type):
+            raise ValueError(f'{value!r} is not a {expected_type.__name__}.')
+        return coerced_value
+    return coerce
+
+
+def coerce_int(
+        value
+):
+    """Function that coerces a value to an int, refusing to drop a fraction."""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f'{value!r} is not an integer.')
+    return int(str(value).strip()) if isinstance(value, str) else int(value)
+
+
+ARGUMENT_TYPES = {
+    'str': (str, str),
+    'int': (int, coerce_int),
+    'float': ((int, float), float),
+    'bool': (bool, coerce_bool),
+    'list': (list, coerce_json(list)),
+    'dict': (dict, coerce_json(dict))
+}
+
+
+class ArgumentField:
+    """Class that holds the compiled spec of one additional argument."""
+    __slots__ = ('name', 'type_names', 'required', 'default', 'spec')
+
+    def __init__(
+            self,
+            name,
+            spec
+    ):
+        """
+        Initialization function, that parses the spec.
+
+        :param str name:
+                Name of the argument.
+        :param str,dict spec:
+                The argument's spec, e.g. 'float, optional'.
+        """
+        self.name = name
+        self.spec = spec
+        if isinstance(spec, dict):
+            type_names = spec.get('type', [])
+            type_names = [type_names] if isinstance(type_names, str) else list(type_names)
+            self.required = bool(spec.get('required', 'default' not in spec))
+            self.default = spec.get('default')
+        else:
+            # The default comes last, and may hold commas itself (e.g. default=[1, 2]).
+            flags_text, has_default, default_text = str(spec).partition('default=')
+            type_text, *flag_texts = [part.strip() for part in flags_text.split(',')]
+            type_names = [type_name.strip() for type_name in type_text.split(' or ')]
+            self.required = 'optional' not in flag_texts
+            self.default = None
+            if has_default:
+                default_text = default_text.strip()
+                try:
+                    self.default = json.loads(default_text)
+                except ValueError:
+                    self.default = default_text
+        # Specs with no known type (e.g. free text) accept any value.
+        self.type_names = tuple(
+            type_name for type_name in type_names if type_name in ARGUMENT_TYPES
+        )
+
+    def coerce(
+            self,
+            value
+    ):
+        """
+        Function that checks a value against the argument's types, converting
+        it to the first type it can be converted to if it matches none as is.
+
+        :param value:
+                The value passed for the argument.
+        :return:
+                The (converted) value.
+        """
+        if not self.type_names:
+            return value
+        for type_name in self.type_names:
+            accepted_types, _ = ARGUMENT_TYPES[type_name]
+            # bool is an int subclass, so only accept it where bool is expected.
+            if isinstance(value, accepted_types) and \
+                    (type_name == 'bool' or not isinstance(value, bool)):
+                return value
+        for type_name in self.type_names:
+            _, coerce = ARGUMENT_TYPES[type_name]
+            try:
+                return coerce(value)
+            except (TypeError, ValueError):
+                continue
+        raise ValueError(
+            f"argument '{self.name}' must be {' or '.join(self.type_names)}, got {value!r}."
+        )
+
+
+class ArgumentSchema:
+    """Class that validates the additional arguments of a request in one pass."""
+    def __init__(
+            self,
+            request,
+            arguments
+    ):
+        """
+        Initialization function, that compiles every argument spec.
+
+        :param str request:
+                The request the arguments belong to, used in error messages.
+        :param dict arguments:
+                Argument names mapped to their specs.
+        """
+        self.request = request
+        self.fields = {name: ArgumentField(name, spec) for name, spec in arguments.items()}
+        self.required_names = frozenset(
+            name for name, field in self.fields.items() if field.required
+        )
+        self.defaults = {
+            name: field.default for name, field in self.fields.items()
+            if not field.required and field.default is not None
+        }
+
+    def validate(
+            self,
+            kwargs
+    ):
+        """
+        Function that validates, coerces and defaults a request's arguments,
+        reporting every problem at once.
+
+        :param dict kwargs:
+                The arguments passed for the request.
+        :return: dict:
+                The arguments, converted to their types, with defaults filled in.
+        """
+        # Requests that declare no arguments pass theirs through unchecked.
+        if not self.fields:
+            return dict(kwargs)
+        argument_errors = []
+        unknown_names = [name for name in kwargs if name not in self.fields]
+        if unknown_names:
+            argument_errors.append(
+                f"unknown argument(s) {unknown_names}; "
+                f"defined arguments are {list(self.fields)}."
+            )
+        argument_errors.extend(
+            f"missing the required argument '{name}': {self.fields[name].spec}."
+            for name in sorted(self.required_names.difference(kwargs))
+        )
+        validated_kwargs = dict(self.defaults)
+        for name, value in kwargs.items():
+            field = self.fields.get(name)
+            if field is None:
+                continue
+            if value is None or value == '':
+                argument_errors.append(f"argument '{name}' cannot be in [None, ''].")
+                continue
+            try:
+                validated_kwargs[name] = field.coerce(value)
+            except ValueError as bad_value:
+                argument_errors.append(str(bad_value))
+        if argument_errors:
+            raise ValueError(
+                f"Invalid additional arguments for request '{self.request}': " +
+                ' '.join(argument_errors)
+            )
+        return validated_kwargs
@@ -0,0 +1,121 @@
+"""
+Module that contains the asyncio helpers of chatt_bot: a bounded executor that
+blocking calls (selenium, sqlite, sync workflows) are offloaded to, so many
+actions can be in flight on one event loop without a thread per action.
+"""
+# Native libraries
+import asyncio
+import concurrent.futures
+import functools
+import threading
+# Custom modules
+from chatt_bot import timing_utils
+
+DEFAULT_BLOCKING_WORKERS = 8
+
+_BLOCKING_EXECUTOR = None
+_BLOCKING_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_blocking_executor(
+        max_workers=DEFAULT_BLOCKING_WORKERS
+):
+    """
+    Function that returns the process-wide executor for blocking calls, creating it on first use.
+
+    :param int max_workers:
+            Maximum number of blocking calls running at once. Only used when
+            the executor is first created.
+    :return: concurrent.futures.ThreadPoolExecutor:
+            The shared blocking executor.
+    """
+    global _BLOCKING_EXECUTOR  # pylint: disable=global-statement
+    with _BLOCKING_EXECUTOR_LOCK:
+        if _BLOCKING_EXECUTOR is None:
+            _BLOCKING_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='chatt_bot_blocking'
+            )
+        return _BLOCKING_EXECUTOR
+
+
+def close_blocking_executor():
+    """Function that shuts down the process-wide blocking executor, if one was created."""
+    global _BLOCKING_EXECUTOR  # pylint: disable=global-statement
+    with _BLOCKING_EXECUTOR_LOCK:
+        if _BLOCKING_EXECUTOR is not None:
+            _BLOCKING_EXECUTOR.shutdown()
+            _BLOCKING_EXECUTOR = None
+
+
+async def run_blocking(
+        func,
+        *args,
+        **kwargs
+):
+    """
+    Coroutine that runs a blocking callable on the bounded executor,
+    keeping the caller's span so its timings still nest.
+
+    :param function func:
+            The blocking callable.
+    :param tuple args:
+            Positional arguments passed to func.
+    :param dict kwargs:
+            Keyword arguments passed to func.
+    :return:
+            The callable's result.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        get_blocking_executor(),
+        functools.partial(timing_utils.bind_context(func), *args, **kwargs)
+    )
+
+
+def run_coroutine_function(
+        coroutine_function
+):
+    """
+    Function that wraps a coroutine function so it can be called synchronously,
+    running it to completion on a new event loop.
+
+    :param function coroutine_function:
+            The coroutine function.
+    :return: function:
+            A blocking callable with the same arguments.
+    """
+    @functools.wraps(coroutine_function)
+    def wrapper(
+            *args,
+            **kwargs
+    ):
+        return asyncio.run(coroutine_function(*args, **kwargs))
+    return wrapper
+
+
+async def gather_bounded(
+        awaitables,
+        max_concurrency
+):
+    """
+    Coroutine that awaits many awaitables, at most max_concurrency at once.
+
+    :param list awaitables:
+            The awaitables (e.g. execute_action_async calls).
+    :param int max_concurrency:
+            Maximum number in flight at once.
+    :return: list:
+            The results (or raised exceptions), in the same order as awaitables.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_bounded(
+            awaitable
+    ):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(
+        *[run_bounded(awaitable) for awaitable in awaitables],
+        return_exceptions=True
+    )
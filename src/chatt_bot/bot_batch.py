@@ -0,0 +1,297 @@
+"""
+Module that runs many chatt_bot actions from a job file on a bounded worker pool.
+
+A job file is JSON lines, where each line is one
+{"action_type": ..., "request": ..., "add_args": {...}} record.
+"""
+# Native libraries
+import asyncio
+import concurrent.futures
+import contextlib
+import datetime
+import json
+import os
+import time
+# Custom modules
+from chatt_bot import bot_utils
+from chatt_bot import robot_actions
+from chatt_bot import run_history
+
+HISTORY_BATCH_SIZE = 64
+
+
+def read_job_file(
+        job_file_path
+):
+    """
+    Function that reads the jobs listed in a JSON lines job file.
+
+    :param str job_file_path:
+            Location of the job file.
+    :return: list:
+            The jobs, as dictionaries, in file order.
+    """
+    jobs = []
+    with open(job_file_path, 'r', encoding='utf-8') as job_file:
+        for line_number, line in enumerate(job_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as bad_json:
+                raise ValueError(
+                    f"Line {line_number} of job file '{job_file_path}' is not valid JSON."
+                ) from bad_json
+            job['line_number'] = line_number
+            jobs.append(job)
+    return jobs
+
+
+def validate_jobs(
+        jobs
+):
+    """
+    Function that validates every job up front, before any of them run.
+
+    :param list jobs:
+            The jobs read from a job file.
+    :return: list:
+            The jobs with resolved action_type/request, and add_args
+            converted to their types, so runs don't check them again.
+    """
+    validated_jobs = []
+    job_errors = []
+    for job in jobs:
+        try:
+            add_args = robot_actions.parse_additional_arguments(job.get('add_args', {}))
+            action_type = robot_actions.resolve_action_type(job['action_type'])
+            request = robot_actions.resolve_request(action_type, job['request'])
+            add_args = robot_actions.check_additional_arguments(
+                request,
+                **add_args
+            )
+        except (KeyError, ValueError) as bad_job:
+            job_errors.append(f"Line {job.get('line_number')}: {bad_job!r}")
+            continue
+        validated_jobs.append({
+            'line_number': job.get('line_number'),
+            'action_type': action_type,
+            'request': request,
+            'add_args': add_args
+        })
+    if job_errors:
+        raise ValueError(
+            f"{len(job_errors)} job(s) failed validation:\n" + '\n'.join(job_errors)
+        )
+    return validated_jobs
+
+
+@contextlib.contextmanager
+def suppressed_output(
+        quiet
+):
+    """
+    Context manager that sends print out statements to os.devnull when quiet.
+
+    :param bool quiet:
+            Whether print out statements are suppressed.
+    """
+    if not quiet:
+        yield
+        return
+    with open(os.devnull, 'w', encoding='utf-8') as null_output, \
+            contextlib.redirect_stdout(null_output):
+        yield
+
+
+def record_exit_status(
+        batch_entry,
+        run_log
+):
+    """
+    Function that copies a run's exit status to its batch log entry,
+    marking the job failed when the status is non-zero.
+
+    :param dict batch_entry:
+            The batch log entry of the job.
+    :param dict run_log:
+            The run log returned from execute_action.
+    """
+    batch_entry['exit_status'] = run_log['exit_status']
+    if run_log['exit_status']:
+        batch_entry['status'] = 'failed'
+        batch_entry['error'] = f"Exited with status {run_log['exit_status']}."
+
+
+def run_job(
+        job,
+        quiet=False
+):
+    """
+    Function that executes a single validated job.
+
+    :param dict job:
+            A job returned from validate_jobs.
+    :param bool quiet:
+            Whether the job's print out statements are suppressed.
+            Only safe when one job runs per process, as stdout is process-wide.
+    :return: dict:
+            The batch log entry of the job.
+    """
+    batch_entry = {
+        'line_number': job['line_number'],
+        'action_type': job['action_type'],
+        'request': job['request'],
+        'status': 'ok',
+        'error': None,
+        'exit_status': None,
+        'run_time': None
+    }
+    start_time = time.perf_counter()
+    try:
+        with suppressed_output(quiet):
+            run_log = robot_actions.BotAction(
+                action_type=job['action_type'],
+                request=job['request'],
+                check_arguments=False
+            ).execute_action(**job['add_args'])
+        record_exit_status(batch_entry, run_log)
+    except Exception as job_error:  # pylint: disable=broad-except
+        batch_entry['status'] = 'error'
+        batch_entry['error'] = f'{type(job_error).__name__}: {job_error}'
+    batch_entry['run_time'] = time.perf_counter() - start_time
+    return batch_entry
+
+
+async def run_job_async(
+        job
+):
+    """
+    Coroutine that executes a single validated job on the running event loop.
+
+    :param dict job:
+            A job returned from validate_jobs.
+    :return: dict:
+            The batch log entry of the job.
+    """
+    batch_entry = {
+        'line_number': job['line_number'],
+        'action_type': job['action_type'],
+        'request': job['request'],
+        'status': 'ok',
+        'error': None,
+        'exit_status': None,
+        'run_time': None
+    }
+    start_time = time.perf_counter()
+    try:
+        run_log = await robot_actions.BotAction(
+            action_type=job['action_type'],
+            request=job['request'],
+            check_arguments=False
+        ).execute_action_async(**job['add_args'])
+        record_exit_status(batch_entry, run_log)
+    except Exception as job_error:  # pylint: disable=broad-except
+        batch_entry['status'] = 'error'
+        batch_entry['error'] = f'{type(job_error).__name__}: {job_error}'
+    batch_entry['run_time'] = time.perf_counter() - start_time
+    return batch_entry
+
+
+async def iter_jobs_async(
+        jobs,
+        max_workers
+):
+    """
+    Asynchronous generator that runs jobs on one event loop, at most
+    max_workers in flight, yielding each batch log entry as it completes.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run_bounded(
+            job
+    ):
+        async with semaphore:
+            return await run_job_async(job)
+
+    for finished_job in asyncio.as_completed([run_bounded(job) for job in jobs]):
+        yield await finished_job
+
+
+def run_batch(
+        job_file_path,
+        max_workers=4,
+        use_processes=False,
+        quiet=False,
+        use_async=False
+):
+    """
+    Function that executes every job of a job file on a bounded worker pool.
+
+    :param str job_file_path:
+            Location of the job file.
+    :param int max_workers:
+            Maximum number of jobs running at once.
+    :param bool use_processes:
+            If True, jobs run on a process pool; otherwise on a thread pool.
+    :param bool quiet:
+            Whether the jobs' print out statements are suppressed.
+    :param bool use_async:
+            If True, jobs run as coroutines on one event loop (see
+            BotAction.execute_action_async) instead of on a pool.
+    :return: dict:
+            Aggregate summary of the batch.
+    """
+    jobs = validate_jobs(read_job_file(job_file_path))
+    batch_start = datetime.datetime.now()
+    batch_log_location = os.path.join(
+        bot_utils.setup_bot_folders(),
+        f"batch_{batch_start.strftime('%Y_%m_%d_%H_%M_%S_%f')}.jsonl"
+    )
+    pool_class = concurrent.futures.ProcessPoolExecutor if use_processes \
+        else concurrent.futures.ThreadPoolExecutor
+    summary = {
+        'job_file': job_file_path,
+        'jobs': len(jobs),
+        'succeeded': 0,
+        'failed': 0,
+        'total_job_time': 0.0,
+        'wall_time': None,
+        'batch_log': batch_log_location
+    }
+    # Threads share one history store, so their runs are written in batches,
+    # even if the store was opened before. Pool processes open their own
+    # store, which writes each run as it ends.
+    start_time = time.perf_counter()
+    with run_history.get_run_history_store().batched(HISTORY_BATCH_SIZE), \
+            open(batch_log_location, 'w', encoding='utf-8') as batch_log_file:
+
+        def record_entry(
+                batch_entry
+        ):
+            """Function that logs a job as soon as it completes."""
+            batch_log_file.write(json.dumps(batch_entry) + '\n')
+            summary['total_job_time'] += batch_entry['run_time']
+            if batch_entry['status'] == 'ok':
+                summary['succeeded'] += 1
+            else:
+                summary['failed'] += 1
+
+        if use_async:
+            async def run_all_jobs():
+                async for batch_entry in iter_jobs_async(jobs, max_workers):
+                    record_entry(batch_entry)
+
+            with suppressed_output(quiet):
+                asyncio.run(run_all_jobs())
+        else:
+            # Threads share stdout, so it is suppressed once around the whole pool.
+            with suppressed_output(quiet and not use_processes), \
+                    pool_class(max_workers=max_workers) as pool:
+                pending_jobs = [
+                    pool.submit(run_job, job, quiet and use_processes) for job in jobs
+                ]
+                for finished_job in concurrent.futures.as_completed(pending_jobs):
+                    record_entry(finished_job.result())
+    summary['wall_time'] = time.perf_counter() - start_time
+    return summary
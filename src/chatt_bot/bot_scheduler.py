@@ -0,0 +1,494 @@
+"""
+Module that runs chatt_bot actions on recurring schedules inside one
+long-running process, so firings share warm sessions and drivers.
+
+A schedule file is JSON lines, where each line is one job record (as in a
+batch job file) plus its schedule, e.g.
+{"name": "city_urls", "action_type": ..., "request": ..., "add_args": {...},
+ "interval": "5m", "jitter": 10, "overlap": "skip", "catch_up": true}
+with either "interval" (seconds, or e.g. '30s', '5m', '2h', '1d') or "cron"
+(a 5-field 'minute hour day-of-month month day-of-week' expression).
+
+Pending firings are kept in a heap ordered by due time, and the scheduler
+sleeps until the earliest one, so idle schedules cost nothing but memory.
+"""
+# Native libraries
+import concurrent.futures
+import datetime
+import heapq
+import json
+import os
+import random as rand
+import re
+import threading
+import time
+import uuid
+# Custom modules
+from chatt_bot import bot_batch
+from chatt_bot import bot_utils
+from chatt_bot import generic_utils
+
+OVERLAP_POLICIES = ['skip', 'queue', 'concurrent']
+STATE_SAVE_INTERVAL = 30
+CRON_FIELD_RANGES = [
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7)
+]
+INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_interval(
+        interval
+):
+    """
+    Function that parses an interval, in seconds or with a unit ('30s', '5m', '2h', '1d').
+
+    :param int,float,str interval:
+            The interval.
+    :return: float:
+            The interval in seconds.
+    """
+    interval_match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*', str(interval).lower())
+    if interval_match is None or float(interval_match.group(1)) <= 0:
+        raise ValueError(
+            f"Interval '{interval}' must be a positive number of seconds, "
+            "or have a unit (e.g. '30s', '5m', '2h', '1d')."
+        )
+    return float(interval_match.group(1)) * INTERVAL_UNITS[interval_match.group(2) or 's']
+
+
+def parse_cron_field(
+        field_text,
+        field_name,
+        lowest,
+        highest
+):
+    """
+    Function that parses one cron field ('*', '5', '1-5', '*/15', '0-30/10', or a list of those).
+
+    :return: frozenset:
+            The values the field matches.
+    """
+    field_values = set()
+    for part in field_text.split(','):
+        part_match = re.fullmatch(r'(\*|\d+)(?:-(\d+))?(?:/(\d+))?', part)
+        if part_match is None:
+            raise ValueError(f"Cron {field_name} field '{field_text}' is not valid.")
+        start_text, end_text, step_text = part_match.groups()
+        if start_text == '*':
+            start, end = lowest, highest
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text is not None else \
+                (highest if step_text is not None else start)
+        step = int(step_text) if step_text is not None else 1
+        if not lowest <= start <= end <= highest or step < 1:
+            raise ValueError(
+                f"Cron {field_name} field '{field_text}' must be within {lowest}-{highest}, with a positive step."
+            )
+        field_values.update(range(start, end + 1, step))
+    return frozenset(field_values)
+
+
+class CronExpression:
+    """Class that computes the firing times of a 5-field cron expression."""
+    def __init__(
+            self,
+            expression
+    ):
+        """
+        Initialization function, that parses the expression.
+
+        :param str expression:
+                'minute hour day-of-month month day-of-week', e.g. '*/5 8-18 * * 1-5'.
+        """
+        self.expression = expression
+        field_texts = str(expression).split()
+        if len(field_texts) != 5:
+            raise ValueError(
+                f"Cron expression '{expression}' must have 5 fields: "
+                "minute hour day-of-month month day-of-week."
+            )
+        (
+            self.minutes,
+            self.hours,
+            self.days_of_month,
+            self.months,
+            days_of_week
+        ) = [
+            parse_cron_field(field_text, *field_range)
+            for field_text, field_range in zip(field_texts, CRON_FIELD_RANGES)
+        ]
+        # Both 0 and 7 mean Sunday.
+        self.days_of_week = frozenset(day % 7 for day in days_of_week)
+        # As in cron, a restricted day-of-month OR day-of-week must match.
+        self.any_day_of_month = field_texts[2] == '*'
+        self.any_day_of_week = field_texts[4] == '*'
+        # Find an expression that never matches (e.g. '0 0 31 4 *') now, not once it's scheduled.
+        self.next_after(datetime.datetime.now())
+
+    def matches_day(
+            self,
+            moment
+    ):
+        """Function that checks whether the expression fires on a moment's day."""
+        day_of_month_matches = moment.day in self.days_of_month
+        # isoweekday() has Monday=1 ... Sunday=7, cron has Sunday=0.
+        day_of_week_matches = moment.isoweekday() % 7 in self.days_of_week
+        if self.any_day_of_month or self.any_day_of_week:
+            return day_of_month_matches and day_of_week_matches
+        return day_of_month_matches or day_of_week_matches
+
+    def next_after(
+            self,
+            moment
+    ):
+        """
+        Function that finds the first firing strictly after a moment,
+        skipping whole months, days and hours that cannot match.
+
+        :param datetime.datetime moment:
+                The moment (local time).
+        :return: datetime.datetime:
+                The next firing.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        # A valid expression fires within a few years (e.g. Feb 29 on a given weekday).
+        latest = candidate + datetime.timedelta(days=366 * 8)
+        while candidate <= latest:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) +
+                             datetime.timedelta(days=32)).replace(day=1)
+            elif not self.matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + datetime.timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += datetime.timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never fires.")
+
+
+class Schedule:
+    """Class that holds one recurring job, and when it next fires."""
+    def __init__(
+            self,
+            job,
+            name=None,
+            interval=None,
+            cron=None,
+            jitter=0,
+            overlap='skip',
+            catch_up=False
+    ):
+        """
+        Initialization function, that validates the schedule.
+
+        :param dict job:
+                A job returned from bot_batch.validate_jobs.
+        :param str name:
+                Name of the schedule, used to remember its last firing.
+                If None, derived from the job and schedule.
+        :param int,float,str interval:
+                Seconds between firings, or with a unit ('30s', '5m', '2h', '1d').
+        :param str cron:
+                5-field cron expression. Exactly one of interval/cron is required.
+        :param float jitter:
+                Maximum random delay, in seconds, added to each firing.
+        :param str overlap:
+                What happens when a firing is due while the previous run is
+                still going: 'skip' it, 'queue' it until the run ends, or run
+                it 'concurrent'ly.
+        :param bool catch_up:
+                Whether firings missed while the scheduler was not running
+                are made up, by one run as soon as it starts.
+        """
+        if (interval is None) == (cron is None):
+            raise ValueError("Exactly one of 'interval' or 'cron' is required.")
+        self.job = job
+        self.interval = None if interval is None else parse_interval(interval)
+        self.cron = None if cron is None else CronExpression(cron)
+        self.jitter = float(jitter)
+        if self.jitter < 0:
+            raise ValueError("Parameter 'jitter' must not be negative.")
+        self.overlap = str(overlap).strip().lower()
+        if self.overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Parameter 'overlap' must be one of {OVERLAP_POLICIES}.")
+        self.catch_up = bool(catch_up)
+        self.name = name if name is not None else json.dumps(
+            [job['action_type'], job['request'], job['add_args'], interval, cron],
+            sort_keys=True,
+            default=str
+        )
+        self.running = 0
+        self.queued = 0
+
+    def next_fire_time(
+            self,
+            after
+    ):
+        """
+        Function that computes the next nominal firing (before jitter) after a time.
+
+        :param float after:
+                POSIX timestamp.
+        :return: float:
+                POSIX timestamp of the next firing.
+        """
+        if self.interval is not None:
+            return after + self.interval
+        return self.cron.next_after(datetime.datetime.fromtimestamp(after)).timestamp()
+
+
+def read_schedule_file(
+        schedule_file_path
+):
+    """
+    Function that reads and validates every schedule of a schedule file up front.
+
+    :param str schedule_file_path:
+            Location of the schedule file.
+    :return: list:
+            The schedules.
+    """
+    schedule_records = bot_batch.read_job_file(schedule_file_path)
+    jobs = bot_batch.validate_jobs(schedule_records)
+    schedules = []
+    schedule_errors = []
+    for schedule_record, job in zip(schedule_records, jobs):
+        try:
+            schedules.append(Schedule(
+                job,
+                name=schedule_record.get('name'),
+                interval=schedule_record.get('interval'),
+                cron=schedule_record.get('cron'),
+                jitter=schedule_record.get('jitter', 0),
+                overlap=schedule_record.get('overlap', 'skip'),
+                catch_up=schedule_record.get('catch_up', False)
+            ))
+        except (TypeError, ValueError) as bad_schedule:
+            schedule_errors.append(f"Line {job['line_number']}: {bad_schedule!r}")
+    if schedule_errors:
+        raise ValueError(
+            f"{len(schedule_errors)} schedule(s) failed validation:\n" + '\n'.join(schedule_errors)
+        )
+    return schedules
+
+
+class BotScheduler(generic_utils.VerboseAttributes):
+    """
+    Class that fires scheduled chatt_bot actions on a bounded worker pool,
+    remembering each schedule's last firing so missed runs can be caught up.
+    """
+    def __init__(
+            self,
+            schedules,
+            max_workers=8,
+            state_location=None,
+            verbose=False
+    ):
+        """
+        Initialization function, that sets up (but does not start) the scheduler.
+
+        :param list schedules:
+                The schedules, e.g. from read_schedule_file.
+        :param int max_workers:
+                Maximum number of actions running at once.
+        :param str state_location:
+                Location of the file remembering last firings.
+                If None, stored in the bot run folder.
+        :param bool verbose:
+                Specifies whether user wants all print out statements.
+        """
+        super().__init__(verbose=verbose)
+        self.schedules = list(schedules)
+        self.max_workers = generic_utils.cast_integer(max_workers, 'max_workers')
+        self.state_location = os.path.join(
+            bot_utils.setup_bot_folders(),
+            'schedule_state.json'
+        ) if state_location is None else state_location
+        self.last_fire_times = self.load_state()
+        self.fired = 0
+        self.skipped = 0
+        self._timer_heap = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stopping = False
+        self._pool = None
+
+    def load_state(
+            self
+    ):
+        """
+        Function that reads the last firing of each schedule.
+
+        :return: dict:
+                Schedule names mapped to POSIX timestamps.
+        """
+        try:
+            with open(self.state_location, 'r', encoding='utf-8') as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(
+            self
+    ):
+        """Function that writes the last firing of each schedule (atomically)."""
+        with self._lock:
+            state = dict(self.last_fire_times)
+        temp_location = f'{self.state_location}.{uuid.uuid4().hex}.tmp'
+        with open(temp_location, 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file)
+        os.replace(temp_location, self.state_location)
+
+    def push_timer(
+            self,
+            nominal_time,
+            schedule
+    ):
+        """
+        Function that adds a firing to the timer heap, delayed by the schedule's
+        jitter. The nominal time is kept, so jitter never accumulates into drift.
+        Caller holds the lock.
+        """
+        fire_time = nominal_time
+        if schedule.jitter:
+            fire_time += rand.uniform(0, schedule.jitter)
+        self._sequence += 1
+        heapq.heappush(self._timer_heap, (fire_time, self._sequence, nominal_time, schedule))
+
+    def next_nominal_time(
+            self,
+            schedule,
+            nominal_time,
+            now
+    ):
+        """
+        Function that computes the firing after one that just fired. If the
+        loop stalled past later firings, the late firing stands in for them all.
+        """
+        next_time = schedule.next_fire_time(nominal_time)
+        if next_time > now:
+            return next_time
+        return schedule.next_fire_time(now)
+
+    def first_fire_time(
+            self,
+            schedule,
+            now
+    ):
+        """
+        Function that computes when a schedule first fires. A schedule with
+        catch_up whose nominal firing passed while the scheduler was not
+        running fires right away, once, however many firings were missed.
+        """
+        last_fire_time = self.last_fire_times.get(schedule.name)
+        if last_fire_time is not None and schedule.catch_up and \
+                schedule.next_fire_time(last_fire_time) <= now:
+            return now
+        return schedule.next_fire_time(now)
+
+    def fire(
+            self,
+            schedule
+    ):
+        """Function that applies the overlap policy and submits a run. Caller holds the lock."""
+        if schedule.running and schedule.overlap == 'skip':
+            self.skipped += 1
+            if self.verbose:
+                print(f"Skipping '{schedule.name}': previous run still going.")
+            return
+        if schedule.running and schedule.overlap == 'queue':
+            schedule.queued += 1
+            return
+        self.submit_run(schedule)
+
+    def submit_run(
+            self,
+            schedule
+    ):
+        """Function that runs a schedule's job on the pool. Caller holds the lock."""
+        schedule.running += 1
+        self.fired += 1
+        self.last_fire_times[schedule.name] = time.time()
+        self._pool.submit(bot_batch.run_job, schedule.job).add_done_callback(
+            lambda finished_run: self.finish_run(schedule, finished_run)
+        )
+
+    def finish_run(
+            self,
+            schedule,
+            finished_run
+    ):
+        """Function that records a finished run, starting a queued one if any."""
+        batch_entry = finished_run.result()
+        if batch_entry['status'] != 'ok':
+            print(f"Scheduled run '{schedule.name}' failed: {batch_entry['error']}")
+        with self._lock:
+            schedule.running -= 1
+            if schedule.queued and not self._stopping:
+                schedule.queued -= 1
+                self.submit_run(schedule)
+
+    def run(
+            self,
+            duration=None
+    ):
+        """
+        Function that fires schedules until stop is called (or duration elapses).
+
+        :param float duration:
+                Seconds to run for. If None, runs until stop is called.
+        """
+        end_time = None if duration is None else time.time() + float(duration)
+        last_save_time = time.time()
+        self._stopping = False
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='chatt_bot_schedule'
+        )
+        now = time.time()
+        with self._lock:
+            for schedule in self.schedules:
+                self.push_timer(self.first_fire_time(schedule, now), schedule)
+        try:
+            while not self._stopping:
+                now = time.time()
+                with self._lock:
+                    while self._timer_heap and self._timer_heap[0][0] <= now:
+                        _, _, nominal_time, schedule = heapq.heappop(self._timer_heap)
+                        self.fire(schedule)
+                        self.push_timer(
+                            self.next_nominal_time(schedule, nominal_time, now),
+                            schedule
+                        )
+                    next_due = self._timer_heap[0][0] if self._timer_heap else None
+                if now - last_save_time >= STATE_SAVE_INTERVAL:
+                    self.save_state()
+                    last_save_time = now
+                if end_time is not None and now >= end_time:
+                    break
+                wait_until = min(
+                    due_time for due_time in (next_due, end_time, now + STATE_SAVE_INTERVAL)
+                    if due_time is not None
+                )
+                self._wake_event.wait(max(wait_until - time.time(), 0))
+                self._wake_event.clear()
+        finally:
+            with self._lock:
+                self._stopping = True
+            self._pool.shutdown(wait=True)
+            self.save_state()
+
+    def stop(
+            self
+    ):
+        """Function that asks a running scheduler to stop after its running actions end."""
+        self._stopping = True
+        self._wake_event.set()
@@ -0,0 +1,268 @@
+"""
+Module that runs chatt_bot as a long-lived process behind a local socket.
+
+The server keeps the interpreter, action metadata and loaded workflow modules
+warm between requests, so repeated kickoffs only pay for dispatch. Messages are
+newline-delimited JSON, one request per connection.
+"""
+# Native libraries
+import contextlib
+import getpass
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+# Custom modules
+from chatt_bot import robot_actions
+from chatt_bot import run_history
+
+
+def get_default_socket_path():
+    """
+    Function that determines the default socket path of the chatt_bot server.
+
+    :return: str:
+            The path to the Unix domain socket.
+    """
+    return os.path.join(
+        tempfile.gettempdir(),
+        f'chatt_bot_{getpass.getuser()}.sock'
+    )
+
+
+def check_socket_support():
+    """Function that ensures the platform supports Unix domain sockets."""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError(
+            "chatt_bot serve requires Unix domain socket support, "
+            "which is not available on this platform."
+        )
+
+
+def send_message(
+        stream,
+        message
+):
+    """
+    Function that writes a single JSON message to a socket stream.
+
+    :param io.BufferedIOBase stream:
+            The writable socket stream.
+    :param dict message:
+            The message to send.
+    """
+    stream.write(json.dumps(message, default=str).encode('utf-8') + b'\n')
+    stream.flush()
+
+
+def is_server_running(
+        socket_path
+):
+    """
+    Function that checks whether a server is accepting connections on a socket.
+
+    :param str socket_path:
+            Location of the Unix domain socket.
+    :return: bool:
+            True if a server answered.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+class SocketOutput(io.TextIOBase):
+    """Class that forwards everything written to it back to the client."""
+    def __init__(
+            self,
+            stream
+    ):
+        """
+        Initialization function, that needs the client stream.
+
+        :param io.BufferedIOBase stream:
+                The writable socket stream of the client.
+        """
+        super().__init__()
+        self.stream = stream
+
+    def writable(
+            self
+    ):
+        """Function that marks the output as writable."""
+        return True
+
+    def write(
+            self,
+            text
+    ):
+        """Function that streams text back to the client."""
+        if text:
+            send_message(self.stream, {'type': 'output', 'data': text})
+        return len(text)
+
+
+def run_request(
+        action_type,
+        request,
+        add_args
+):
+    """
+    Function that validates and executes a single action_type/request.
+
+    :param str action_type:
+            The action_type, or one of its aliases.
+    :param str request:
+            The specific request related to action_type.
+    :param str,dict add_args:
+            Dictionary of other arguments, or the string form of it.
+    :return: dict:
+            The run log of the executed action.
+    """
+    add_args = robot_actions.parse_additional_arguments(add_args)
+    action_type = robot_actions.resolve_action_type(action_type)
+    request = robot_actions.resolve_request(action_type, request)
+    # execute_action checks the additional arguments.
+    return robot_actions.BotAction(
+        action_type=action_type,
+        request=request
+    ).execute_action(**add_args)
+
+
+class BotRequestHandler(socketserver.StreamRequestHandler):
+    """Class that handles a single client connection to the chatt_bot server."""
+    def handle(
+            self
+    ):
+        """Function that executes the request sent by the client."""
+        raw_message = self.rfile.readline()
+        if not raw_message:
+            return
+        try:
+            message = json.loads(raw_message)
+            if message.get('command') == 'shutdown':
+                send_message(self.wfile, {'type': 'result', 'status': 'shutdown'})
+                self.server.shutdown_requested = True
+                return
+            # Requests are served one at a time, so stdout can be redirected safely.
+            with contextlib.redirect_stdout(SocketOutput(self.wfile)):
+                run_log = run_request(
+                    message['action_type'],
+                    message['request'],
+                    message.get('add_args', {})
+                )
+            send_message(self.wfile, {'type': 'result', 'status': 'ok', 'run_log': run_log})
+        except Exception as request_error:  # pylint: disable=broad-except
+            send_message(
+                self.wfile,
+                {
+                    'type': 'result',
+                    'status': 'error',
+                    'error': f'{type(request_error).__name__}: {request_error}'
+                }
+            )
+
+
+class BotServer(socketserver.UnixStreamServer):
+    """Class that serves chatt_bot requests over a Unix domain socket."""
+    def __init__(
+            self,
+            socket_path=None,
+            preload=True
+    ):
+        """
+        Initialization function, that binds the server socket.
+
+        :param str socket_path:
+                Location of the Unix domain socket. If None, uses the default path.
+        :param bool preload:
+                Whether to import every workflow module before serving,
+                so the first request does not pay for it.
+        """
+        check_socket_support()
+        self.socket_path = get_default_socket_path() if socket_path is None else socket_path
+        self.shutdown_requested = False
+        if os.path.exists(self.socket_path):
+            # Refuse to take over the socket of a server that is still running.
+            if is_server_running(self.socket_path):
+                raise OSError(
+                    f"A chatt_bot server is already listening on {self.socket_path}."
+                )
+            # Clear a stale socket file left behind by a previous server.
+            os.remove(self.socket_path)
+        super().__init__(self.socket_path, BotRequestHandler)
+        if preload:
+            for request in robot_actions.get_registry().request_workflows:
+                robot_actions.load_request_workflow(request)
+            run_history.get_run_history_store()
+
+    def server_bind(
+            self
+    ):
+        """Function that binds the socket, so only its owner may connect (it runs shell commands)."""
+        super().server_bind()
+        os.chmod(self.socket_path, 0o600)
+
+    def serve_until_shutdown(
+            self
+    ):
+        """Function that serves requests until a client asks for shutdown."""
+        try:
+            while not self.shutdown_requested:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def server_close(
+            self
+    ):
+        """Function that closes the server, its warm drivers, and its socket file."""
+        super().server_close()
+        # Only close warm drivers/sessions if a workflow actually created them.
+        if 'chatt_bot.selenium_utils' in sys.modules:
+            sys.modules['chatt_bot.selenium_utils'].close_driver_pool()
+        if 'chatt_bot.http_utils' in sys.modules:
+            sys.modules['chatt_bot.http_utils'].close_http_client()
+        run_history.close_run_history_store()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def send_request(
+        message,
+        socket_path=None,
+        output=None
+):
+    """
+    Function that sends a message to a running chatt_bot server.
+
+    :param dict message:
+            The message to send, either an action_type/request/add_args
+            request or {'command': 'shutdown'}.
+    :param str socket_path:
+            Location of the Unix domain socket. If None, uses the default path.
+    :param io.TextIOBase output:
+            Where streamed output is written. If None, output is printed.
+    :return: dict:
+            The final result message sent by the server.
+    """
+    check_socket_support()
+    socket_path = get_default_socket_path() if socket_path is None else socket_path
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(socket_path)
+        with client_socket.makefile('rwb') as stream:
+            send_message(stream, message)
+            for raw_reply in stream:
+                reply = json.loads(raw_reply)
+                if reply['type'] == 'result':
+                    return reply
+                print(reply['data'], end='', file=output, flush=True)
+    raise ConnectionError(
+        f"chatt_bot server at '{socket_path}' closed without sending a result."
+    )
@@ -2,13 +2,14 @@
 This module houses all bot-specific utilities that chatt_bot relies upon.
 """
 # Native libraries
+import concurrent.futures
+import time
 import warnings
 import textwrap
 # Custom modules
 from chatt_bot import directory_utils
 from chatt_bot import generic_utils
-# Non-native libraries
-import requests
+from chatt_bot import timing_utils
 
 
 class CodePolice(generic_utils.VerboseAttributes):
@@ -28,6 +29,7 @@ class CodePolice(generic_utils.VerboseAttributes):
             url_requested,
             desired_status_codes=200,
             on_bad_status_code='w',
+            use_cache=False,
             **kwargs
     ):
         """
@@ -41,8 +43,161 @@ class CodePolice(generic_utils.VerboseAttributes):
         :param str on_bad_status_code:
                 Specifies whether to warn or error on non-expected
                 code. Must be 'e' or 'w'.
+        :param bool use_cache:
+                If True, repeat checks are sent as conditional requests
+                through the shared HTTP cache, treating a 304 as a hit.
         :param dict kwargs:
         """
+        desired_status_codes = self.format_status_codes(desired_status_codes)
+        # Format on_bad_status_code and check if equal to 'e' or 'w'.
+        on_bad_status_code = str(on_bad_status_code).lower().strip()
+        try:
+            assert on_bad_status_code in ['e', 'w']
+        except AssertionError as bad_keyword_argument:
+            raise ValueError(
+                f"Keyword argument {on_bad_status_code} must be equal to either "
+                f"'e'(asking to throw error) or 'w' (asking to throw warning)."
+            ) from bad_keyword_argument
+        # Import the HTTP layer only when a url is checked, keeping the CLI start-up light.
+        from chatt_bot import http_utils  # pylint: disable=import-outside-toplevel
+        # Check url through the shared, kept-alive session.
+        status_code = http_utils.request_status_code(
+            'GET',
+            url_requested,
+            use_cache=use_cache,
+            timeout=60,
+            **kwargs
+        )
+        # Either warn or error if status code not in desired list.
+        if status_code not in desired_status_codes:
+            status_code_message = f"Url '{url_requested}' failed to return " \
+                                  f"a desired status code in:" \
+                                  f" {desired_status_codes}, " \
+                                  f"and instead returned {status_code}"
+            status_code_message = textwrap.fill(status_code_message, 100)
+            if on_bad_status_code == 'w':
+                warnings.warn(
+                    status_code_message,
+                    UserWarning
+                )
+            else:
+                raise ValueError(
+                    status_code_message
+                )
+        elif self.verbose:
+            print(
+                f"Url {url_requested} returned "
+                f"desired status code: {status_code}"
+            )
+
+    def validate_many(
+            self,
+            urls,
+            desired_status_codes=200,
+            concurrency=16,
+            max_per_host=4,
+            requests_per_second=None,
+            head_first=True,
+            timeout=60,
+            use_cache=False,
+            **kwargs
+    ):
+        """
+        Validates many urls concurrently, returning a result per url
+        instead of warning or raising.
+
+        :param list urls:
+                Urls requested to be checked.
+        :param int,list desired_status_codes:
+                Status code or list of status codes to be
+                compared to returned codes.
+        :param int concurrency:
+                Maximum number of urls checked at once.
+        :param int max_per_host:
+                Maximum number of urls checked at once against a single host.
+        :param float requests_per_second:
+                Maximum request rate against a single host. If None, not limited.
+        :param bool head_first:
+                If True, checks with HEAD, falling back to GET when HEAD
+                does not return a desired status code.
+        :param float timeout:
+                Timeout, in seconds, for each request.
+        :param bool use_cache:
+                If True, repeat checks are sent as conditional requests
+                through the shared HTTP cache, treating a 304 as a hit.
+        :param dict kwargs:
+                Passed to each request, overriding the defaults
+                allow_redirects=True and stream=True.
+        :return: list:
+                Dicts, in url order, holding url, status_code, method, ok,
+                error, and elapsed seconds.
+        """
+        desired_status_codes = self.format_status_codes(desired_status_codes)
+        # Import the HTTP layer only when urls are checked, keeping the CLI start-up light.
+        from chatt_bot import http_utils  # pylint: disable=import-outside-toplevel
+        host_limiter = http_utils.HostRateLimiter(
+            max_per_host=max_per_host,
+            requests_per_second=requests_per_second
+        )
+        # Redirects are followed and bodies left unread, unless kwargs say otherwise.
+        request_kwargs = {'allow_redirects': True, 'stream': True, **kwargs}
+
+        def validate_single_url(
+                url_requested
+        ):
+            """Function that checks one url, recording (rather than raising) failures."""
+            url_result = {
+                'url': url_requested,
+                'status_code': None,
+                'method': None,
+                'ok': False,
+                'error': None,
+                'elapsed': None
+            }
+            start_time = time.perf_counter()
+            methods = ['HEAD', 'GET'] if head_first else ['GET']
+            try:
+                for method in methods:
+                    with host_limiter.limit(url_requested):
+                        url_result['status_code'] = http_utils.request_status_code(
+                            method,
+                            url_requested,
+                            use_cache=use_cache,
+                            timeout=timeout,
+                            **request_kwargs
+                        )
+                    url_result['method'] = method
+                    if url_result['status_code'] in desired_status_codes:
+                        url_result['ok'] = True
+                        break
+            except Exception as request_error:  # pylint: disable=broad-except
+                url_result['error'] = f'{type(request_error).__name__}: {request_error}'
+            url_result['elapsed'] = time.perf_counter() - start_time
+            if self.verbose:
+                print(
+                    f"Url {url_requested} returned {url_result['status_code']} "
+                    f"via {url_result['method']}"
+                )
+            return url_result
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as url_pool:
+            url_results = list(url_pool.map(timing_utils.bind_context(validate_single_url), urls))
+        if use_cache:
+            http_utils.flush_http_cache()
+        return url_results
+
+    @staticmethod
+    def format_status_codes(
+            desired_status_codes
+    ):
+        """
+        Formats desired status codes to a list, checking that each is an integer.
+
+        :param int,list desired_status_codes:
+                Status code or list of status codes.
+        :return: list:
+                The list of status codes.
+        """
         # Format desired_status_codes to list if not.
         if not isinstance(desired_status_codes, list):
             desired_status_codes = [desired_status_codes]
@@ -58,43 +213,7 @@ class CodePolice(generic_utils.VerboseAttributes):
                         100
                     )
                 ) from bad_status_code
-        # Format on_bad_status_code and check if equal to 'e' or 'w'.
-        on_bad_status_code = str(on_bad_status_code).lower().strip()
-        try:
-            assert on_bad_status_code in ['e', 'w']
-        except AssertionError as bad_keyword_argument:
-            raise ValueError(
-                f"Keyword argument {on_bad_status_code} must be equal to either "
-                f"'e'(asking to throw error) or 'w' (asking to throw warning)."
-            ) from bad_keyword_argument
-        # Open session to check url.
-        with requests.Session() as request_session:
-            url_response = request_session.get(
-                url_requested,
-                timeout=60,
-                **kwargs
-            )
-            # Either warn or error if status code not in desired list.
-            if url_response.status_code not in desired_status_codes:
-                status_code_message = f"Url '{url_requested}' failed to return " \
-                                      f"a desired status code in:" \
-                                      f" {desired_status_codes}, " \
-                                      f"and instead returned {url_response.status_code}"
-                status_code_message = textwrap.fill(status_code_message, 100)
-                if on_bad_status_code == 'w':
-                    warnings.warn(
-                        status_code_message,
-                        UserWarning
-                    )
-                else:
-                    raise ValueError(
-                        status_code_message
-                    )
-            elif self.verbose:
-                print(
-                    f"Url {url_requested} returned "
-                    f"desired status code: {url_response.status_code}"
-                )
+        return desired_status_codes
 
     @staticmethod
     def string_standard_format(string):
@@ -120,3 +239,12 @@ def setup_bot_folders():
     return directory_utils.setup_documents_folder(
         "chatt_bot\\chatt_bot_runs"
     )
+
+
+def setup_bot_cache_folder():
+    """
+    Function that creates the folder where chatt_bot stores cached lookups.
+    """
+    return directory_utils.setup_documents_folder(
+        "chatt_bot\\chatt_bot_cache"
+    )
@@ -3,7 +3,6 @@ Module captures all custom workflows related to chatt_bot.
 """
 # Native libraries.
 import datetime
-import os
 import re
 import subprocess
 import typing
@@ -11,6 +10,7 @@ import warnings
 import zipfile
 # Custom modules
 from chatt_bot import bot_utils
+from chatt_bot import command_utils
 from chatt_bot import directory_utils
 from chatt_bot import generic_utils
 from chatt_bot import selenium_utils
@@ -22,13 +22,84 @@ from bs4 import BeautifulSoup as bs
 
 def execute_general_idle_command(
         *,
-        command=''
+        command='',
+        timeout=None,
+        max_parallel=4
 ):
     """
-    Function that executes a generic command.
+    Function that executes a generic command, or several at once.
 
-    :param str command:
-            The command to be executed.
+    Output of each command is streamed as it arrives, and captured
+    alongside its exit status.
+
+    :param str,list command:
+            The command to be executed, or a list of commands.
+    :param float timeout:
+            Timeout, in seconds, for each command. If None, waits until completion.
+    :param int max_parallel:
+            Maximum number of commands running at once.
+    :return: dict:
+            The first failing exit status (0 if none), and each command's result.
+    """
+    commands = command if isinstance(command, (list, tuple)) else [command]
+    timeout = None if timeout in [None, ''] else float(timeout)
+    print(f'Starting generic command(s): {commands}')
+    with command_utils.CommandExecutor(
+            max_parallel=max_parallel,
+            timeout=timeout
+    ) as command_executor:
+        command_results = command_executor.run_many(commands)
+    return summarize_command_results(command_results)
+
+
+async def execute_general_idle_command_async(
+        *,
+        command='',
+        timeout=None,
+        max_parallel=4
+):
+    """
+    Coroutine that executes a generic command, or several at once, on the event loop.
+    Same arguments and result as execute_general_idle_command.
+
+    :param str,list command:
+            The command to be executed, or a list of commands.
+    :param float timeout:
+            Timeout, in seconds, for each command. If None, waits until completion.
+    :param int max_parallel:
+            Maximum number of commands running at once.
+    :return: dict:
+            The first failing exit status (0 if none), and each command's result.
+    """
+    commands = command if isinstance(command, (list, tuple)) else [command]
+    timeout = None if timeout in [None, ''] else float(timeout)
+    print(f'Starting generic command(s): {commands}')
+    command_results = await command_utils.run_commands_async(
+        commands,
+        max_parallel=max_parallel,
+        timeout=timeout
+    )
+    return summarize_command_results(command_results)
+
+
+def summarize_command_results(
+        command_results
+):
+    """
+    Function that summarizes command results into a workflow result.
+
+    :param list command_results:
+            Results returned from CommandExecutor.run/run_command_async.
+    :return: dict:
+            The first failing exit status (0 if none), and each command's result.
     """
-    print(f'Starting generic command: start cmd /k {command}')
-    os.system(f'start cmd /k "{command}"')
+    # Report the first failing exit status, so any failure surfaces.
+    exit_status = 0
+    for command_result in command_results:
+        if command_result['timed_out'] or command_result['exit_status'] != 0:
+            exit_status = command_result['exit_status']
+            break
+    return {
+        'exit_status': exit_status,
+        'commands': command_results
+    }
@@ -0,0 +1,283 @@
+"""
+Module that contains the action catalog of chatt_bot: a JSON snapshot of the
+action_types, aliases, requests, descriptions and argument specs.
+
+The snapshot is rebuilt only when chatt_bot or an installed plugin changes, so
+shell completion, --describe and the CLI help read it without importing
+robot_actions and the workflow stack behind it.
+"""
+# Native libraries
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import uuid
+# Custom modules
+from chatt_bot import bot_utils
+from chatt_bot import plugin_utils
+from chatt_bot import registry_utils
+
+CATALOG_VERSION = 1
+
+
+def get_catalog_fingerprint():
+    """
+    Function that fingerprints everything the catalog is built from: the
+    installed chatt_bot version, its built-in workflow table and the
+    installed plugins.
+
+    :return: str:
+            Hex digest of the catalog's sources.
+    """
+    try:
+        chatt_bot_version = importlib.metadata.version('chatt_bot')
+    except importlib.metadata.PackageNotFoundError:
+        chatt_bot_version = None
+    # The built-in workflows live in robot_actions, which changes without a
+    # version bump in a source checkout.
+    builtin_modified = os.stat(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'robot_actions.py')
+    ).st_mtime_ns
+    return hashlib.sha256(json.dumps([
+        CATALOG_VERSION,
+        chatt_bot_version,
+        builtin_modified,
+        plugin_utils.get_plugin_fingerprint(plugin_utils.get_plugin_entry_points())
+    ]).encode('utf-8')).hexdigest()
+
+
+def build_catalog(
+        registry,
+        fingerprint
+):
+    """
+    Function that snapshots an action registry.
+
+    :param robot_actions.ActionRegistry registry:
+            The compiled action registry.
+    :param str fingerprint:
+            Fingerprint returned from get_catalog_fingerprint.
+    :return: dict:
+            The catalog, holding every action_type and request.
+    """
+    request_aliases = {}
+    for alias, request in registry.request_names.items():
+        if alias != request:
+            request_aliases.setdefault(request, []).append(alias)
+    return {
+        'catalog_version': CATALOG_VERSION,
+        'fingerprint': fingerprint,
+        'actions': {
+            action_type: {
+                'aliases': list(aliases),
+                'description': registry.action_description.get(action_type)
+            }
+            for action_type, aliases in registry.allowable_actions.items()
+        },
+        'requests': {
+            request: {
+                'action_type': registry.request_actions[request],
+                'aliases': sorted(request_aliases.get(request, [])),
+                'description': registry.request_description.get(request),
+                'arguments': dict(registry.request_additional_arguments.get(request, {})),
+                'cache_ttl': registry.request_cache_ttls.get(request)
+            }
+            for action_type in registry.allowable_requests
+            for request in registry.allowable_requests[action_type]
+        }
+    }
+
+
+def get_catalog_location():
+    """
+    Function that determines where the catalog is cached.
+
+    :return: str:
+            Location of the catalog.
+    """
+    return os.path.join(bot_utils.setup_bot_cache_folder(), 'action_catalog.json')
+
+
+def load_catalog():
+    """
+    Function that returns the catalog, read from its snapshot unless
+    chatt_bot or the installed plugins have changed since it was built.
+    If the snapshot cannot be saved, the catalog is built in memory only.
+
+    :return: dict:
+            The catalog.
+    """
+    fingerprint = get_catalog_fingerprint()
+    try:
+        catalog_location = get_catalog_location()
+        with open(catalog_location, 'r', encoding='utf-8') as catalog_file:
+            catalog = json.load(catalog_file)
+        if catalog.get('fingerprint') == fingerprint:
+            return catalog
+    except (OSError, ValueError):
+        pass
+    # Import the registry lazily, so reading the snapshot doesn't pay for it.
+    from chatt_bot import robot_actions  # pylint: disable=import-outside-toplevel
+    catalog = build_catalog(robot_actions.get_registry(), fingerprint)
+    # A plugin that failed to load is missing from the catalog, so keep it
+    # in memory only, and build it again next time.
+    if not plugin_utils.is_plugin_manifest_complete():
+        return catalog
+    try:
+        catalog_location = get_catalog_location()
+        temp_location = f'{catalog_location}.{uuid.uuid4().hex}.tmp'
+        with open(temp_location, 'w', encoding='utf-8') as catalog_file:
+            json.dump(catalog, catalog_file)
+        os.replace(temp_location, catalog_location)
+    except OSError:
+        pass
+    return catalog
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog():
+    """
+    Function that loads the catalog once per process, on first use.
+
+    :return: dict:
+            The shared catalog. Treat it as read-only.
+    """
+    return load_catalog()
+
+
+def get_allowable_actions(
+        catalog
+):
+    """
+    Function that lists the built action_types of a catalog, and their aliases.
+
+    :param dict catalog:
+            The catalog returned from load_catalog.
+    :return: dict:
+            Built action_types mapped to their aliases.
+    """
+    return {
+        action_type: action_entry['aliases']
+        for action_type, action_entry in catalog['actions'].items()
+    }
+
+
+def get_allowable_requests(
+        catalog
+):
+    """
+    Function that lists the requests of each action_type of a catalog.
+
+    :param dict catalog:
+            The catalog returned from load_catalog.
+    :return: dict:
+            Built action_types mapped to their requests.
+    """
+    allowable_requests = {action_type: [] for action_type in catalog['actions']}
+    for request, request_entry in catalog['requests'].items():
+        allowable_requests[request_entry['action_type']].append(request)
+    return allowable_requests
+
+
+def get_request_actions(
+        catalog
+):
+    """
+    Function that maps each request of a catalog to its built action_type.
+
+    :param dict catalog:
+            The catalog returned from load_catalog.
+    :return: dict:
+            Requests mapped to their built action_type.
+    """
+    return {
+        request: request_entry['action_type']
+        for request, request_entry in catalog['requests'].items()
+    }
+
+
+def resolve_catalog_request(
+        catalog,
+        action_type,
+        request
+):
+    """
+    Function that resolves an action_type and request (or their aliases) in a
+    catalog, by the same rules as the action registry.
+
+    :param dict catalog:
+            The catalog returned from load_catalog.
+    :param str action_type:
+            The action_type, or one of its aliases.
+    :param str request:
+            The request, or one of its aliases.
+    :return: tuple:
+            The built action_type and request.
+    """
+    request_actions = get_request_actions(catalog)
+    built_action = registry_utils.resolve_action_key(
+        registry_utils.compile_action_aliases(get_allowable_actions(catalog)),
+        action_type
+    )
+    built_request = registry_utils.resolve_request_key(
+        registry_utils.compile_request_names(request_actions, {
+            request_name: request_entry['aliases']
+            for request_name, request_entry in catalog['requests'].items()
+        }),
+        request_actions,
+        built_action,
+        request
+    )
+    return built_action, built_request
+
+
+def complete_names(
+        names,
+        incomplete
+):
+    """
+    Function that filters completion candidates by what has been typed so far.
+
+    :param dict names:
+            Candidate names mapped to their help text.
+    :param str incomplete:
+            What has been typed so far.
+    :return: list:
+            Tuples of (name, help text) starting with incomplete.
+    """
+    return [
+        (name, help_text or '') for name, help_text in names.items()
+        if name.startswith(incomplete)
+    ]
+
+
+def complete_action_type(
+        incomplete
+):
+    """Function that completes an action_type, or one of its aliases."""
+    names = {}
+    for action_type, action_entry in get_catalog()['actions'].items():
+        for name in [action_type] + action_entry['aliases']:
+            names.setdefault(name, action_entry['description'])
+    return complete_names(names, incomplete)
+
+
+def complete_request(
+        ctx,
+        incomplete
+):
+    """Function that completes a request, limited to the action_type typed before it."""
+    catalog = get_catalog()
+    action_type = ctx.params.get('action_type')
+    built_action = None
+    if action_type is not None:
+        built_action = registry_utils.compile_action_aliases(
+            get_allowable_actions(catalog)
+        ).get(registry_utils.format_registry_key(action_type))
+    names = {}
+    for request, request_entry in catalog['requests'].items():
+        if built_action in (None, request_entry['action_type']):
+            for name in [request] + request_entry['aliases']:
+                names.setdefault(name, request_entry['description'])
+    return complete_names(names, incomplete)
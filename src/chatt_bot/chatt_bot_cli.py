@@ -1,33 +1,83 @@
 """
 Module that kicks off chatt_bot workflow.
 """
-import ast
+# Native libraries
+import json
 # Custom modules
+from chatt_bot import catalog_utils
 from chatt_bot import generic_utils
-from chatt_bot import robot_actions
 # Non-native libraries
 import typer
+import typer.core
+
+
+class KickoffDefaultGroup(typer.core.TyperGroup):
+    """
+    Class that runs kickoff when the first argument is not a command, so
+    'chatt_bot <action_type> <request>' keeps working next to the other commands.
+    """
+    def parse_args(
+            self,
+            ctx,
+            args
+    ):
+        """Function that inserts 'kickoff' before an action_type given as the first argument."""
+        if args and not args[0].startswith('-') and args[0] not in self.commands:
+            args = ['kickoff'] + list(args)
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(help="chatt_bot cli", cls=KickoffDefaultGroup)
+
+KICKOFF_HELP = (
+    'Welcome to chatt_bot, which is a a simple CLI tool '
+    'that easily allows for the exploration of Chattanooga. \n\n'
+    'chatt_bot takes in two required arguments: '
+    '1) action_type and 2) request.'
+)
+
+
+class KickoffCommand(typer.core.TyperCommand):
+    """
+    Class that lists the available action_types and requests in kickoff's help,
+    reading the catalog only when the help is shown.
+    """
+    def format_help(
+            self,
+            ctx,
+            formatter
+    ):
+        """Function that adds the catalog listing to the help, then formats it."""
+        # The help text and completion read the catalog snapshot, so the CLI only
+        # imports robot_actions (and the workflow stack) once an action runs.
+        catalog = catalog_utils.get_catalog()
+        self.help = (
+            KICKOFF_HELP +
+            ' The available action_types (and aliases) are:\n ' +
+            str(catalog_utils.get_allowable_actions(catalog)) +
+            '. \nAs for a request, request is the specific action_type you want'
+            ' to kick off. '
+            'The available requests are:\n' +
+            str(catalog_utils.get_allowable_requests(catalog))
+        )
+        return super().format_help(ctx, formatter)
 
-app = typer.Typer(help="chatt_bot cli")
 
 @app.command(
-    help='Welcome to chatt_bot, which is a a simple CLI tool '
-         'that easily allows for the exploration of Chattanooga. \n\n'
-         'chatt_bot takes in two required arguments: '
-         '1) action_type and 2) request.'
-         ' The available action_types (and aliases) are:\n ' +
-         str(robot_actions.get_allowable_actions()) +
-         '. \nAs for a request, request is the specific action_type you want'
-         ' to kick off. '
-         'The available requests are:\n' + str(robot_actions.get_allowable_requests())
+    cls=KickoffCommand,
+    help=KICKOFF_HELP
 )
 
 def kickoff(
         action_type: str = typer.Argument(
-            ..., help="The action you want to perform."
+            ...,
+            help="The action you want to perform.",
+            autocompletion=catalog_utils.complete_action_type
         ),
         request: str = typer.Argument(
-            ..., help="The specific request related to action_type."
+            ...,
+            help="The specific request related to action_type.",
+            autocompletion=catalog_utils.complete_request
         ),
         add_args: str = typer.Option(
             '{}', help='Dictionary of other arguments in string form.'
@@ -36,83 +86,283 @@ def kickoff(
             False,
             help='Describes a specific action_type/request. '
                  'If added, then describes (but does not run), action_type/request.'
+        ),
+        as_json: bool = typer.Option(
+            False,
+            '--json',
+            help='If added with --describe, prints the description as JSON.'
+        ),
+        profile: bool = typer.Option(
+            False,
+            help='If added, runs the workflow under cProfile, saving the stats '
+                 'next to the run history and printing the top functions.'
+        ),
+        no_cache: bool = typer.Option(
+            False,
+            help='If added, a cacheable request neither reads nor stores a cached result.'
+        ),
+        refresh: bool = typer.Option(
+            False,
+            help='If added, a cacheable request runs again, replacing its cached result.'
         )
 ):
     """
     Kicks off a chatt_bot job.
     """
-    allowable_action_types = robot_actions.get_allowable_actions()
-    action_type = str(action_type).strip().lower().replace("'", "").replace('"', "")
-    # Format string args
-    original_arg_string = add_args
-    # try to convert additional args to dictionary
-    try:
-        add_args = ast.literal_eval(original_arg_string)
-    except (ValueError, SyntaxError):
-        add_args = str(original_arg_string).replace("}","").replace("{","")
-        add_args = add_args.replace("'", "").replace('"','')
-        add_args = {
-            i.split(':')[0]: i.split(':')[1] for i in add_args.split(',')
-        }
-    # Ensure action_type is listed in built-out options.
-    for built_action_type in allowable_action_types.keys():
-        if action_type in allowable_action_types[built_action_type]:
-            action_type = built_action_type
-    try:
-        assert action_type in allowable_action_types.keys()
-    except AssertionError as bad_action_type:
-        raise ValueError(
-            f"action_type='{action_type}' not recognized. "
-            f"Allowable action_type list: {allowable_action_types.keys()}"
-        ) from bad_action_type
-    # Ensure action_type/request are valid.
-    request = str(request).strip().lower().replace("'", "").replace('"', "")
-    try:
-        assert request in robot_actions.get_allowable_requests()[action_type]
-    except AssertionError as request_not_found:
-        allowable_list = robot_actions.get_allowable_requests()[action_type]
-        allowable_list.sort()
-        raise ValueError(
-            f"Request {request} not found for action_type='{action_type}'.\n"
-            f"Available requests for action_type='{action_type}' are:\n"
-            f"{allowable_list}"
-        ) from request_not_found
-    # Check if user wants to describe action_type/request:
+    # Check if user wants to describe action_type/request, from the catalog alone.
     if describe:
-        try:
-            description= {
-                'action_type': action_type,
-                'request': request,
-                'description': robot_actions.get_request_description()[
-                    request
-                ]
-            }
-            # Get the all possible additional args.
-            try:
-                more_args = robot_actions.get_request_additional_arguments()[request]
-                more_args = None if more_args == {} else more_args
-            except KeyError:
-                more_args = None
-            finally:
-                description['Additional Arguments'] = more_args
-            description = generic_utils.pretty_print_dict(
-                description
-            )
-        except KeyError:
-            description = "Description not built for " \
-                        f"action_type='{action_type}', request='{request}'"
-        print(description)
+        catalog = catalog_utils.get_catalog()
+        action_type, request = catalog_utils.resolve_catalog_request(
+            catalog,
+            action_type,
+            request
+        )
+        request_entry = catalog['requests'][request]
+        description = {
+            'action_type': action_type,
+            'request': request,
+            'description': request_entry['description'],
+            'Additional Arguments': request_entry['arguments'] or None,
+            'Cache TTL': request_entry['cache_ttl']
+        }
+        if as_json:
+            print(json.dumps(dict(description, aliases=request_entry['aliases'])))
+            return
+        for description_piece in generic_utils.iter_pretty_dict(description):
+            print(description_piece, end='')
+        print()
         return
-    # Check additional arguments
-    robot_actions.check_additional_arguments(
-        request,
-        **add_args
-    )
-    # Call the bot action.
-    robot_actions.BotAction(
+    # Import the registry lazily, so describe and completion don't pay for it.
+    from chatt_bot import robot_actions  # pylint: disable=import-outside-toplevel
+    # Format string args
+    add_args = robot_actions.parse_additional_arguments(add_args)
+    # Ensure action_type/request are valid.
+    action_type = robot_actions.resolve_action_type(action_type)
+    request = robot_actions.resolve_request(action_type, request)
+    # Call the bot action, which checks the additional arguments.
+    run_log = robot_actions.BotAction(
         action_type=action_type,
-        request=request
+        request=request,
+        profile=profile,
+        use_cache=not no_cache,
+        refresh_cache=refresh
     ).execute_action(**add_args)
+    # Surface a failing command's exit status as the CLI's own.
+    if run_log['exit_status']:
+        raise typer.Exit(code=run_log['exit_status'])
+
+
+@app.command(
+    help='Runs chatt_bot as a long-lived server on a Unix domain socket, '
+         'keeping the interpreter and loaded workflows warm between requests. '
+         'Requests are sent with the "send" command.'
+)
+def serve(
+        socket_path: str = typer.Option(
+            None, help='Location of the Unix domain socket.'
+        ),
+        stop: bool = typer.Option(
+            False, help='If added, asks the running server to shut down.'
+        ),
+        metrics_port: int = typer.Option(
+            None, help='If given, serves Prometheus metrics on '
+                       'http://127.0.0.1:<metrics-port>/metrics.'
+        )
+):
+    """
+    Starts (or stops) the chatt_bot server.
+    """
+    # Import server lazily, so other commands don't pay for it.
+    from chatt_bot import bot_server  # pylint: disable=import-outside-toplevel
+    from chatt_bot import metrics_utils  # pylint: disable=import-outside-toplevel
+    if stop:
+        bot_server.send_request({'command': 'shutdown'}, socket_path=socket_path)
+        return
+    server = bot_server.BotServer(socket_path=socket_path)
+    print(f'chatt_bot server listening on {server.socket_path}')
+    if metrics_port is not None:
+        metrics_utils.start_metrics_server(port=metrics_port)
+        print(f'chatt_bot metrics served on http://127.0.0.1:{metrics_port}/metrics')
+    server.serve_until_shutdown()
+
+
+@app.command(
+    help='Sends an action_type/request to a running chatt_bot server, '
+         'and streams back its output.'
+)
+def send(
+        action_type: str = typer.Argument(
+            ...,
+            help="The action you want to perform.",
+            autocompletion=catalog_utils.complete_action_type
+        ),
+        request: str = typer.Argument(
+            ...,
+            help="The specific request related to action_type.",
+            autocompletion=catalog_utils.complete_request
+        ),
+        add_args: str = typer.Option(
+            '{}', help='Dictionary of other arguments in string form.'
+        ),
+        socket_path: str = typer.Option(
+            None, help='Location of the Unix domain socket.'
+        )
+):
+    """
+    Sends a chatt_bot job to the chatt_bot server.
+    """
+    # Import server lazily, so other commands don't pay for it.
+    from chatt_bot import bot_server  # pylint: disable=import-outside-toplevel
+    result = bot_server.send_request(
+        {'action_type': action_type, 'request': request, 'add_args': add_args},
+        socket_path=socket_path
+    )
+    if result['status'] == 'error':
+        typer.echo(result['error'], err=True)
+        raise typer.Exit(code=1)
+    # Surface a failing command's exit status as the CLI's own, as kickoff does.
+    if result['run_log']['exit_status']:
+        raise typer.Exit(code=result['run_log']['exit_status'])
+
+
+@app.command(
+    help='Runs every job of a JSON lines job file, where each line is one '
+         '{"action_type": ..., "request": ..., "add_args": {...}} record. '
+         'All jobs are validated before any of them run.'
+)
+def batch(
+        job_file: str = typer.Argument(
+            ..., help="Location of the JSON lines job file."
+        ),
+        max_workers: int = typer.Option(
+            4, help='Maximum number of jobs running at once.'
+        ),
+        use_processes: bool = typer.Option(
+            False, help='If added, runs jobs on a process pool instead of a thread pool.'
+        ),
+        quiet: bool = typer.Option(
+            False, help='If added, only the batch summary is printed.'
+        ),
+        use_async: bool = typer.Option(
+            False, help='If added, runs jobs as coroutines on one event loop, '
+                        'with max-workers jobs in flight at once.'
+        ),
+        metrics_file: str = typer.Option(
+            None, help='If given, dumps Prometheus metrics to this file once the batch ends.'
+        )
+):
+    """
+    Runs a batch of chatt_bot jobs.
+    """
+    # Import batch runner lazily, so other commands don't pay for it.
+    from chatt_bot import bot_batch  # pylint: disable=import-outside-toplevel
+    from chatt_bot import metrics_utils  # pylint: disable=import-outside-toplevel
+    summary = bot_batch.run_batch(
+        job_file,
+        max_workers=max_workers,
+        use_processes=use_processes,
+        quiet=quiet,
+        use_async=use_async
+    )
+    print(generic_utils.pretty_print_dict(summary))
+    if metrics_file is not None:
+        metrics_utils.write_metrics_file(metrics_file)
+    if summary['failed']:
+        raise typer.Exit(code=1)
+
+
+@app.command(
+    help='Runs jobs on recurring schedules from a JSON lines schedule file, where each '
+         'line is a job record plus "interval" (e.g. 300 or "5m") or "cron" (e.g. '
+         '"*/5 8-18 * * 1-5"), and optionally "name", "jitter" (seconds), "overlap" '
+         '(skip, queue or concurrent) and "catch_up". Runs until interrupted.'
+)
+def schedule(
+        schedule_file: str = typer.Argument(
+            ..., help="Location of the JSON lines schedule file."
+        ),
+        max_workers: int = typer.Option(
+            8, help='Maximum number of scheduled jobs running at once.'
+        ),
+        verbose: bool = typer.Option(
+            False, help='If added, prints when a firing is skipped.'
+        ),
+        metrics_port: int = typer.Option(
+            None, help='If given, serves Prometheus metrics on '
+                       'http://127.0.0.1:<metrics-port>/metrics.'
+        )
+):
+    """
+    Runs scheduled chatt_bot jobs.
+    """
+    # Import scheduler lazily, so other commands don't pay for it.
+    from chatt_bot import bot_scheduler  # pylint: disable=import-outside-toplevel
+    from chatt_bot import metrics_utils  # pylint: disable=import-outside-toplevel
+    try:
+        schedules = bot_scheduler.read_schedule_file(schedule_file)
+    except ValueError as bad_schedule:
+        raise typer.BadParameter(str(bad_schedule)) from bad_schedule
+    scheduler = bot_scheduler.BotScheduler(
+        schedules,
+        max_workers=max_workers,
+        verbose=verbose
+    )
+    if metrics_port is not None:
+        metrics_utils.start_metrics_server(port=metrics_port)
+        print(f'chatt_bot metrics served on http://127.0.0.1:{metrics_port}/metrics')
+    print(f'chatt_bot scheduler running {len(schedules)} schedule(s).')
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    print(f'{scheduler.fired} run(s) fired, {scheduler.skipped} skipped.')
+
+
+@app.command(
+    help='Queries the run history. Lists the most recent runs, or with '
+         '--aggregate, the count, mean, p50, p95 and max run_time of each request. '
+         "Times are ISO format (e.g. '2026-10-12') or relative (e.g. '30m', '12h', '7d')."
+)
+def history(
+        action_type: str = typer.Option(
+            None, help='Only runs of this action_type.'
+        ),
+        request: str = typer.Option(
+            None, help='Only runs of this request.'
+        ),
+        since: str = typer.Option(
+            None, help='Only runs started at or after this time.'
+        ),
+        until: str = typer.Option(
+            None, help='Only runs started before this time.'
+        ),
+        limit: int = typer.Option(
+            20, help='Maximum number of runs listed.'
+        ),
+        aggregate: bool = typer.Option(
+            False, help='If added, prints run_time aggregates per request instead of runs.'
+        )
+):
+    """
+    Queries the chatt_bot run history.
+    """
+    # Import the history store lazily, so other commands don't pay for it.
+    from chatt_bot import robot_actions  # pylint: disable=import-outside-toplevel
+    from chatt_bot import run_history  # pylint: disable=import-outside-toplevel
+    history_store = run_history.get_run_history_store()
+    if action_type is not None:
+        action_type = robot_actions.resolve_action_type(action_type)
+    try:
+        if aggregate:
+            history_rows = history_store.aggregate(action_type, request, since, until)
+        else:
+            history_rows = history_store.query(action_type, request, since, until, limit)
+    except ValueError as bad_filter:
+        raise typer.BadParameter(str(bad_filter)) from bad_filter
+    for history_row in history_rows:
+        print(generic_utils.pretty_print_dict(history_row))
+        print('-'*100)
+    print(f'{len(history_rows)} row(s).')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,324 @@
+"""
+Module that contains the command execution engine of chatt_bot.
+"""
+# Native libraries
+import asyncio
+import concurrent.futures
+import os
+import signal
+import subprocess
+import threading
+import time
+# Custom modules
+from chatt_bot import generic_utils
+from chatt_bot import timing_utils
+
+
+def print_command_output(
+        command,
+        stream_name,
+        line
+):
+    """
+    Default output handler, that prints a line of command output as it arrives.
+
+    :param str command:
+            The command that produced the line.
+    :param str stream_name:
+            Either 'stdout' or 'stderr'.
+    :param str line:
+            The line of output.
+    """
+    print(f'[{stream_name}] {command}: {line.rstrip()}', flush=True)
+
+
+class CommandExecutor(generic_utils.VerboseAttributes):
+    """
+    Class that runs shell commands with bounded parallelism, captured output
+    and per-command timeouts.
+    """
+    def __init__(
+            self,
+            max_parallel=4,
+            timeout=None,
+            output_handler=print_command_output,
+            verbose=False
+    ):
+        """
+        Initialization function, that sets up the worker pool.
+
+        :param int max_parallel:
+                Maximum number of commands running at once.
+        :param float timeout:
+                Default timeout, in seconds, for each command. None waits forever.
+        :param callable output_handler:
+                Called with (command, stream_name, line) for every line of output.
+                If None, output is only captured.
+        :param bool verbose:
+                Specifies whether user wants all print out statements.
+        """
+        super().__init__(verbose=verbose)
+        self.max_parallel = generic_utils.cast_integer(max_parallel, 'max_parallel')
+        if self.max_parallel < 1:
+            raise ValueError("Parameter 'max_parallel' must be greater than zero.")
+        self.timeout = timeout
+        self.output_handler = output_handler
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_parallel,
+            thread_name_prefix='chatt_bot_command'
+        )
+
+    def __enter__(
+            self
+    ):
+        """Function that allows the executor to be used as a context manager."""
+        return self
+
+    def __exit__(
+            self,
+            *exc_info
+    ):
+        """Function that shuts the executor down on leaving the context."""
+        self.shutdown()
+
+    def _read_stream(
+            self,
+            command,
+            stream_name,
+            stream,
+            captured_lines
+    ):
+        """Function that captures (and hands off) each line of a command stream."""
+        for line in iter(stream.readline, ''):
+            captured_lines.append(line)
+            if self.output_handler is not None:
+                self.output_handler(command, stream_name, line)
+        stream.close()
+
+    @timing_utils.timed('command_utils.run')
+    def run(
+            self,
+            command,
+            timeout=None
+    ):
+        """
+        Function that runs a single command, blocking until it completes.
+
+        :param str command:
+                The command to be executed.
+        :param float timeout:
+                Timeout, in seconds, for the command. If None, uses the default.
+        :return: dict:
+                The command, its exit status, captured stdout/stderr,
+                run time, and whether it timed out.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if self.verbose:
+            print(f'Starting command: {command}')
+        start_time = time.perf_counter()
+        command_result = {
+            'command': command,
+            'exit_status': None,
+            'stdout': [],
+            'stderr': [],
+            'run_time': None,
+            'timed_out': False
+        }
+        with subprocess.Popen(
+                command,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                # Own process group, so a timeout also stops the shell's children.
+                start_new_session=os.name == 'posix'
+        ) as process:
+            # Drain both pipes concurrently, so neither can fill and block.
+            readers = [
+                threading.Thread(
+                    target=self._read_stream,
+                    args=(command, stream_name, stream, command_result[stream_name]),
+                    daemon=True
+                )
+                for stream_name, stream in
+                (('stdout', process.stdout), ('stderr', process.stderr))
+            ]
+            for reader in readers:
+                reader.start()
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                command_result['timed_out'] = True
+                if os.name == 'posix':
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+                process.wait()
+            for reader in readers:
+                reader.join()
+            command_result['exit_status'] = process.returncode
+        command_result['stdout'] = ''.join(command_result['stdout'])
+        command_result['stderr'] = ''.join(command_result['stderr'])
+        command_result['run_time'] = time.perf_counter() - start_time
+        return command_result
+
+    def submit(
+            self,
+            command,
+            timeout=None
+    ):
+        """
+        Function that launches a command without blocking.
+
+        :param str command:
+                The command to be executed.
+        :param float timeout:
+                Timeout, in seconds, for the command. If None, uses the default.
+        :return: concurrent.futures.Future:
+                Future that resolves to the result of CommandExecutor.run.
+        """
+        return self._pool.submit(timing_utils.bind_context(self.run), command, timeout)
+
+    def run_many(
+            self,
+            commands,
+            timeout=None
+    ):
+        """
+        Function that runs several commands, at most max_parallel at once.
+
+        :param list commands:
+                The commands to be executed.
+        :param float timeout:
+                Timeout, in seconds, for each command. If None, uses the default.
+        :return: list:
+                The command results, in the same order as commands.
+        """
+        pending_commands = [self.submit(command, timeout) for command in commands]
+        return [pending_command.result() for pending_command in pending_commands]
+
+    def shutdown(
+            self,
+            wait=True
+    ):
+        """
+        Function that shuts down the worker pool.
+
+        :param bool wait:
+                Whether to wait for running commands to finish.
+        """
+        self._pool.shutdown(wait=wait)
+
+
+async def read_stream_async(
+        command,
+        stream_name,
+        stream,
+        captured_lines,
+        output_handler
+):
+    """Coroutine that captures (and hands off) each line of an asyncio subprocess stream."""
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        line = line.decode(errors='replace')
+        captured_lines.append(line)
+        if output_handler is not None:
+            output_handler(command, stream_name, line)
+
+
+async def run_command_async(
+        command,
+        timeout=None,
+        output_handler=print_command_output
+):
+    """
+    Coroutine that runs a single command on the event loop, without a thread per command.
+
+    :param str command:
+            The command to be executed.
+    :param float timeout:
+            Timeout, in seconds, for the command. None waits forever.
+    :param callable output_handler:
+            Called with (command, stream_name, line) for every line of output.
+            If None, output is only captured.
+    :return: dict:
+            The command, its exit status, captured stdout/stderr,
+            run time, and whether it timed out.
+    """
+    start_time = time.perf_counter()
+    command_result = {
+        'command': command,
+        'exit_status': None,
+        'stdout': [],
+        'stderr': [],
+        'run_time': None,
+        'timed_out': False
+    }
+    with timing_utils.span('command_utils.run_command_async'):
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own process group, so a timeout also stops the shell's children.
+            start_new_session=os.name == 'posix'
+        )
+        readers = asyncio.gather(
+            read_stream_async(
+                command, 'stdout', process.stdout, command_result['stdout'], output_handler
+            ),
+            read_stream_async(
+                command, 'stderr', process.stderr, command_result['stderr'], output_handler
+            )
+        )
+        try:
+            await asyncio.wait_for(process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            command_result['timed_out'] = True
+            if os.name == 'posix':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+            await process.wait()
+        await readers
+        command_result['exit_status'] = process.returncode
+    command_result['stdout'] = ''.join(command_result['stdout'])
+    command_result['stderr'] = ''.join(command_result['stderr'])
+    command_result['run_time'] = time.perf_counter() - start_time
+    return command_result
+
+
+async def run_commands_async(
+        commands,
+        max_parallel=4,
+        timeout=None,
+        output_handler=print_command_output
+):
+    """
+    Coroutine that runs several commands on the event loop, at most max_parallel at once.
+
+    :param list commands:
+            The commands to be executed.
+    :param int max_parallel:
+            Maximum number of commands running at once.
+    :param float timeout:
+            Timeout, in seconds, for each command. None waits forever.
+    :param callable output_handler:
+            Called with (command, stream_name, line) for every line of output.
+    :return: list:
+            The command results, in the same order as commands.
+    """
+    max_parallel = generic_utils.cast_integer(max_parallel, 'max_parallel')
+    if max_parallel < 1:
+        raise ValueError("Parameter 'max_parallel' must be greater than zero.")
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def run_bounded(
+            command
+    ):
+        async with semaphore:
+            return await run_command_async(command, timeout, output_handler)
+
+    return await asyncio.gather(*[run_bounded(command) for command in commands])
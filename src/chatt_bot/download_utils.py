@@ -0,0 +1,654 @@
+"""
+Module that contains the download engine of chatt_bot: large adaptive buffers,
+resumable .part files, atomic completion, checksums and parallel ranged segments.
+"""
+# Native libraries
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+import uuid
+# Custom modules
+from chatt_bot import bot_utils
+from chatt_bot import generic_utils
+from chatt_bot import http_utils
+from chatt_bot import metrics_utils
+from chatt_bot import timing_utils
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+MAX_BUFFER_SIZE = 16 * 1024 * 1024
+# Ranged requests only make sense against the bytes as stored on the server.
+IDENTITY_HEADERS = {'Accept-Encoding': 'identity'}
+
+
+def write_response(
+        response,
+        download_file,
+        buffer_size=None,
+        hasher=None
+):
+    """
+    Function that copies a streamed response into an open file, reading into
+    a preallocated buffer that grows while reads keep filling it.
+
+    :param requests.Response response:
+            The streamed response.
+    :param io.BufferedIOBase download_file:
+            The open, writable file.
+    :param int buffer_size:
+            Fixed buffer size in bytes. If None, starts at DEFAULT_BUFFER_SIZE
+            and adapts up to MAX_BUFFER_SIZE.
+    :param hashlib._Hash hasher:
+            Optional hash object updated with every written byte.
+    :return: int:
+            Number of bytes written.
+    """
+    is_adaptive = buffer_size is None
+    buffer_size = DEFAULT_BUFFER_SIZE if is_adaptive else max(int(buffer_size), 1)
+    buffer = bytearray(buffer_size)
+    buffer_view = memoryview(buffer)
+    bytes_written = 0
+    while True:
+        bytes_read = response.raw.readinto(buffer_view)
+        if not bytes_read:
+            break
+        download_file.write(buffer_view[:bytes_read])
+        if hasher is not None:
+            hasher.update(buffer_view[:bytes_read])
+        bytes_written += bytes_read
+        # A full read means data is arriving faster than we drain it, so read more per call.
+        if is_adaptive and bytes_read == buffer_size and buffer_size < MAX_BUFFER_SIZE:
+            buffer_size = min(buffer_size * 2, MAX_BUFFER_SIZE)
+            buffer = bytearray(buffer_size)
+            buffer_view = memoryview(buffer)
+    return bytes_written
+
+
+def hash_file(
+        file_name,
+        checksum_algorithm='sha256',
+        hasher=None
+):
+    """
+    Function that hashes a file on disk.
+
+    :param str file_name:
+            The file to hash.
+    :param str checksum_algorithm:
+            Any algorithm supported by hashlib. Ignored if hasher is given.
+    :param hashlib._Hash hasher:
+            Optional hash object to continue updating.
+    :return: hashlib._Hash:
+            The updated hash object.
+    """
+    hasher = hashlib.new(checksum_algorithm) if hasher is None else hasher
+    with open(file_name, 'rb') as hashed_file:
+        for block in iter(lambda: hashed_file.read(DEFAULT_BUFFER_SIZE), b''):
+            hasher.update(block)
+    return hasher
+
+
+def verify_checksum(
+        hasher,
+        checksum,
+        part_file_name
+):
+    """
+    Function that compares a finished download's hash to the expected checksum,
+    deleting the download on mismatch.
+
+    :param hashlib._Hash hasher:
+            Hash object of the downloaded bytes.
+    :param str checksum:
+            Expected hex digest.
+    :param str part_file_name:
+            The downloaded .part file.
+    """
+    if hasher.hexdigest().lower() != str(checksum).strip().lower():
+        os.remove(part_file_name)
+        raise ValueError(
+            f"Checksum mismatch for '{part_file_name}': expected {checksum}, "
+            f"got {hasher.hexdigest()}."
+        )
+
+
+def get_range_support(
+        http_client,
+        url,
+        timeout
+):
+    """
+    Function that checks whether a server allows ranged requests for a url.
+
+    :param http_utils.HttpClient http_client:
+            The client sending the request.
+    :param str url:
+            The url requested.
+    :param float timeout:
+            Timeout, in seconds, for the request.
+    :return: int:
+            The content length if ranges are supported, otherwise None.
+    """
+    with http_client.head(
+            url,
+            headers=IDENTITY_HEADERS,
+            allow_redirects=True,
+            timeout=timeout
+    ) as response:
+        response.raise_for_status()
+        content_length = response.headers.get('Content-Length')
+        if response.headers.get('Accept-Ranges', '').lower() != 'bytes' or not content_length:
+            return None
+        return int(content_length)
+
+
+def download_single_stream(
+        http_client,
+        url,
+        part_file_name,
+        buffer_size,
+        hasher,
+        resume,
+        timeout
+):
+    """
+    Function that downloads a url into a .part file over one connection,
+    resuming from the .part file's size when the server allows it.
+
+    :return: tuple:
+            (bytes written, bytes resumed from).
+    """
+    resumed_from = os.path.getsize(part_file_name) \
+        if resume and os.path.isfile(part_file_name) else 0
+    headers = dict(IDENTITY_HEADERS)
+    if resumed_from:
+        headers['Range'] = f'bytes={resumed_from}-'
+    with http_client.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        # Range not satisfiable: the .part file does not match, so start over.
+        if resumed_from and response.status_code == 416:
+            os.remove(part_file_name)
+            return download_single_stream(
+                http_client, url, part_file_name, buffer_size, hasher, False, timeout
+            )
+        response.raise_for_status()
+        # The server ignored the range, so the whole file is coming again.
+        if response.status_code != 206:
+            resumed_from = 0
+        if resumed_from and hasher is not None:
+            hash_file(part_file_name, hasher=hasher)
+        with open(part_file_name, 'ab' if resumed_from else 'wb') as download_file:
+            bytes_written = write_response(response, download_file, buffer_size, hasher)
+    return bytes_written, resumed_from
+
+
+def download_segment(
+        http_client,
+        url,
+        part_file_name,
+        segment_start,
+        segment_end,
+        buffer_size,
+        timeout
+):
+    """
+    Function that downloads the bytes segment_start..segment_end (inclusive)
+    into their place in a preallocated .part file.
+
+    :return: int:
+            Number of bytes written.
+    """
+    headers = {**IDENTITY_HEADERS, 'Range': f'bytes={segment_start}-{segment_end}'}
+    with http_client.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise ConnectionError(
+                f"Server ignored the range request for segment {segment_start}-{segment_end}."
+            )
+        with open(part_file_name, 'r+b') as download_file:
+            download_file.seek(segment_start)
+            return write_response(response, download_file, buffer_size)
+
+
+def read_progress(
+        progress_file_name
+):
+    """
+    Function that reads the finished segments of a segmented download.
+
+    :param str progress_file_name:
+            Location of the .part.json file.
+    :return: dict:
+            The saved progress, or an empty dict if it is missing, truncated
+            or unreadable, so the download starts over.
+    """
+    try:
+        with open(progress_file_name, 'r', encoding='utf-8') as progress_file:
+            saved_progress = json.load(progress_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(saved_progress, dict) or \
+            not isinstance(saved_progress.get('done_segments'), list):
+        return {}
+    return saved_progress
+
+
+def save_progress(
+        progress,
+        progress_file_name
+):
+    """Function that atomically records the finished segments of a segmented download."""
+    temporary_location = f'{progress_file_name}.{uuid.uuid4().hex}.tmp'
+    with open(temporary_location, 'w', encoding='utf-8') as progress_file:
+        json.dump(progress, progress_file)
+    os.replace(temporary_location, progress_file_name)
+
+
+def download_segmented(
+        http_client,
+        url,
+        part_file_name,
+        content_length,
+        segments,
+        buffer_size,
+        resume,
+        timeout
+):
+    """
+    Function that downloads a url as parallel ranged segments into a
+    preallocated .part file. Finished segments are recorded in a
+    .part.json file, so an interrupted download only redoes unfinished ones.
+
+    :return: tuple:
+            (bytes written, bytes resumed from).
+    """
+    progress_file_name = f'{part_file_name}.json'
+    segment_size = -(-content_length // segments)
+    segment_starts = list(range(0, content_length, segment_size))
+    progress = {'url': url, 'content_length': content_length,
+                'segment_size': segment_size, 'done_segments': []}
+    if resume and os.path.isfile(part_file_name):
+        saved_progress = read_progress(progress_file_name)
+        if all(saved_progress.get(key) == progress[key]
+               for key in ('url', 'content_length', 'segment_size')):
+            progress = saved_progress
+    if not progress['done_segments']:
+        # Preallocate, so segments can be written in place.
+        with open(part_file_name, 'wb') as download_file:
+            download_file.truncate(content_length)
+    resumed_from = sum(
+        min(segment_size, content_length - segment_start)
+        for segment_start in progress['done_segments']
+    )
+    bytes_written = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=segments) as segment_pool:
+        pending_segments = {
+            segment_pool.submit(
+                timing_utils.bind_context(download_segment),
+                http_client,
+                url,
+                part_file_name,
+                segment_start,
+                min(segment_start + segment_size, content_length) - 1,
+                buffer_size,
+                timeout
+            ): segment_start
+            for segment_start in segment_starts
+            if segment_start not in progress['done_segments']
+        }
+        for finished_segment in concurrent.futures.as_completed(pending_segments):
+            bytes_written += finished_segment.result()
+            progress['done_segments'].append(pending_segments[finished_segment])
+            save_progress(progress, progress_file_name)
+    os.remove(progress_file_name)
+    return bytes_written, resumed_from
+
+
+@timing_utils.timed('download_utils.download_file')
+def download_file(
+        url,
+        local_file_name,
+        buffer_size=None,
+        checksum=None,
+        checksum_algorithm='sha256',
+        segments=1,
+        resume=True,
+        use_cache=False,
+        timeout=2000,
+        http_client=None
+):
+    """
+    Function that downloads a url to a file. Data is written to
+    '{local_file_name}.part', which is renamed to local_file_name only
+    once complete (and verified), so a partial file never takes its place.
+
+    :param str url:
+            The valid api/url accessing the data.
+    :param str local_file_name:
+            A valid file-name, where data will be saved.
+    :param int buffer_size:
+            Read buffer size in bytes. If None, adapts between
+            DEFAULT_BUFFER_SIZE and MAX_BUFFER_SIZE.
+    :param str checksum:
+            Optional expected hex digest of the file.
+    :param str checksum_algorithm:
+            Any algorithm supported by hashlib.
+    :param int segments:
+            Number of parallel ranged segments. Falls back to one stream if
+            the server does not support ranges.
+    :param bool resume:
+            Whether to continue from an existing .part file.
+    :param bool use_cache:
+            If True, and the file from a previous download is unchanged,
+            sends a conditional request and skips rewriting it on a 304.
+    :param float timeout:
+            Timeout, in seconds, for each request.
+    :param http_utils.HttpClient http_client:
+            Client sending the requests. If None, uses the shared client.
+    :return: dict:
+            The url, path, bytes written, bytes resumed from, whether the
+            download was skipped as unchanged, elapsed seconds and MB/s.
+    """
+    http_client = http_utils.get_http_client() if http_client is None else http_client
+    part_file_name = f'{local_file_name}.part'
+    hasher = None if checksum is None else hashlib.new(checksum_algorithm)
+    start_time = time.perf_counter()
+    download_result = {
+        'url': url,
+        'path': local_file_name,
+        'bytes': 0,
+        'resumed_from': 0,
+        'skipped': False,
+        'elapsed': None,
+        'throughput_mb_s': None
+    }
+    if use_cache:
+        with http_utils.get_http_cache().conditional_request(
+                http_client,
+                'GET',
+                url,
+                file_name=local_file_name,
+                headers=IDENTITY_HEADERS,
+                stream=True,
+                timeout=timeout
+        ) as (_, response):
+            if response is None:
+                download_result['skipped'] = True
+            else:
+                response.raise_for_status()
+                with open(part_file_name, 'wb') as download_file:
+                    download_result['bytes'] = write_response(
+                        response, download_file, buffer_size, hasher
+                    )
+                if hasher is not None:
+                    verify_checksum(hasher, checksum, part_file_name)
+                # Rename inside the block, so the cache records the finished file.
+                os.replace(part_file_name, local_file_name)
+        http_utils.flush_http_cache()
+    else:
+        content_length = get_range_support(http_client, url, timeout) \
+            if int(segments) > 1 else None
+        if content_length:
+            download_result['bytes'], download_result['resumed_from'] = download_segmented(
+                http_client, url, part_file_name, content_length,
+                int(segments), buffer_size, resume, timeout
+            )
+            # Segments arrive out of order, so the checksum is taken from disk.
+            if hasher is not None:
+                hash_file(part_file_name, hasher=hasher)
+        else:
+            download_result['bytes'], download_result['resumed_from'] = download_single_stream(
+                http_client, url, part_file_name, buffer_size, hasher, resume, timeout
+            )
+        if hasher is not None:
+            verify_checksum(hasher, checksum, part_file_name)
+        os.replace(part_file_name, local_file_name)
+    download_result['elapsed'] = time.perf_counter() - start_time
+    download_result['throughput_mb_s'] = \
+        download_result['bytes'] / (1024 * 1024) / max(download_result['elapsed'], 1e-9)
+    metrics_utils.DOWNLOAD_BYTES_TOTAL.inc(
+        metrics_utils.get_url_host(url),
+        amount=download_result['bytes']
+    )
+    return download_result
+
+
+class DownloadManager(generic_utils.VerboseAttributes):
+    """
+    Class that downloads a manifest of many urls with bounded global and
+    per-host concurrency, persisting queue state so a restart skips
+    finished files.
+    """
+    def __init__(
+            self,
+            state_location=None,
+            max_workers=8,
+            max_per_host=2,
+            segments=1,
+            use_cache=False,
+            verbose=False
+    ):
+        """
+        Initialization function, that sets the download limits.
+
+        :param str state_location:
+                Location of the queue state file. If None, a file named after
+                the manifest is kept in the bot cache folder.
+        :param int max_workers:
+                Maximum number of downloads running at once.
+        :param int max_per_host:
+                Maximum number of downloads running at once against a single host.
+        :param int segments:
+                Parallel ranged segments per download (see download_file).
+        :param bool use_cache:
+                Whether downloads go through the conditional-request cache.
+        :param bool verbose:
+                Specifies whether user wants all print out statements.
+        """
+        super().__init__(verbose=verbose)
+        self.state_location = state_location
+        self.max_workers = generic_utils.cast_integer(max_workers, 'max_workers')
+        self.max_per_host = generic_utils.cast_integer(max_per_host, 'max_per_host')
+        if self.max_workers < 1 or self.max_per_host < 1:
+            raise ValueError(
+                "Parameters 'max_workers' and 'max_per_host' must be greater than zero."
+            )
+        self.segments = segments
+        self.use_cache = use_cache
+        self._state_lock = threading.Lock()
+
+    @staticmethod
+    def format_manifest(
+            manifest
+    ):
+        """
+        Function that formats manifest items to dicts with url, path and checksum.
+
+        :param list manifest:
+                Dicts with 'url', 'path' and optional 'checksum', 'extract_to'
+                and 'extract_patterns'; or (url, path) tuples.
+        :return: list:
+                The formatted manifest.
+        """
+        formatted_manifest = []
+        for manifest_item in manifest:
+            if not isinstance(manifest_item, dict):
+                manifest_item = dict(zip(('url', 'path', 'checksum'), manifest_item))
+            try:
+                formatted_manifest.append({
+                    'url': manifest_item['url'],
+                    'path': manifest_item['path'],
+                    'checksum': manifest_item.get('checksum'),
+                    'extract_to': manifest_item.get('extract_to'),
+                    'extract_patterns': manifest_item.get('extract_patterns')
+                })
+            except KeyError as missing_key:
+                raise ValueError(
+                    f"Manifest item {manifest_item} requires both 'url' and 'path'."
+                ) from missing_key
+        return formatted_manifest
+
+    def get_state_location(
+            self,
+            manifest
+    ):
+        """Function that returns where the queue state of a manifest is persisted."""
+        if self.state_location is not None:
+            return self.state_location
+        manifest_key = hashlib.sha1(
+            json.dumps(sorted(item['path'] for item in manifest)).encode('utf-8')
+        ).hexdigest()[:16]
+        return os.path.join(
+            bot_utils.setup_bot_cache_folder(),
+            f'download_queue_{manifest_key}.json'
+        )
+
+    def save_state(
+            self,
+            queue_state,
+            state_location
+    ):
+        """Function that atomically persists the queue state."""
+        with self._state_lock:
+            temporary_location = f'{state_location}.{uuid.uuid4().hex}.tmp'
+            with open(temporary_location, 'w', encoding='utf-8') as state_file:
+                json.dump(queue_state, state_file)
+            os.replace(temporary_location, state_location)
+
+    def download_item(
+            self,
+            manifest_item
+    ):
+        """
+        Function that downloads one manifest item, extracting it if asked.
+
+        :param dict manifest_item:
+                A formatted manifest item.
+        :return: dict:
+                The result of download_file, with the extraction summary
+                under 'extraction' (None if not extracted).
+        """
+        download_result = download_file(
+            manifest_item['url'],
+            manifest_item['path'],
+            checksum=manifest_item['checksum'],
+            segments=self.segments,
+            use_cache=self.use_cache
+        )
+        download_result['extraction'] = None
+        if manifest_item['extract_to'] is not None:
+            # Import archive utilities only when an archive is extracted.
+            from chatt_bot import archive_utils  # pylint: disable=import-outside-toplevel
+            download_result['extraction'] = archive_utils.extract_zip_archive(
+                manifest_item['path'],
+                manifest_item['extract_to'],
+                patterns=manifest_item['extract_patterns']
+            )
+        return download_result
+
+    def run(
+            self,
+            manifest,
+            progress_callback=None
+    ):
+        """
+        Function that downloads every unfinished manifest item.
+
+        :param list manifest:
+                Dicts with 'url', 'path' and optional 'checksum'; or (url, path) tuples.
+                Zip archives with an 'extract_to' folder (and optional
+                'extract_patterns' globs) are extracted right after downloading.
+        :param callable progress_callback:
+                Called with the running summary after each finished download.
+        :return: dict:
+                Aggregate summary: counts, bytes, elapsed seconds, MB/s,
+                and the queue state location.
+        """
+        manifest = self.format_manifest(manifest)
+        state_location = self.get_state_location(manifest)
+        try:
+            with open(state_location, 'r', encoding='utf-8') as state_file:
+                queue_state = json.load(state_file)
+        except (OSError, ValueError):
+            queue_state = {}
+        summary = {
+            'files': len(manifest),
+            'downloaded': 0,
+            'skipped': 0,
+            'failed': 0,
+            'bytes': 0,
+            'elapsed': None,
+            'throughput_mb_s': None,
+            'state_location': state_location
+        }
+        # Queue unfinished items per host, so one slow host cannot hold every worker.
+        host_queues = collections.OrderedDict()
+        for manifest_item in manifest:
+            item_state = queue_state.get(manifest_item['path'], {})
+            if item_state.get('status') == 'done' and os.path.isfile(manifest_item['path']):
+                summary['skipped'] += 1
+                continue
+            queue_state[manifest_item['path']] = {'url': manifest_item['url'], 'status': 'pending'}
+            host = urllib.parse.urlsplit(manifest_item['url']).netloc.lower()
+            host_queues.setdefault(host, collections.deque()).append(manifest_item)
+        self.save_state(queue_state, state_location)
+        host_running = collections.Counter()
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as download_pool:
+            running_downloads = {}
+            while host_queues or running_downloads:
+                # Fill free workers round-robin across hosts that have a free slot.
+                for host in list(host_queues):
+                    if len(running_downloads) >= self.max_workers:
+                        break
+                    if host_running[host] >= self.max_per_host:
+                        continue
+                    manifest_item = host_queues[host].popleft()
+                    if not host_queues[host]:
+                        del host_queues[host]
+                    else:
+                        host_queues.move_to_end(host)
+                    host_running[host] += 1
+                    running_downloads[download_pool.submit(
+                        timing_utils.bind_context(self.download_item),
+                        manifest_item
+                    )] = (host, manifest_item)
+                finished_downloads, _ = concurrent.futures.wait(
+                    running_downloads,
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for finished_download in finished_downloads:
+                    host, manifest_item = running_downloads.pop(finished_download)
+                    host_running[host] -= 1
+                    item_state = queue_state[manifest_item['path']]
+                    try:
+                        download_result = finished_download.result()
+                    except Exception as download_error:  # pylint: disable=broad-except
+                        item_state['status'] = 'failed'
+                        item_state['error'] = f'{type(download_error).__name__}: {download_error}'
+                        summary['failed'] += 1
+                    else:
+                        item_state['status'] = 'done'
+                        item_state['bytes'] = download_result['bytes']
+                        item_state['extraction'] = download_result['extraction']
+                        summary['bytes'] += download_result['bytes']
+                        summary['downloaded' if not download_result['skipped'] else 'skipped'] += 1
+                    self.save_state(queue_state, state_location)
+                    summary['elapsed'] = time.perf_counter() - start_time
+                    summary['throughput_mb_s'] = \
+                        summary['bytes'] / (1024 * 1024) / max(summary['elapsed'], 1e-9)
+                    if progress_callback is not None:
+                        progress_callback(dict(summary))
+                    if self.verbose:
+                        finished_count = summary['downloaded'] + summary['skipped'] + summary['failed']
+                        print(
+                            f"{finished_count}/{summary['files']} files, "
+                            f"{summary['bytes'] / (1024 * 1024):.1f} MB, "
+                            f"{summary['throughput_mb_s']:.1f} MB/s"
+                        )
+        summary['elapsed'] = time.perf_counter() - start_time
+        summary['throughput_mb_s'] = summary['bytes'] / (1024 * 1024) / max(summary['elapsed'], 1e-9)
+        return summary
@@ -1,8 +1,6 @@
 """
 Module that contains generic utility functions/classes.
 """
-# Non-native libraries
-import requests
 
 
 class VerboseAttributes:
@@ -41,7 +39,8 @@ class VerboseAttributes:
 def stream_data_to_file(
         url,
         local_file_name,
-        chunk_size=1000
+        chunk_size=None,
+        use_cache=False
 ):
     """
     Function that saves streamed data to specific location.
@@ -51,26 +50,32 @@ def stream_data_to_file(
     :param str local_file_name:
             A valid file-name, where data will be streamed to.
     :param int chunk_size:
-            The chunk-size to read into file.
+            The buffer size to read into file. If None, adapts to the transfer speed.
+    :param bool use_cache:
+            If True, and the file from a previous download is unchanged,
+            sends a conditional request and skips rewriting it on a 304.
+    :return: bool:
+            True if the file was (re)written, False if it was already up to date.
     """
-    # Create request session.
-    request_session = requests.Session()
-    with request_session.get(url, timeout=2000, stream=True) as response:
-        response.raise_for_status()
-        # Chunk stream data into file.
-        with open(local_file_name, 'wb') as download_file:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                download_file.write(chunk)
+    # Import the download engine only when data is streamed, keeping the CLI start-up light.
+    from chatt_bot import download_utils  # pylint: disable=import-outside-toplevel
+    download_result = download_utils.download_file(
+        url,
+        local_file_name,
+        buffer_size=chunk_size,
+        use_cache=use_cache
+    )
+    return not download_result['skipped']
 
 
-def pretty_print_dict(
+def iter_pretty_dict(
         input_dictionary,
         indent=1,
         depth=0
 ):
     """
-    Function that returns a "pretty" string version of dict, intended to be
-    read easily when read.
+    Generator that yields the pieces of pretty_print_dict's string in order,
+    so large dicts render in linear time (or stream straight to a file).
 
     :param dict input_dictionary:
             The dict to be stringified and prettied.
@@ -78,31 +83,45 @@ def pretty_print_dict(
             How far formatted you want the string.
     :param int depth:
             Used internally, how far sub-dictionaries should be set back.
-    :return: str:
-            Printer-pretty string version of dict.
+    :return: generator:
+            The pieces of the printer-pretty string.
     """
-    # Bool flag to add comma's after first item in dict.
-    needs_comma = False
     # String for any dict will start with a '{'
-    return_string = '\t' * depth + '{\n'
-    # Iterate over keys and values, building the full string out.
-    for key, value in input_dictionary.items():
+    yield '\t' * depth + '{\n'
+    for item_number, (key, value) in enumerate(input_dictionary.items()):
         # Start with key. If key follows a previous item, add comma.
-        if needs_comma:
-            return_string = return_string + ',\n' + '\t' * (depth + 1) + str(key) + ': '
-        else:
-            return_string = return_string + '\t' * (depth + 1) + str(key) + ': '
-        # If the value is a dict, recursively call function.
+        if item_number:
+            yield ',\n'
+        yield '\t' * (depth + 1) + str(key) + ': '
+        # If the value is a dict, recursively yield its pieces.
         if isinstance(value, dict):
-            return_string = return_string + '\n' + pretty_print_dict(value, depth=depth+2)
+            yield '\n'
+            yield from iter_pretty_dict(value, depth=depth+2)
         else:
-            return_string = return_string + '\t' * indent + str(value)
-        # After first line, flip bool to True to make sure commas make it.
-        needs_comma = True
+            yield '\t' * indent + str(value)
     # Complete the dict with a '}'
-    return_string = return_string + '\n' + '\t' * depth + '}'
-    # Return dict string.
-    return return_string
+    yield '\n' + '\t' * depth + '}'
+
+
+def pretty_print_dict(
+        input_dictionary,
+        indent=1,
+        depth=0
+):
+    """
+    Function that returns a "pretty" string version of dict, intended to be
+    read easily when read.
+
+    :param dict input_dictionary:
+            The dict to be stringified and prettied.
+    :param int indent:
+            How far formatted you want the string.
+    :param int depth:
+            Used internally, how far sub-dictionaries should be set back.
+    :return: str:
+            Printer-pretty string version of dict.
+    """
+    return ''.join(iter_pretty_dict(input_dictionary, indent=indent, depth=depth))
 
 
 def cast_integer(
@@ -0,0 +1,579 @@
+"""
+Module that contains the shared HTTP client layer that all chatt_bot HTTP calls route through.
+"""
+# Native libraries
+import atexit
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+import uuid
+# Custom modules
+from chatt_bot import bot_utils
+from chatt_bot import generic_utils
+from chatt_bot import metrics_utils
+from chatt_bot import timing_utils
+# Non-native libraries
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_MAX_HTTP_CACHE_BYTES = 16 * 1024 * 1024
+
+
+class HttpClient(generic_utils.VerboseAttributes):
+    """
+    Class that wraps a requests.Session with keep-alive connection pools
+    per host, and retries with backoff.
+    """
+    def __init__(
+            self,
+            pool_connections=10,
+            pool_maxsize=10,
+            retries=3,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            timeout=60,
+            verbose=False
+    ):
+        """
+        Initialization function, that sets up (but does not open) the session.
+
+        :param int pool_connections:
+                Number of hosts whose connection pools are kept.
+        :param int pool_maxsize:
+                Maximum number of kept-alive connections per host.
+        :param int retries:
+                Number of retries on connection errors and retryable status codes.
+        :param float backoff_factor:
+                Backoff factor between retries (sleeps factor * 2 ** (retry - 1)).
+        :param tuple status_forcelist:
+                Status codes that are retried.
+        :param float timeout:
+                Default timeout, in seconds, for requests that don't pass one.
+        :param bool verbose:
+                Specifies whether user wants all print out statements.
+        """
+        super().__init__(verbose=verbose)
+        self.pool_connections = generic_utils.cast_integer(pool_connections, 'pool_connections')
+        self.pool_maxsize = generic_utils.cast_integer(pool_maxsize, 'pool_maxsize')
+        self.retries = generic_utils.cast_integer(retries, 'retries')
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = tuple(status_forcelist)
+        self.timeout = timeout
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(
+            self
+    ):
+        """The pooled requests.Session, opened on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+
+    def create_session(
+            self
+    ):
+        """
+        Function that creates a requests.Session with pooled, retrying adapters.
+
+        :return: requests.Session:
+                The configured session.
+        """
+        retry_policy = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            # Hand the final response back, so callers can inspect its status code.
+            raise_on_status=False
+        )
+        pooled_adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry_policy
+        )
+        new_session = requests.Session()
+        new_session.mount('http://', pooled_adapter)
+        new_session.mount('https://', pooled_adapter)
+        return new_session
+
+    @timing_utils.timed('http_utils.request')
+    def request(
+            self,
+            method,
+            url,
+            **kwargs
+    ):
+        """
+        Function that sends a request through the pooled session.
+
+        :param str method:
+                The HTTP method, e.g. 'GET'.
+        :param str url:
+                The url requested.
+        :param dict kwargs:
+                Passed to requests.Session.request.
+        :return: requests.Response:
+                The response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if self.verbose:
+            print(f'{method} {url}')
+        url_host = metrics_utils.get_url_host(url)
+        start_time = time.perf_counter()
+        status_code = 'error'
+        try:
+            response = self.session.request(method, url, **kwargs)
+            status_code = str(response.status_code)
+            return response
+        finally:
+            metrics_utils.HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start_time,
+                method,
+                url_host
+            )
+            metrics_utils.HTTP_REQUESTS_TOTAL.inc(method, url_host, status_code)
+
+    def get(
+            self,
+            url,
+            **kwargs
+    ):
+        """Function that sends a GET request through the pooled session."""
+        return self.request('GET', url, **kwargs)
+
+    def head(
+            self,
+            url,
+            **kwargs
+    ):
+        """Function that sends a HEAD request through the pooled session."""
+        return self.request('HEAD', url, **kwargs)
+
+    def close(
+            self
+    ):
+        """Function that closes the session, and its kept-alive connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(
+            self
+    ):
+        """Function that allows the client to be used as a context manager."""
+        return self
+
+    def __exit__(
+            self,
+            *exc_info
+    ):
+        """Function that closes the client on leaving the context."""
+        self.close()
+
+
+class HostRateLimiter:
+    """
+    Class that limits how many requests run at once, and how often they start,
+    against each host.
+    """
+    def __init__(
+            self,
+            max_per_host=4,
+            requests_per_second=None
+    ):
+        """
+        Initialization function, that needs the per-host limits.
+
+        :param int max_per_host:
+                Maximum number of requests running at once against a single host.
+        :param float requests_per_second:
+                Maximum request start rate against a single host. If None, not limited.
+        """
+        self.max_per_host = generic_utils.cast_integer(max_per_host, 'max_per_host')
+        if self.max_per_host < 1:
+            raise ValueError("Parameter 'max_per_host' must be greater than zero.")
+        self.requests_per_second = requests_per_second
+        self._host_semaphores = collections.defaultdict(
+            lambda: threading.BoundedSemaphore(self.max_per_host)
+        )
+        self._host_next_start = collections.defaultdict(float)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def limit(
+            self,
+            url
+    ):
+        """
+        Context manager that holds a request slot for the url's host.
+
+        :param str url:
+                The url about to be requested.
+        """
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            host_semaphore = self._host_semaphores[host]
+        with host_semaphore:
+            if self.requests_per_second:
+                # Reserve the host's next start slot, then sleep outside the lock.
+                with self._lock:
+                    start_at = max(time.monotonic(), self._host_next_start[host])
+                    self._host_next_start[host] = start_at + 1 / self.requests_per_second
+                time.sleep(max(start_at - time.monotonic(), 0))
+            yield
+
+
+def get_http_cache_key(
+        method,
+        url
+):
+    """Function that keys a cached request by method and url, e.g. 'HEAD https://...'."""
+    return f'{method.upper()} {url}'
+
+
+def get_entry_size(
+        cache_key,
+        cached_entry
+):
+    """Function that measures the bytes an entry adds to the cache file."""
+    return len(json.dumps({cache_key: cached_entry}))
+
+
+class HttpCache:
+    """
+    Class that stores response validators (ETag/Last-Modified) and status codes
+    on disk, keyed by method and url, so repeat requests can be sent as
+    conditional requests.
+    """
+    def __init__(
+            self,
+            cache_location=None,
+            ttl=0,
+            max_bytes=DEFAULT_MAX_HTTP_CACHE_BYTES
+    ):
+        """
+        Initialization function, that sets up (but does not read) the cache.
+
+        :param str cache_location:
+                Location of the cache file. If None, stored in the bot cache folder.
+        :param float ttl:
+                Seconds a cached entry is trusted without any request.
+                After that, the entry is revalidated with a conditional request.
+        :param int max_bytes:
+                Size of the cache file the least recently used entries are evicted down to.
+        """
+        self.cache_location = os.path.join(
+            bot_utils.setup_bot_cache_folder(),
+            'http_cache.json'
+        ) if cache_location is None else cache_location
+        self.ttl = ttl
+        self.max_bytes = generic_utils.cast_integer(max_bytes, 'max_bytes')
+        self._entries = None
+        # Serialized size of each entry, so the cache size is known without re-encoding it.
+        self._entry_sizes = {}
+        self._total_bytes = 0
+        self._is_dirty = False
+        self._lock = threading.RLock()
+
+    @property
+    def entries(
+            self
+    ):
+        """The cached entries, read from disk on first use."""
+        with self._lock:
+            if self._entries is None:
+                try:
+                    with open(self.cache_location, 'r', encoding='utf-8') as cache_file:
+                        self._entries = json.load(cache_file)
+                except (OSError, ValueError):
+                    self._entries = {}
+                self._entry_sizes = {
+                    cache_key: get_entry_size(cache_key, cached_entry)
+                    for cache_key, cached_entry in self._entries.items()
+                }
+                self._total_bytes = sum(self._entry_sizes.values())
+            return self._entries
+
+    def lookup(
+            self,
+            method,
+            url,
+            required_file=None
+    ):
+        """
+        Function that returns the cached entry of a request.
+
+        :param str method:
+                The HTTP method, e.g. 'GET'.
+        :param str url:
+                The url requested.
+        :param str required_file:
+                If given, the entry only counts while this local file
+                still exists with the size recorded for it.
+        :return: dict:
+                The cached entry, or None.
+        """
+        with self._lock:
+            cached_entry = self.entries.get(get_http_cache_key(method, url))
+            if cached_entry is None:
+                return None
+            if required_file is not None and (
+                    not os.path.isfile(required_file) or
+                    os.path.getsize(required_file) != cached_entry.get('file_size')
+            ):
+                return None
+            cached_entry['last_access'] = time.time()
+            self._is_dirty = True
+            return cached_entry
+
+    def is_fresh(
+            self,
+            cached_entry
+    ):
+        """Function that checks if an entry is still within its ttl."""
+        return bool(self.ttl) and time.time() - cached_entry['stored_at'] < self.ttl
+
+    @staticmethod
+    def conditional_headers(
+            cached_entry
+    ):
+        """
+        Function that builds the conditional request headers for a cached entry.
+
+        :param dict cached_entry:
+                The cached entry, or None.
+        :return: dict:
+                If-None-Match/If-Modified-Since headers.
+        """
+        headers = {}
+        if cached_entry is None:
+            return headers
+        if cached_entry.get('etag'):
+            headers['If-None-Match'] = cached_entry['etag']
+        if cached_entry.get('last_modified'):
+            headers['If-Modified-Since'] = cached_entry['last_modified']
+        return headers
+
+    def store(
+            self,
+            method,
+            url,
+            response,
+            file_name=None
+    ):
+        """
+        Function that stores (or refreshes) a request's validators and status code.
+
+        :param str method:
+                The HTTP method, e.g. 'GET'.
+        :param str url:
+                The url requested.
+        :param requests.Response response:
+                The response received. A 304 only refreshes the existing entry.
+        :param str file_name:
+                If given, the local file the response was written to.
+        """
+        now = time.time()
+        cache_key = get_http_cache_key(method, url)
+        with self._lock:
+            cached_entry = self.entries.get(cache_key)
+            if response.status_code == 304 and cached_entry is not None:
+                cached_entry['stored_at'] = now
+                cached_entry['last_access'] = now
+            else:
+                cached_entry = {
+                    'status_code': response.status_code,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'file_size': None if file_name is None else os.path.getsize(file_name),
+                    'stored_at': now,
+                    'last_access': now
+                }
+                self.entries[cache_key] = cached_entry
+                self._total_bytes -= self._entry_sizes.get(cache_key, 0)
+                self._entry_sizes[cache_key] = get_entry_size(cache_key, cached_entry)
+                self._total_bytes += self._entry_sizes[cache_key]
+            self._is_dirty = True
+            self.evict()
+
+    def evict(
+            self
+    ):
+        """Function that evicts least recently used entries while the cache exceeds max_bytes."""
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            # Evict down to nine tenths, so eviction does not run on every store.
+            target_bytes = self.max_bytes * 9 // 10
+            for cache_key in sorted(
+                    self.entries,
+                    key=lambda cached_key: self.entries[cached_key]['last_access']
+            ):
+                if self._total_bytes <= target_bytes:
+                    break
+                del self.entries[cache_key]
+                self._total_bytes -= self._entry_sizes.pop(cache_key)
+
+    @contextlib.contextmanager
+    def conditional_request(
+            self,
+            http_client,
+            method,
+            url,
+            file_name=None,
+            **kwargs
+    ):
+        """
+        Context manager that requests a url conditionally, yielding a
+        (status_code, response) tuple. response is None on a cache hit:
+        either a fresh entry (no request sent) or a 304 Not Modified.
+        On leaving the block without error, the entry is stored.
+
+        :param HttpClient http_client:
+                The client sending the request.
+        :param str method:
+                The HTTP method, e.g. 'GET'.
+        :param str url:
+                The url requested.
+        :param str file_name:
+                If given, the local file the response is written to; the
+                cached entry only counts while that file is unchanged.
+        :param dict kwargs:
+                Passed to HttpClient.request.
+        """
+        cached_entry = self.lookup(method, url, required_file=file_name)
+        if cached_entry is not None and self.is_fresh(cached_entry):
+            yield cached_entry['status_code'], None
+            return
+        kwargs['headers'] = {
+            **self.conditional_headers(cached_entry),
+            **kwargs.get('headers', {})
+        }
+        with http_client.request(method, url, **kwargs) as response:
+            if response.status_code == 304 and cached_entry is not None:
+                yield cached_entry['status_code'], None
+            else:
+                yield response.status_code, response
+            self.store(method, url, response, file_name=file_name)
+
+    def flush(
+            self
+    ):
+        """Function that writes the cache to disk, if it changed."""
+        with self._lock:
+            if not self._is_dirty:
+                return
+            temporary_location = f'{self.cache_location}.{uuid.uuid4().hex}.tmp'
+            with open(temporary_location, 'w', encoding='utf-8') as cache_file:
+                json.dump(self._entries, cache_file)
+            os.replace(temporary_location, self.cache_location)
+            self._is_dirty = False
+
+
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client(
+        **kwargs
+):
+    """
+    Function that returns the process-wide HTTP client, creating it on first use.
+
+    :param dict kwargs:
+            Passed to HttpClient when the client is first created.
+    :return: HttpClient:
+            The shared HTTP client.
+    """
+    global _HTTP_CLIENT  # pylint: disable=global-statement
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            _HTTP_CLIENT = HttpClient(**kwargs)
+        return _HTTP_CLIENT
+
+
+def close_http_client():
+    """Function that closes the process-wide HTTP client, if one was created."""
+    global _HTTP_CLIENT  # pylint: disable=global-statement
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is not None:
+            _HTTP_CLIENT.close()
+            _HTTP_CLIENT = None
+
+
+# Release kept-alive connections when the interpreter exits.
+atexit.register(close_http_client)
+
+
+_HTTP_CACHE = None
+
+
+def get_http_cache(
+        **kwargs
+):
+    """
+    Function that returns the process-wide HTTP cache, creating it on first use.
+
+    :param dict kwargs:
+            Passed to HttpCache when the cache is first created.
+    :return: HttpCache:
+            The shared HTTP cache.
+    """
+    global _HTTP_CACHE  # pylint: disable=global-statement
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CACHE is None:
+            _HTTP_CACHE = HttpCache(**kwargs)
+        return _HTTP_CACHE
+
+
+def flush_http_cache():
+    """Function that writes the process-wide HTTP cache to disk, if one was created."""
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CACHE is not None:
+            _HTTP_CACHE.flush()
+
+
+# Persist cached validators when the interpreter exits.
+atexit.register(flush_http_cache)
+
+
+def request_status_code(
+        method,
+        url,
+        use_cache=False,
+        **kwargs
+):
+    """
+    Function that requests a url through the shared client, returning only its status code.
+
+    :param str method:
+            The HTTP method, e.g. 'GET'.
+    :param str url:
+            The url requested.
+    :param bool use_cache:
+            If True, sends a conditional request through the shared HTTP cache,
+            returning the cached status code on a hit.
+    :param dict kwargs:
+            Passed to HttpClient.request.
+    :return: int:
+            The status code.
+    """
+    if use_cache:
+        with get_http_cache().conditional_request(
+                get_http_client(),
+                method,
+                url,
+                **kwargs
+        ) as (status_code, _):
+            return status_code
+    with get_http_client().request(method, url, **kwargs) as response:
+        return response.status_code
@@ -0,0 +1,501 @@
+"""
+Module that contains the metrics subsystem of chatt_bot: counters, histograms
+and callback gauges, rendered in the Prometheus text exposition format, either
+over a local HTTP endpoint or dumped to a file.
+
+Updates on hot paths take no lock: every thread writes to its own shard of a
+metric, and shards are only merged when the metrics are rendered. The shard of
+a thread that has ended is folded into the metric's retired total, so pools
+created per call don't grow the metric.
+"""
+# Native libraries
+import bisect
+import http.server
+import os
+import threading
+import urllib.parse
+import uuid
+import weakref
+
+DEFAULT_DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300
+)
+DEFAULT_METRICS_PORT = 9464
+
+
+def format_label_value(
+        label_value
+):
+    """Function that escapes a label value for the text exposition format."""
+    return str(label_value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(
+        label_names,
+        label_values,
+        extra_label=None
+):
+    """
+    Function that formats a label set, e.g. '{method="GET",le="0.5"}'.
+
+    :param tuple label_names:
+            The metric's label names.
+    :param tuple label_values:
+            The values, in the same order as label_names.
+    :param tuple extra_label:
+            Optional (name, value) appended, e.g. a histogram's bucket bound.
+    :return: str:
+            The formatted label set, or '' if there are no labels.
+    """
+    label_pairs = list(zip(label_names, label_values))
+    if extra_label is not None:
+        label_pairs.append(extra_label)
+    if not label_pairs:
+        return ''
+    return '{' + ','.join(
+        f'{label_name}="{format_label_value(label_value)}"'
+        for label_name, label_value in label_pairs
+    ) + '}'
+
+
+def format_value(
+        value
+):
+    """Function that formats a sample value (integers without a decimal point)."""
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class ShardHolder:
+    """Class that holds a thread's shard, and is collected when the thread ends."""
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(
+            self
+    ):
+        self.shard = {}
+
+
+class Metric:
+    """Class that holds the per-thread shards shared by every metric type."""
+    metric_type = None
+
+    def __init__(
+            self,
+            name,
+            help_text,
+            label_names=()
+    ):
+        """
+        Initialization function.
+
+        :param str name:
+                The metric name, e.g. 'chatt_bot_actions_total'.
+        :param str help_text:
+                Description of the metric.
+        :param tuple label_names:
+                Names of the metric's labels.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        # Live shards by id, and the merged shards of threads that have ended.
+        self._shards = {}
+        self._retired_shard = {}
+        self._shards_lock = threading.Lock()
+
+    def get_shard(
+            self
+    ):
+        """
+        Function that returns this thread's shard, creating it on the thread's first update.
+
+        :return: dict:
+                Maps label values to this thread's values.
+        """
+        try:
+            return self._local.holder.shard
+        except AttributeError:
+            holder = self._local.holder = ShardHolder()
+            with self._shards_lock:
+                self._shards[id(holder.shard)] = holder.shard
+            # The thread-local (and so the holder) is released when the thread ends.
+            weakref.finalize(holder, self.retire_shard, holder.shard)
+            return holder.shard
+
+    def retire_shard(
+            self,
+            shard
+    ):
+        """
+        Function that folds the shard of a thread that has ended into the retired total.
+
+        :param dict shard:
+                The ended thread's shard.
+        """
+        with self._shards_lock:
+            self._shards.pop(id(shard), None)
+            for label_values, value in shard.items():
+                self._retired_shard[label_values] = self.merge_values(
+                    self._retired_shard.get(label_values),
+                    value
+                )
+
+    def copy_shards(
+            self
+    ):
+        """Function that snapshots every shard (dict.copy does not race with updates)."""
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            retired_shard = dict(self._retired_shard)
+        return [retired_shard] + [shard.copy() for shard in shards]
+
+    def merge_values(
+            self,
+            total,
+            value
+    ):
+        """
+        Function that adds one shard's value for a label set to a running total.
+
+        :param total:
+                The running total, or None for the first value.
+        :param value:
+                The shard's value.
+        :return:
+                The new total.
+        """
+        raise NotImplementedError
+
+    def collect(
+            self
+    ):
+        """
+        Function that merges the shards.
+
+        :return: dict:
+                Maps label values to the metric's merged values.
+        """
+        totals = {}
+        for shard in self.copy_shards():
+            for label_values, value in shard.items():
+                totals[label_values] = self.merge_values(totals.get(label_values), value)
+        return totals
+
+    def render(
+            self
+    ):
+        """
+        Function that renders the metric in the text exposition format.
+
+        :return: list:
+                The metric's lines.
+        """
+        return [
+            f'# HELP {self.name} {self.help_text}',
+            f'# TYPE {self.name} {self.metric_type}'
+        ] + self.render_samples()
+
+    def render_samples(
+            self
+    ):
+        """Function that renders the metric's samples."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Class that counts events, e.g. actions run or bytes downloaded."""
+    metric_type = 'counter'
+
+    def inc(
+            self,
+            *label_values,
+            amount=1
+    ):
+        """
+        Function that increments the counter.
+
+        :param tuple label_values:
+                The label values, in the order of label_names.
+        :param float amount:
+                The amount added.
+        """
+        shard = self.get_shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def merge_values(
+            self,
+            total,
+            value
+    ):
+        return value if total is None else total + value
+
+    def render_samples(
+            self
+    ):
+        return [
+            f'{self.name}{format_labels(self.label_names, label_values)} {format_value(value)}'
+            for label_values, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram(Metric):
+    """Class that counts observations (e.g. durations) into cumulative buckets."""
+    metric_type = 'histogram'
+
+    def __init__(
+            self,
+            name,
+            help_text,
+            label_names=(),
+            buckets=DEFAULT_DURATION_BUCKETS
+    ):
+        """
+        Initialization function.
+
+        :param str name:
+                The metric name, e.g. 'chatt_bot_action_duration_seconds'.
+        :param str help_text:
+                Description of the metric.
+        :param tuple label_names:
+                Names of the metric's labels.
+        :param tuple buckets:
+                Upper bounds of the buckets, in increasing order.
+        """
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(
+            self,
+            value,
+            *label_values
+    ):
+        """
+        Function that records an observation.
+
+        :param float value:
+                The observed value.
+        :param tuple label_values:
+                The label values, in the order of label_names.
+        """
+        shard = self.get_shard()
+        series = shard.get(label_values)
+        if series is None:
+            # Bucket counts (plus +Inf), then sum.
+            series = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        # Buckets are upper bounds, so the first bucket >= value counts it.
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def merge_values(
+            self,
+            total,
+            value
+    ):
+        if total is None:
+            return list(value)
+        return [total_count + count for total_count, count in zip(total, value)]
+
+    def collect(
+            self
+    ):
+        """
+        Function that merges the shards.
+
+        :return: dict:
+                Maps label values to (per-bucket counts, sum).
+        """
+        return {
+            label_values: (series[:-1], series[-1])
+            for label_values, series in super().collect().items()
+        }
+
+    def render_samples(
+            self
+    ):
+        sample_lines = []
+        for label_values, (bucket_counts, value_sum) in sorted(self.collect().items()):
+            cumulative_count = 0
+            for bucket, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative_count += bucket_count
+                bucket_labels = format_labels(
+                    self.label_names, label_values, ('le', format_value(bucket))
+                )
+                sample_lines.append(f'{self.name}_bucket{bucket_labels} {cumulative_count}')
+            labels = format_labels(self.label_names, label_values)
+            sample_lines.append(f'{self.name}_sum{labels} {format_value(value_sum)}')
+            sample_lines.append(f'{self.name}_count{labels} {cumulative_count}')
+        return sample_lines
+
+
+class CallbackGauge(Metric):
+    """Class that reads a current value (e.g. drivers in use) only when rendered."""
+    metric_type = 'gauge'
+
+    def __init__(
+            self,
+            name,
+            help_text,
+            callback,
+            label_names=()
+    ):
+        """
+        Initialization function.
+
+        :param str name:
+                The metric name, e.g. 'chatt_bot_driver_pool_drivers'.
+        :param str help_text:
+                Description of the metric.
+        :param callable callback:
+                Callable returning a dict mapping label values to the current values.
+        :param tuple label_names:
+                Names of the metric's labels.
+        """
+        super().__init__(name, help_text, label_names)
+        self.callback = callback
+
+    def render_samples(
+            self
+    ):
+        return [
+            f'{self.name}{format_labels(self.label_names, label_values)} {format_value(value)}'
+            for label_values, value in sorted(self.callback().items())
+        ]
+
+
+_METRICS = {}
+_METRICS_LOCK = threading.Lock()
+
+
+def register_metric(
+        metric
+):
+    """
+    Function that registers a metric, returning the already registered one of that name.
+
+    :param Metric metric:
+            The metric to register.
+    :return: Metric:
+            The registered metric.
+    """
+    with _METRICS_LOCK:
+        return _METRICS.setdefault(metric.name, metric)
+
+
+def render_metrics():
+    """
+    Function that renders every registered metric in the text exposition format.
+
+    :return: str:
+            The metrics page.
+    """
+    with _METRICS_LOCK:
+        metrics = [_METRICS[name] for name in sorted(_METRICS)]
+    metric_lines = []
+    for metric in metrics:
+        metric_lines.extend(metric.render())
+    return '\n'.join(metric_lines) + '\n'
+
+
+def write_metrics_file(
+        metrics_location
+):
+    """
+    Function that dumps the metrics page to a file (atomically, so a scraper
+    never reads a partial page), e.g. for a node exporter textfile collector.
+
+    :param str metrics_location:
+            Location of the metrics file.
+    """
+    temp_location = f'{metrics_location}.{uuid.uuid4().hex}.tmp'
+    with open(temp_location, 'w', encoding='utf-8') as metrics_file:
+        metrics_file.write(render_metrics())
+    os.replace(temp_location, metrics_location)
+
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Class that serves the metrics page on GET /metrics."""
+    def do_GET(  # pylint: disable=invalid-name
+            self
+    ):
+        """Function that answers a scrape."""
+        if urllib.parse.urlsplit(self.path).path != '/metrics':
+            self.send_error(404)
+            return
+        metrics_page = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(metrics_page)))
+        self.end_headers()
+        self.wfile.write(metrics_page)
+
+    def log_message(  # pylint: disable=arguments-differ
+            self,
+            *args
+    ):
+        """Function that keeps scrapes out of the bot's print out."""
+
+
+def start_metrics_server(
+        port=DEFAULT_METRICS_PORT,
+        host='127.0.0.1'
+):
+    """
+    Function that serves the metrics page on a background thread.
+
+    :param int port:
+            Port of the metrics endpoint.
+    :param str host:
+            Interface the endpoint binds to. Defaults to local scrapes only.
+    :return: http.server.ThreadingHTTPServer:
+            The running server (stop it with shutdown).
+    """
+    metrics_server = http.server.ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    metrics_server.daemon_threads = True
+    threading.Thread(
+        target=metrics_server.serve_forever,
+        name='chatt_bot_metrics',
+        daemon=True
+    ).start()
+    return metrics_server
+
+
+def get_url_host(
+        url
+):
+    """Function that returns the host of a url, used as a low-cardinality label."""
+    return urllib.parse.urlsplit(url).hostname or ''
+
+
+ACTIONS_TOTAL = register_metric(Counter(
+    'chatt_bot_actions_total',
+    'Actions executed, by action_type, request and exit status.',
+    ('action_type', 'request', 'exit_status')
+))
+ACTION_DURATION = register_metric(Histogram(
+    'chatt_bot_action_duration_seconds',
+    'Run time of executed actions.',
+    ('action_type', 'request')
+))
+HTTP_REQUESTS_TOTAL = register_metric(Counter(
+    'chatt_bot_http_requests_total',
+    'HTTP requests sent, by method, host and status code.',
+    ('method', 'host', 'status_code')
+))
+HTTP_REQUEST_DURATION = register_metric(Histogram(
+    'chatt_bot_http_request_duration_seconds',
+    'Latency of HTTP requests, until the response headers arrive.',
+    ('method', 'host')
+))
+DOWNLOAD_BYTES_TOTAL = register_metric(Counter(
+    'chatt_bot_download_bytes_total',
+    'Bytes written by downloads, by host.',
+    ('host',)
+))
+CACHE_LOOKUPS_TOTAL = register_metric(Counter(
+    'chatt_bot_cache_lookups_total',
+    'Result cache lookups of cacheable requests, by request and outcome (hit, miss, refresh).',
+    ('request', 'outcome')
+))
@@ -0,0 +1,300 @@
+"""
+Module that contains the workflow plugin system of chatt_bot.
+
+Installed packages add workflows through the 'chatt_bot.workflows' entry point
+group, pointing either at a function or at a module of functions decorated
+with register_workflow. The declared metadata is cached in a manifest keyed by
+the installed plugin distributions, so startup never imports plugin modules;
+a workflow's module is only imported once it is dispatched.
+
+Example plugin (pyproject.toml):
+    [project.entry-points."chatt_bot.workflows"]
+    my_workflows = "my_package.workflows"
+"""
+# Native libraries
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import os
+import uuid
+import warnings
+# Custom modules
+from chatt_bot import bot_utils
+
+PLUGIN_ENTRY_POINT_GROUP = 'chatt_bot.workflows'
+MANIFEST_VERSION = 4
+
+_DECORATED_WORKFLOWS = {}
+
+
+def create_workflow_spec(
+        request,
+        target,
+        action_type='workflow',
+        aliases=(),
+        description='',
+        arguments=None,
+        async_target=None,
+        cache_ttl=None
+):
+    """
+    Function that builds the spec a workflow is registered with.
+
+    :param str request:
+            Name the workflow is requested by.
+    :param str target:
+            Where the workflow lives, as 'module:function'.
+    :param str action_type:
+            The built action_type the request belongs to.
+    :param tuple aliases:
+            Other names the workflow can be requested by.
+    :param str description:
+            Description shown by --describe.
+    :param dict arguments:
+            Additional arguments mapped to their spec, e.g. {'url': 'str, required'}.
+    :param str async_target:
+            Optional coroutine variant, as 'module:function', preferred by
+            execute_action_async. A coroutine target needs no variant.
+    :param float cache_ttl:
+            Seconds a result stays in the result cache. If None, the workflow
+            is not cacheable (e.g. it has side effects).
+    :return: dict:
+            The workflow spec.
+    """
+    if ':' not in str(target):
+        raise ValueError(
+            f"Workflow target '{target}' for request '{request}' must be 'module:function'."
+        )
+    return {
+        'request': str(request).strip().lower(),
+        'action_type': str(action_type).strip().lower(),
+        'aliases': [str(alias).strip().lower() for alias in aliases],
+        'description': description,
+        'arguments': dict(arguments or {}),
+        'target': target,
+        'async_target': async_target,
+        'cache_ttl': None if cache_ttl is None else float(cache_ttl)
+    }
+
+
+def register_workflow(
+        request,
+        action_type='workflow',
+        aliases=(),
+        description='',
+        arguments=None,
+        cache_ttl=None
+):
+    """
+    Decorator that declares a function as a chatt_bot workflow.
+
+    :param str request:
+            Name the workflow is requested by.
+    :param str action_type:
+            The built action_type the request belongs to.
+    :param tuple aliases:
+            Other names the workflow can be requested by.
+    :param str description:
+            Description shown by --describe.
+    :param dict arguments:
+            Additional arguments mapped to their spec, e.g. {'url': 'str, required'}.
+    :param float cache_ttl:
+            Seconds a result stays in the result cache. If None, the workflow
+            is not cacheable.
+    :return: function:
+            The decorator, which returns the workflow unchanged.
+    """
+    def decorator(
+            workflow
+    ):
+        workflow_spec = create_workflow_spec(
+            request,
+            f'{workflow.__module__}:{workflow.__qualname__}',
+            action_type=action_type,
+            aliases=aliases,
+            description=description or (workflow.__doc__ or '').strip().split('\n')[0],
+            arguments=arguments,
+            cache_ttl=cache_ttl
+        )
+        workflow.chatt_bot_workflow = workflow_spec
+        _DECORATED_WORKFLOWS.setdefault(workflow.__module__, {})[
+            workflow_spec['request']
+        ] = workflow_spec
+        return workflow
+    return decorator
+
+
+def get_plugin_entry_points():
+    """
+    Function that finds the installed plugin entry points, and the distributions declaring them.
+
+    :return: list:
+            Tuples of (distribution name, version, entry point), sorted.
+    """
+    plugin_entry_points = []
+    for distribution in importlib.metadata.distributions():
+        for entry_point in distribution.entry_points:
+            if entry_point.group == PLUGIN_ENTRY_POINT_GROUP:
+                plugin_entry_points.append((
+                    distribution.metadata['Name'],
+                    distribution.version,
+                    entry_point
+                ))
+    return sorted(plugin_entry_points, key=lambda item: (item[0], item[2].name))
+
+
+def get_plugin_fingerprint(
+        plugin_entry_points
+):
+    """
+    Function that fingerprints the installed plugins, so the manifest is
+    rebuilt whenever a plugin is installed, upgraded or removed.
+
+    :param list plugin_entry_points:
+            Entry points returned from get_plugin_entry_points.
+    :return: str:
+            Hex digest of the plugin distributions, versions and entry points.
+    """
+    return hashlib.sha256(json.dumps([
+        [distribution_name, version, entry_point.name, entry_point.value]
+        for distribution_name, version, entry_point in plugin_entry_points
+    ]).encode('utf-8')).hexdigest()
+
+
+def load_entry_point_specs(
+        entry_point
+):
+    """
+    Function that imports a plugin entry point and reads its workflow specs.
+
+    :param importlib.metadata.EntryPoint entry_point:
+            Entry point naming a decorated function, or a module of them.
+    :return: list:
+            The workflow specs the entry point declares.
+    """
+    module_name, _, attribute_name = entry_point.value.partition(':')
+    module_name = module_name.strip()
+    if not attribute_name:
+        importlib.import_module(module_name)
+        return list(_DECORATED_WORKFLOWS.get(module_name, {}).values())
+    workflow = entry_point.load()
+    try:
+        return [workflow.chatt_bot_workflow]
+    except AttributeError as not_registered:
+        raise TypeError(
+            f"Entry point '{entry_point.name}' ({entry_point.value}) must point at a "
+            "function decorated with chatt_bot.plugin_utils.register_workflow."
+        ) from not_registered
+
+
+def build_plugin_manifest(
+        plugin_entry_points,
+        fingerprint
+):
+    """
+    Function that imports every plugin once, collecting its workflow specs.
+    A plugin that fails to load is skipped with a warning, and recorded so
+    it is tried again next time.
+
+    :param list plugin_entry_points:
+            Entry points returned from get_plugin_entry_points.
+    :param str fingerprint:
+            Fingerprint of the installed plugins.
+    :return: dict:
+            The manifest, holding the fingerprint, every plugin workflow spec
+            and the entry points that failed to load.
+    """
+    workflow_specs = []
+    failed_entry_points = []
+    for distribution_name, _, entry_point in plugin_entry_points:
+        try:
+            workflow_specs.extend(load_entry_point_specs(entry_point))
+        except Exception as plugin_error:  # pylint: disable=broad-except
+            warnings.warn(
+                f"Skipping chatt_bot plugin '{entry_point.name}' from "
+                f"'{distribution_name}': {type(plugin_error).__name__}: {plugin_error}"
+            )
+            failed_entry_points.append(entry_point.name)
+    return {
+        'manifest_version': MANIFEST_VERSION,
+        'fingerprint': fingerprint,
+        'workflows': workflow_specs,
+        'failed_entry_points': failed_entry_points
+    }
+
+
+def get_manifest_location():
+    """
+    Function that determines where the plugin manifest is cached.
+
+    :return: str:
+            Location of the plugin manifest.
+    """
+    return os.path.join(bot_utils.setup_bot_cache_folder(), 'workflow_plugins.json')
+
+
+def read_plugin_manifest(
+        fingerprint
+):
+    """
+    Function that reads the cached plugin manifest.
+
+    :param str fingerprint:
+            Fingerprint of the installed plugins.
+    :return: dict:
+            The manifest, or None if it is missing, unreadable or out of date.
+    """
+    try:
+        with open(get_manifest_location(), 'r', encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('manifest_version') != MANIFEST_VERSION or \
+            manifest.get('fingerprint') != fingerprint:
+        return None
+    return manifest
+
+
+def get_plugin_workflow_specs():
+    """
+    Function that returns the workflow specs of every installed plugin, read
+    from the cached manifest unless the installed plugins have changed, or
+    one of them failed to load when it was built.
+    If the manifest cannot be saved, it is built in memory only.
+
+    :return: list:
+            The plugin workflow specs.
+    """
+    plugin_entry_points = get_plugin_entry_points()
+    if not plugin_entry_points:
+        return []
+    fingerprint = get_plugin_fingerprint(plugin_entry_points)
+    manifest = read_plugin_manifest(fingerprint)
+    if manifest is not None and not manifest['failed_entry_points']:
+        return manifest['workflows']
+    manifest = build_plugin_manifest(plugin_entry_points, fingerprint)
+    try:
+        manifest_location = get_manifest_location()
+        temp_location = f'{manifest_location}.{uuid.uuid4().hex}.tmp'
+        with open(temp_location, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temp_location, manifest_location)
+    except OSError:
+        pass
+    return manifest['workflows']
+
+
+def is_plugin_manifest_complete():
+    """
+    Function that checks whether every installed plugin was loaded into the
+    cached manifest, so snapshots built from it can be kept.
+
+    :return: bool:
+            False if the manifest is missing, or a plugin failed to load.
+    """
+    plugin_entry_points = get_plugin_entry_points()
+    if not plugin_entry_points:
+        return True
+    manifest = read_plugin_manifest(get_plugin_fingerprint(plugin_entry_points))
+    return manifest is not None and not manifest['failed_entry_points']
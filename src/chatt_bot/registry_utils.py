@@ -0,0 +1,121 @@
+"""
+Module that contains the lookup rules for action_types, requests and their
+aliases, shared by the action registry and the action catalog so both resolve
+(and reject) names the same way.
+"""
+
+
+def format_registry_key(
+        key
+):
+    """
+    Function that normalizes a user-given action_type/request for lookup.
+
+    :param str key:
+            The action_type, alias or request as typed.
+    :return: str:
+            The stripped, lower-case key without quotes.
+    """
+    return str(key).strip().lower().replace("'", "").replace('"', "")
+
+
+def compile_action_aliases(
+        allowable_actions
+):
+    """
+    Function that maps every action_type and alias to its built action_type.
+
+    :param dict allowable_actions:
+            Built action_types mapped to their aliases.
+    :return: dict:
+            Action_types and aliases mapped to their built action_type.
+    """
+    action_aliases = {}
+    for action_type, aliases in allowable_actions.items():
+        for alias in [action_type] + list(aliases):
+            if action_aliases.setdefault(alias, action_type) != action_type:
+                raise ValueError(
+                    f"Alias '{alias}' is used by both action_type="
+                    f"'{action_aliases[alias]}' and action_type='{action_type}'."
+                )
+    return action_aliases
+
+
+def compile_request_names(
+        request_actions,
+        request_aliases
+):
+    """
+    Function that maps every request and alias to its request.
+
+    :param dict request_actions:
+            Requests mapped to their built action_type.
+    :param dict request_aliases:
+            Requests mapped to other names they can be requested by.
+    :return: dict:
+            Requests and aliases mapped to their request.
+    """
+    request_names = {request: request for request in request_actions}
+    for request, aliases in request_aliases.items():
+        for alias in aliases:
+            if request_names.setdefault(alias, request) != request:
+                raise ValueError(
+                    f"Request alias '{alias}' is used by both request="
+                    f"'{request_names[alias]}' and request='{request}'."
+                )
+    return request_names
+
+
+def resolve_action_key(
+        action_aliases,
+        action_type
+):
+    """
+    Function that resolves an action_type (or alias) to its built action_type.
+
+    :param dict action_aliases:
+            Map returned from compile_action_aliases.
+    :param str action_type:
+            The action_type, or one of its aliases.
+    :return: str:
+            The built action_type.
+    """
+    action_type = format_registry_key(action_type)
+    try:
+        return action_aliases[action_type]
+    except KeyError as bad_action_type:
+        raise ValueError(
+            f"action_type='{action_type}' not recognized. "
+            f"Allowable action_type list: {list(dict.fromkeys(action_aliases.values()))}"
+        ) from bad_action_type
+
+
+def resolve_request_key(
+        request_names,
+        request_actions,
+        action_type,
+        request
+):
+    """
+    Function that resolves a request (or alias), checking it belongs to a built action_type.
+
+    :param dict request_names:
+            Map returned from compile_request_names.
+    :param dict request_actions:
+            Requests mapped to their built action_type.
+    :param str action_type:
+            The built action_type the request belongs to.
+    :param str request:
+            The request, or one of its aliases.
+    :return: str:
+            The request.
+    """
+    request = format_registry_key(request)
+    request = request_names.get(request, request)
+    if request_actions.get(request) != action_type:
+        raise ValueError(
+            f"Request {request} not found for action_type='{action_type}'.\n"
+            f"Available requests for action_type='{action_type}' are:\n"
+            f"{sorted(name for name, owner in request_actions.items() if owner == action_type)}"
+        )
+    return request
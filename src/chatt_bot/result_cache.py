@@ -0,0 +1,259 @@
+"""
+Module that contains the result cache of chatt_bot, which lets a repeated
+action_type/request/arguments return the stored result of an earlier run
+instead of running its workflow again.
+
+Only workflows that declare a cache_ttl (see plugin_utils.create_workflow_spec)
+are cached. Each entry is a folder holding the result, and copies of the files
+the result lists under 'artifacts'. Once the folder outgrows its size limit,
+the least recently used entries are evicted. The cache keeps a running total
+of its size, so the folder is only scanned once that total outgrows the limit.
+"""
+# Native libraries
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+# Custom modules
+from chatt_bot import bot_utils
+
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+RESULT_FILE_NAME = 'result.json'
+
+
+def get_cache_key(
+        action_type,
+        request,
+        args,
+        kwargs
+):
+    """
+    Function that hashes an action canonically, so the same arguments in any
+    key order (or as tuples instead of lists) give the same key.
+
+    :param str action_type:
+            The built action_type.
+    :param str request:
+            The built request.
+    :param tuple args:
+            Positional arguments passed to the workflow.
+    :param dict kwargs:
+            Keyword arguments passed to the workflow.
+    :return: str:
+            Hex digest of the action.
+    """
+    return hashlib.sha256(json.dumps(
+        [action_type, request, list(args), kwargs],
+        sort_keys=True,
+        separators=(',', ':'),
+        default=repr
+    ).encode('utf-8')).hexdigest()
+
+
+def get_folder_size(
+        folder_location
+):
+    """Function that sums the size of the files directly in a folder."""
+    with os.scandir(folder_location) as folder_entries:
+        return sum(
+            folder_entry.stat().st_size for folder_entry in folder_entries
+            if folder_entry.is_file()
+        )
+
+
+class ResultCache:
+    """Class that stores workflow results on disk, evicting the least recently used."""
+    def __init__(
+            self,
+            cache_location=None,
+            max_bytes=DEFAULT_MAX_CACHE_BYTES
+    ):
+        """
+        Initialization function, that creates the cache folder if needed.
+
+        :param str cache_location:
+                Folder holding the cache entries. If None, stored in the bot cache folder.
+        :param int max_bytes:
+                Size past which the cache is evicted.
+        """
+        self.cache_location = os.path.join(
+            bot_utils.setup_bot_cache_folder(),
+            'results'
+        ) if cache_location is None else cache_location
+        os.makedirs(self.cache_location, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        # Running size of the entries, known once the folder is first scanned.
+        self._total_bytes = None
+
+    def get(
+            self,
+            cache_key
+    ):
+        """
+        Function that reads a cached result, marking it as recently used.
+
+        :param str cache_key:
+                Key returned from get_cache_key.
+        :return: dict:
+                The cache entry (result, created and expires times), or None
+                if there is no entry, or it has expired.
+        """
+        entry_location = os.path.join(self.cache_location, cache_key)
+        result_location = os.path.join(entry_location, RESULT_FILE_NAME)
+        try:
+            with open(result_location, 'r', encoding='utf-8') as result_file:
+                cache_entry = json.load(result_file)
+        except (OSError, ValueError):
+            return None
+        if cache_entry['expires'] <= time.time():
+            shutil.rmtree(entry_location, ignore_errors=True)
+            return None
+        # The result file's modified time orders the entries for eviction.
+        try:
+            os.utime(result_location)
+        except OSError:
+            pass
+        return cache_entry
+
+    def put(
+            self,
+            cache_key,
+            result,
+            ttl
+    ):
+        """
+        Function that stores a result, copying the files it lists under
+        'artifacts' into the entry so the cached result stays valid after
+        the originals are moved or removed.
+
+        :param str cache_key:
+                Key returned from get_cache_key.
+        :param result:
+                The workflow result. Must be JSON serializable.
+        :param float ttl:
+                Seconds the entry stays valid.
+        :return: dict:
+                The cache entry stored.
+        """
+        entry_location = os.path.join(self.cache_location, cache_key)
+        # Entries are built aside and moved in whole, so readers never see a partial one.
+        temp_location = f'{entry_location}.{uuid.uuid4().hex}.tmp'
+        os.makedirs(temp_location)
+        try:
+            if isinstance(result, dict) and result.get('artifacts'):
+                cached_artifacts = []
+                for artifact_number, artifact_location in enumerate(result['artifacts']):
+                    cached_artifact = os.path.join(
+                        entry_location,
+                        f'{artifact_number}_{os.path.basename(artifact_location)}'
+                    )
+                    shutil.copyfile(
+                        artifact_location,
+                        os.path.join(temp_location, os.path.basename(cached_artifact))
+                    )
+                    cached_artifacts.append(cached_artifact)
+                result = dict(result, artifacts=cached_artifacts)
+            created = time.time()
+            cache_entry = {'result': result, 'created': created, 'expires': created + ttl}
+            with open(
+                    os.path.join(temp_location, RESULT_FILE_NAME), 'w', encoding='utf-8'
+            ) as result_file:
+                json.dump(cache_entry, result_file)
+            entry_size = get_folder_size(temp_location)
+            with self._lock:
+                try:
+                    replaced_size = get_folder_size(entry_location)
+                except OSError:
+                    replaced_size = 0
+                shutil.rmtree(entry_location, ignore_errors=True)
+                os.replace(temp_location, entry_location)
+                if self._total_bytes is not None:
+                    self._total_bytes += entry_size - replaced_size
+                needs_eviction = self._total_bytes is None or self._total_bytes > self.max_bytes
+        finally:
+            shutil.rmtree(temp_location, ignore_errors=True)
+        # Evicting past the limit leaves headroom, so the next puts don't rescan the folder.
+        if needs_eviction:
+            self.evict(target_bytes=self.max_bytes * 9 // 10)
+        return cache_entry
+
+    def evict(
+            self,
+            target_bytes=None
+    ):
+        """
+        Function that scans the cache folder, removing expired entries, then the
+        least recently used, until the cache fits. Resets the running size
+        (which other processes sharing the folder may have made stale).
+
+        :param int target_bytes:
+                Size the cache is evicted down to. If None, max_bytes.
+        """
+        target_bytes = self.max_bytes if target_bytes is None else target_bytes
+        now = time.time()
+        cache_entries = []
+        with os.scandir(self.cache_location) as folder_entries:
+            for folder_entry in folder_entries:
+                if not folder_entry.is_dir() or folder_entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    with open(
+                            os.path.join(folder_entry.path, RESULT_FILE_NAME),
+                            'r',
+                            encoding='utf-8'
+                    ) as result_file:
+                        expires = json.load(result_file)['expires']
+                    last_used = os.stat(
+                        os.path.join(folder_entry.path, RESULT_FILE_NAME)
+                    ).st_mtime
+                    entry_size = get_folder_size(folder_entry.path)
+                except (KeyError, OSError, ValueError):
+                    # Unreadable entries are evicted first.
+                    expires, last_used, entry_size = now, 0, 0
+                cache_entries.append((expires <= now, last_used, entry_size, folder_entry.path))
+        total_bytes = sum(cache_entry[2] for cache_entry in cache_entries)
+        # Expired entries sort first, then the least recently used.
+        for expired, _, entry_size, entry_location in sorted(
+                cache_entries, key=lambda cache_entry: (not cache_entry[0], cache_entry[1])
+        ):
+            if not expired and total_bytes <= target_bytes:
+                break
+            shutil.rmtree(entry_location, ignore_errors=True)
+            total_bytes -= entry_size
+        with self._lock:
+            self._total_bytes = total_bytes
+
+    def clear(
+            self
+    ):
+        """Function that removes every cache entry."""
+        with self._lock:
+            shutil.rmtree(self.cache_location, ignore_errors=True)
+            os.makedirs(self.cache_location, exist_ok=True)
+            self._total_bytes = 0
+
+
+_RESULT_CACHE = None
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def get_result_cache(
+        **kwargs
+):
+    """
+    Function that returns the process-wide result cache, creating it on first use.
+
+    :param dict kwargs:
+            Passed to ResultCache when the cache is first created.
+    :return: ResultCache:
+            The shared result cache.
+    """
+    global _RESULT_CACHE  # pylint: disable=global-statement
+    with _RESULT_CACHE_LOCK:
+        if _RESULT_CACHE is None:
+            _RESULT_CACHE = ResultCache(**kwargs)
+        return _RESULT_CACHE
@@ -2,11 +2,26 @@
 Module that contains a Class that determines available actions of chatt_bot.
 """
 # Native libraries
+import ast
 import datetime
+import functools
+import importlib
+import inspect
+import json
+import os
+import types
+import warnings
 # Custom modules
+from chatt_bot import argument_utils
+from chatt_bot import async_utils
 from chatt_bot import bot_utils
-from chatt_bot import bot_workflows
 from chatt_bot import generic_utils
+from chatt_bot import metrics_utils
+from chatt_bot import plugin_utils
+from chatt_bot import registry_utils
+from chatt_bot import result_cache
+from chatt_bot import run_history
+from chatt_bot import timing_utils
 
 
 def get_allowable_actions():
@@ -38,6 +53,67 @@ def get_action_description():
     }
 
 
+def get_builtin_workflows():
+    """
+    Function that stores the built-in workflows of chatt_bot. A workflow is
+    added here (or in an installed plugin, see plugin_utils) in one place.
+
+    Workflows are stored as 'module:function' targets, so that the heavy
+    workflow modules (selenium, bs4, requests) are only imported once a
+    request is actually executed.
+
+    :return: list:
+            The built-in workflow specs.
+    """
+    return [
+        plugin_utils.create_workflow_spec(
+            'gen_comm',
+            'chatt_bot.bot_workflows:execute_general_idle_command',
+            action_type='command',
+            description='Executes any command line argument.',
+            async_target='chatt_bot.bot_workflows:execute_general_idle_command_async',
+            arguments={
+                'command': 'str or list, required',
+                'timeout': 'float, optional',
+                'max_parallel': 'int, optional'
+            }
+        )
+    ]
+
+
+def get_workflow_specs():
+    """
+    Function that gathers the built-in workflows and those of installed plugins.
+    A plugin workflow whose action_type is unknown, or whose request or alias
+    is already taken, is skipped with a warning.
+
+    :return: list:
+            Every workflow spec.
+    """
+    workflow_specs = get_builtin_workflows()
+    allowable_actions = get_allowable_actions()
+    taken_names = {
+        name for workflow_spec in workflow_specs
+        for name in [workflow_spec['request']] + workflow_spec['aliases']
+    }
+    for plugin_spec in plugin_utils.get_plugin_workflow_specs():
+        plugin_names = [plugin_spec['request']] + plugin_spec['aliases']
+        if plugin_spec['action_type'] not in allowable_actions:
+            warnings.warn(
+                f"Skipping plugin workflow '{plugin_spec['request']}': unknown "
+                f"action_type='{plugin_spec['action_type']}'."
+            )
+        elif taken_names.intersection(plugin_names):
+            warnings.warn(
+                f"Skipping plugin workflow '{plugin_spec['request']}': "
+                f"{sorted(taken_names.intersection(plugin_names))} already registered."
+            )
+        else:
+            taken_names.update(plugin_names)
+            workflow_specs.append(plugin_spec)
+    return workflow_specs
+
+
 def get_allowable_requests():
     """
     Function that stores the built-out requests for each action_type.
@@ -46,16 +122,10 @@ def get_allowable_requests():
             Dictionary that maps all requests belonging to an
             action_type.
     """
-    allowable_requests = {
-            'workflow': [
-                ],
-            'command': [
-               'gen_comm'
-            ]
-        }
-    for action_type in allowable_requests.keys():
-        allowable_requests[action_type] = sorted(allowable_requests[action_type] )
-    return allowable_requests
+    return {
+        action_type: list(requests)
+        for action_type, requests in get_registry().allowable_requests.items()
+    }
 
 
 def get_request_description():
@@ -66,10 +136,7 @@ def get_request_description():
             Dictionary that stores request names as keys,
             and descriptions as values.
     """
-    return {
-        'gen_comm':
-            'Executes any command line argument.'
-    }
+    return dict(get_registry().request_description)
 
 
 def get_request_additional_arguments():
@@ -81,49 +148,330 @@ def get_request_additional_arguments():
             Additional arguments related to an action_type+request.
     """
     return {
-        'gen_comm': {
-            'command': 'str, required'
-        }
+        request: dict(arguments)
+        for request, arguments in get_registry().request_additional_arguments.items()
     }
 
 
+def get_request_workflows():
+    """
+    Function that stores where the callable behind each request lives.
+
+    :return: dict:
+            Dictionary that stores request names as keys,
+            and 'module:function' paths as values.
+    """
+    return dict(get_registry().request_workflows)
+
+
+class ActionRegistry:
+    """
+    Class that compiles the built action_types, aliases, requests, descriptions,
+    argument specs and workflow paths into read-only hash maps, so resolving
+    and dispatching a request costs the same however many are registered.
+    """
+    def __init__(
+            self,
+            allowable_actions,
+            action_description,
+            allowable_requests,
+            request_description,
+            request_additional_arguments,
+            request_workflows,
+            request_aliases=None,
+            request_async_workflows=None,
+            request_cache_ttls=None
+    ):
+        """
+        Initialization function, that validates and compiles the registry.
+
+        :param dict allowable_actions:
+                Built action_types mapped to their aliases.
+        :param dict action_description:
+                Built action_types mapped to their descriptions.
+        :param dict allowable_requests:
+                Built action_types mapped to their requests.
+        :param dict request_description:
+                Requests mapped to their descriptions.
+        :param dict request_additional_arguments:
+                Requests mapped to their additional argument specs.
+        :param dict request_workflows:
+                Requests mapped to their 'module:function' workflow paths.
+        :param dict request_aliases:
+                Requests mapped to other names they can be requested by.
+        :param dict request_async_workflows:
+                Requests mapped to the 'module:function' paths of their
+                coroutine variants, used by execute_action_async.
+        :param dict request_cache_ttls:
+                Requests mapped to the seconds their results stay in the
+                result cache. Requests without one are not cached.
+        """
+        action_aliases = registry_utils.compile_action_aliases(allowable_actions)
+        request_actions = {}
+        for action_type, requests in allowable_requests.items():
+            if action_type not in allowable_actions:
+                raise ValueError(
+                    f"Requests are listed for unknown action_type='{action_type}'."
+                )
+            for request in requests:
+                if request_actions.setdefault(request, action_type) != action_type:
+                    raise ValueError(
+                        f"Request '{request}' is listed under both action_type="
+                        f"'{request_actions[request]}' and action_type='{action_type}'."
+                    )
+        request_names = registry_utils.compile_request_names(
+            request_actions,
+            request_aliases or {}
+        )
+        for described_action in action_description:
+            if described_action not in allowable_actions:
+                raise ValueError(
+                    "A key in the action_description attribute must "
+                    "exist as a key in the allowable_actions dictionary."
+                )
+        for described_request in request_description:
+            if described_request not in request_actions:
+                raise ValueError(
+                    "A key in the request_description attribute must "
+                    "exist as a value in the allowable_requests dictionary."
+                )
+        self.allowable_actions = types.MappingProxyType({
+            action_type: tuple(aliases) for action_type, aliases in allowable_actions.items()
+        })
+        self.action_description = types.MappingProxyType(dict(action_description))
+        self.allowable_requests = types.MappingProxyType({
+            action_type: tuple(sorted(requests))
+            for action_type, requests in allowable_requests.items()
+        })
+        self.request_description = types.MappingProxyType(dict(request_description))
+        self.request_additional_arguments = types.MappingProxyType({
+            request: types.MappingProxyType(dict(arguments))
+            for request, arguments in request_additional_arguments.items()
+        })
+        self.request_workflows = types.MappingProxyType(dict(request_workflows))
+        self.request_async_workflows = types.MappingProxyType({
+            request: async_workflow
+            for request, async_workflow in (request_async_workflows or {}).items()
+            if async_workflow
+        })
+        self.request_cache_ttls = types.MappingProxyType({
+            request: cache_ttl
+            for request, cache_ttl in (request_cache_ttls or {}).items()
+            if cache_ttl is not None
+        })
+        self.action_aliases = types.MappingProxyType(action_aliases)
+        self.request_actions = types.MappingProxyType(request_actions)
+        self.request_names = types.MappingProxyType(request_names)
+
+    def resolve_action_type(
+            self,
+            action_type
+    ):
+        """
+        Function that resolves an action_type (or alias) to its built action_type.
+
+        :param str action_type:
+                The action_type, or one of its aliases.
+        :return: str:
+                The built action_type.
+        """
+        return registry_utils.resolve_action_key(self.action_aliases, action_type)
+
+    def resolve_request(
+            self,
+            action_type,
+            request
+    ):
+        """
+        Function that checks a request (exactly) belongs to a built action_type.
+
+        :param str action_type:
+                The built action_type the request belongs to.
+        :param str request:
+                The request to check.
+        :return: str:
+                The formatted request.
+        """
+        return registry_utils.resolve_request_key(
+            self.request_names,
+            self.request_actions,
+            action_type,
+            request
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry():
+    """
+    Function that compiles the action registry, once per process.
+
+    :return: ActionRegistry:
+            The shared, read-only action registry.
+    """
+    allowable_actions = get_allowable_actions()
+    allowable_requests = {action_type: [] for action_type in allowable_actions}
+    workflow_specs = {}
+    for workflow_spec in get_workflow_specs():
+        allowable_requests.setdefault(workflow_spec['action_type'], []).append(
+            workflow_spec['request']
+        )
+        workflow_specs[workflow_spec['request']] = workflow_spec
+    return ActionRegistry(
+        allowable_actions,
+        get_action_description(),
+        allowable_requests,
+        {request: spec['description'] for request, spec in workflow_specs.items()},
+        {request: spec['arguments'] for request, spec in workflow_specs.items()},
+        {request: spec['target'] for request, spec in workflow_specs.items()},
+        {request: spec['aliases'] for request, spec in workflow_specs.items()},
+        {request: spec.get('async_target') for request, spec in workflow_specs.items()},
+        {request: spec.get('cache_ttl') for request, spec in workflow_specs.items()}
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def load_request_workflow(
+        request,
+        use_async=False
+):
+    """
+    Function that imports and returns the callable behind a request.
+
+    :param str request:
+            The request whose workflow should be loaded.
+    :param bool use_async:
+            Whether the request's coroutine variant is preferred, if it declares one.
+    :return: callable:
+            The workflow function related to the request.
+    """
+    registry = get_registry()
+    try:
+        workflow_path = registry.request_async_workflows.get(request) if use_async else None
+        workflow_path = workflow_path or registry.request_workflows[request]
+    except KeyError as workflow_not_found:
+        raise ValueError(
+            f"No workflow is registered for request '{request}'."
+        ) from workflow_not_found
+    module_name, function_name = workflow_path.split(':')
+    return functools.reduce(
+        getattr,
+        function_name.split('.'),
+        importlib.import_module(module_name)
+    )
+
+
+def parse_additional_arguments(
+        add_args
+):
+    """
+    Function that converts additional arguments in string form to a dictionary.
+    JSON is parsed first, then Python literals, then 'key: value, ...' pairs,
+    whose values are left as strings for the request's schema to convert.
+
+    :param str,dict add_args:
+            Dictionary of other arguments, or the string form of it.
+    :return: dict:
+            The additional arguments as a dictionary.
+    """
+    if isinstance(add_args, dict):
+        return add_args
+    original_arg_string = str(add_args).strip()
+    if not original_arg_string:
+        return {}
+    # try to convert additional args to dictionary
+    try:
+        add_args = json.loads(original_arg_string)
+    except ValueError:
+        try:
+            add_args = ast.literal_eval(original_arg_string)
+        except (ValueError, SyntaxError):
+            add_args = original_arg_string.replace("}", "").replace("{", "")
+            add_args = add_args.replace("'", "").replace('"', '')
+            argument_pairs = []
+            for argument_piece in add_args.split(','):
+                if ':' in argument_piece:
+                    argument_pairs.append(argument_piece.split(':', 1))
+                elif argument_pairs:
+                    # A comma inside a value (e.g. 'command: echo a,b') continues it.
+                    argument_pairs[-1][1] += ',' + argument_piece
+                elif argument_piece.strip():
+                    raise ValueError(
+                        f"Additional arguments {original_arg_string!r} must be a "
+                        "dictionary, or 'key: value' pairs."
+                    )
+            add_args = {key.strip(): value.strip() for key, value in argument_pairs}
+    if not isinstance(add_args, dict):
+        raise ValueError(
+            f"Additional arguments must be a dictionary, got {original_arg_string!r}."
+        )
+    return add_args
+
+
+def resolve_action_type(
+        action_type
+):
+    """
+    Function that resolves an action_type (or alias) to its built action_type.
+
+    :param str action_type:
+            The action_type, or one of its aliases.
+    :return: str:
+            The built action_type.
+    """
+    return get_registry().resolve_action_type(action_type)
+
+
+def resolve_request(
+        action_type,
+        request
+):
+    """
+    Function that checks a request belongs to a built action_type.
+
+    :param str action_type:
+            The built action_type the request belongs to.
+    :param str request:
+            The request to check.
+    :return: str:
+            The formatted request.
+    """
+    return get_registry().resolve_request(action_type, request)
+
+
+@functools.lru_cache(maxsize=None)
+def get_argument_schema(
+        request
+):
+    """
+    Function that compiles the argument schema of a request, once per process.
+
+    :param str request:
+            The request whose schema should be compiled.
+    :return: argument_utils.ArgumentSchema:
+            The request's argument schema.
+    """
+    return argument_utils.ArgumentSchema(
+        request,
+        get_registry().request_additional_arguments[request]
+    )
+
+
 def check_additional_arguments(
         request,
         **kwargs
 ):
     """
     Function that checks that additional arguments passed in for an action_type+request
-    are legitimate.
+    are legitimate, converting them to their declared types.
 
     :param str request:
             The request to check.
     :param dict kwargs:
             The arguments passed for the request, to be checked.
+    :return: dict:
+            The arguments, converted to their types, with defaults filled in.
     """
-    defined_arguments = get_request_additional_arguments()[request]
-    # If there are additional arguments needed, check them.
-    if defined_arguments != {}:
-        for additional_argument, req_text in defined_arguments.items():
-            is_optional ='optional' in req_text
-            if additional_argument not in kwargs.keys() and not is_optional:
-                raise ValueError(
-                    f"Request '{request}' requires the non-optional argument -->"
-                    f"'{additional_argument}': {req_text}."
-                )
-            if (additional_argument in kwargs.keys()) and \
-                    (kwargs[additional_argument] in [None, '']):
-                raise ValueError(
-                    f"Keyword argument {additional_argument} for request {request}"
-                    f" cannot be in [None, '']."
-                )
-        # Check if passe in args keys match defined.
-        try:
-            assert set(kwargs.keys()) <= set(defined_arguments.keys())
-        except AssertionError as bad_additional_argument:
-            raise ValueError(
-                f"The passed in key(s) [{kwargs.keys()}] are not "
-                f"a subset of defined key(s) [{defined_arguments.keys()}]"
-            ) from bad_additional_argument
+    return get_argument_schema(request).validate(kwargs)
 
 
 class Allowable:
@@ -196,11 +544,11 @@ class Allowable:
                 "allowable_requests attribute; and the values are a "
                 "description of that value."
             ) from not_a_dict
+        all_requests = {
+            item for sublist in self.allowable_requests.values()
+            for item in sublist
+        }
         for request_key in request_description.keys():
-            all_requests = [
-                item for sublist in self.allowable_requests.values()
-                for item in sublist
-            ]
             if request_key not in all_requests:
                 raise ValueError(
                     "A key in the action_description attribute must "
@@ -212,42 +560,46 @@ class Allowable:
             self
     ):
         """Function that generates help text (not used live)"""
-        help_text = '\n' \
-                    'ALLOWABLE ACTIONS:\n' \
-                    '________________________________\n' \
-                    'Below is a list of the allowable actions ' \
-                    'that chatt_bot can perform:\n'
+        help_text = [
+            '\n'
+            'ALLOWABLE ACTIONS:\n'
+            '________________________________\n'
+            'Below is a list of the allowable actions '
+            'that chatt_bot can perform:\n'
+        ]
         # Iterate over allowable actions, creating help text.
         for single_action, aliases in self.allowable_actions.items():
-            help_text = \
-                help_text + \
-                f'\t  Allowable Action: {single_action}\n' \
-                f'\tAcceptable Aliases: {aliases}\n' \
+            help_text.append(
+                f'\t  Allowable Action: {single_action}\n'
+                f'\tAcceptable Aliases: {aliases}\n'
                 f'\tAction Description: {self.action_description[single_action]}'
-        help_text = help_text + '\n________________________________'
-        return help_text
+            )
+        help_text.append('\n________________________________')
+        return ''.join(help_text)
 
     def request_help_text(
             self
     ):
         """Function that generates help text for request (not used lived)"""
-        help_text = '\n' \
-                    'ALLOWABLE REQUESTS:\n' \
-                    '________________________________\n' \
-                    'Below is a list of the allowable requests ' \
-                    'that chatt_bot can execute:\n'
+        help_text = [
+            '\n'
+            'ALLOWABLE REQUESTS:\n'
+            '________________________________\n'
+            'Below is a list of the allowable requests '
+            'that chatt_bot can execute:\n'
+        ]
         all_requests = [
             item for sublist in self.allowable_requests.values()
             for item in sublist
         ]
         # Iterate over allowable actions, creating help text.
         for single_request in all_requests:
-            help_text = \
-                help_text + \
-                f'\t  Allowable Request: {single_request}\n' \
+            help_text.append(
+                f'\t  Allowable Request: {single_request}\n'
                 f'\tRequest Description: {self.request_description[single_request]}'
-        help_text = help_text + '\n________________________________'
-        return help_text
+            )
+        help_text.append('\n________________________________')
+        return ''.join(help_text)
 
     def full_help_text(
             self
@@ -262,7 +614,11 @@ class BotAction(generic_utils.VerboseAttributes):
             self,
             action_type = 'w',
             request=None,
-            verbose=False
+            verbose=False,
+            profile=False,
+            use_cache=True,
+            refresh_cache=False,
+            check_arguments=True
     ):
         """
         Initialization function, that needs the action type and request.
@@ -276,13 +632,31 @@ class BotAction(generic_utils.VerboseAttributes):
                 For example, the specific workflow desired to kick-off.
         :param bool verbose:
                 Specifies whether user wants all print out statements.
+        :param bool profile:
+                Specifies whether the workflow runs under cProfile, with its
+                stats saved next to the run history.
+        :param bool use_cache:
+                Specifies whether a request that declares a cache_ttl may
+                return a cached result, and stores its result.
+        :param bool refresh_cache:
+                Specifies whether the cached result is ignored, and replaced
+                by the result of a new run.
+        :param bool check_arguments:
+                Specifies whether execute_action validates (and converts) the
+                additional arguments. Only pass False for arguments already
+                returned from check_additional_arguments, e.g. by a batch.
         """
         # Inherit and set verbose attribute
         super().__init__()
+        self.profile = profile
+        self.profile_summary = None
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        self.check_arguments = check_arguments
         # Specifies built-in actions and requests.
-        temp_allowable = Allowable()
-        self.allowable_actions = temp_allowable.allowable_actions
-        self.allowable_requests = temp_allowable.allowable_requests
+        self.registry = get_registry()
+        self.allowable_actions = self.registry.allowable_actions
+        self.allowable_requests = self.registry.allowable_requests
         self.action_type = action_type
         self.request = request
 
@@ -299,20 +673,14 @@ class BotAction(generic_utils.VerboseAttributes):
             action_type
     ):
         """Setter method for action_type."""
-        self._action_type = None
-        action_type = str(action_type).strip().lower()
-        # Ensure action type in allowable actions.
-        for action_key, allowed_syntax_list in self.allowable_actions.items():
-            if action_type in allowed_syntax_list:
-                self._action_type = action_key
-                break
-        # Raise error if action type not assigned.
-        if self._action_type is None:
+        try:
+            self._action_type = self.registry.resolve_action_type(action_type)
+        except ValueError as bad_action_type:
             raise ValueError(
                 f"Value '{action_type}' passed for parameter 'action_type' "
                 "not in allowable actions. "
-                f"Allowable actions are as follows: {self.allowable_actions}"
-            )
+                f"Allowable actions are as follows: {dict(self.allowable_actions)}"
+            ) from bad_action_type
 
     @property
     def request(
@@ -327,44 +695,33 @@ class BotAction(generic_utils.VerboseAttributes):
             request
     ):
         """Setter method for request."""
-        self._request = None
-        request = str(request).strip().lower()
-        # Ensure action type in allowable actions.
-        for allowed_requests in self.allowable_requests[self.action_type]:
-            if request in allowed_requests:
-                self._request = request
-                break
-        # Raise error if action type not assigned.
-        if self._request is None:
+        try:
+            self._request = self.registry.resolve_request(self.action_type, request)
+        except ValueError as bad_request:
             raise ValueError(
                 f"Value '{request}' passed for parameter 'request' "
                 "not in allowable request. "
-                f"Allowable requests are as follows: {self.allowable_requests}"
-            )
+                f"Allowable requests are as follows: {dict(self.allowable_requests)}"
+            ) from bad_request
 
-    def execute_action(
-            self,
-            *args,
-            **kwargs
+    def start_run_log(
+            self
     ):
         """
-        Function that will execute the instantiated action requested of chatt_bot.
+        Function that opens the run log of an action, printing its start.
 
-        :param tuple args:
-                All passed in positional arguments.
-        :param dict kwargs:
-                All passed in keyword arguments.
+        :return: dict:
+                The run log, with its start_time set.
         """
-        run_log_name = \
-            f"{self.request}_{datetime.datetime.now().strftime('%Y_%m_%d_%H_%M')}.txt"
-        run_log_location = f"{bot_utils.setup_bot_folders()}\\{run_log_name}"
         start_time = datetime.datetime.now()
         run_log_dict = {
             'action_type': self.action_type,
             'request': self.request,
             'start_time': start_time,
             'end_time': None,
-            'run_time': None
+            'run_time': None,
+            'exit_status': None,
+            'result': None
         }
         print(
             f"chatt_bot Action started\n"
@@ -373,42 +730,268 @@ class BotAction(generic_utils.VerboseAttributes):
             f" Start Time: {start_time.strftime('%c')}\n"
         )
         print('-'*100)
-        # Check the workflow arguments
-        check_additional_arguments(
-            self.request,
-            **kwargs
-        )
-        # ALL WORKFLOWS BELOW
-        # ALL COMMANDS BELOW
-        if self.action_type == 'command':
-            # Check the workflow arguments
-            check_additional_arguments(
-                self.request,
-                **kwargs
-            )
-            # GENERIC COMMAND CALL
-            if self.request == 'gen_comm':
-                try:
-                    bot_workflows.execute_general_idle_command(
-                        *args,
-                        **kwargs
-                    )
-                except TypeError as bad_arguments:
-                    raise TypeError(
-                        "Encountered error when trying to run gen_comm. "
-                        "You may be missing additional arguments, or have too many.\n"
-                        f"The additional_arguments passed in for action_type='{self.action_type}'"
-                        f" and request='{self.request}' were {kwargs}.\n\n The built additional"
-                        f" arguments for this are "
-                    ) from bad_arguments
+        return run_log_dict
+
+    def finish_run_log(
+            self,
+            run_log_dict,
+            root_span
+    ):
+        """
+        Function that completes the run log of an action, recording it to
+        the metrics and the run history, and printing its end.
+
+        :param dict run_log_dict:
+                The run log returned from start_run_log, holding the workflow result.
+        :param timing_utils.Span root_span:
+                The action's root span.
+        :return: dict:
+                The completed run log.
+        """
+        # Workflows report an exit status in their result; otherwise success.
+        run_log_dict['exit_status'] = run_log_dict['result'].get('exit_status', 0) \
+            if isinstance(run_log_dict['result'], dict) else 0
+        run_log_dict['spans'] = root_span.to_dict()
         # On completion of action, save end time and print log
+        start_time = run_log_dict['start_time']
         end_time = datetime.datetime.now()
         run_time = end_time - start_time
         run_log_dict['end_time'] = end_time.strftime('%c')
         run_log_dict['run_time'] = f"{run_time.total_seconds()}"
-        with open(run_log_location, 'w', encoding="utf-8") as run_log_file:
-            run_log_file.write(
-                str(run_log_dict)
-            )
+        metrics_utils.ACTIONS_TOTAL.inc(
+            self.action_type,
+            self.request,
+            str(run_log_dict['exit_status'])
+        )
+        metrics_utils.ACTION_DURATION.observe(
+            run_time.total_seconds(),
+            self.action_type,
+            self.request
+        )
+        run_history.get_run_history_store().append(
+            run_log_dict,
+            start_time,
+            end_time
+        )
         print('-'*100)
+        if self.profile_summary is not None:
+            print(self.profile_summary)
+            print('-'*100)
         print(f'Job completed in {run_log_dict["run_time"]} seconds.')
+        return run_log_dict
+
+    def lookup_cached_result(
+            self,
+            run_log_dict,
+            args,
+            kwargs
+    ):
+        """
+        Function that looks up the cached result of a cacheable request,
+        recording the outcome (hit, miss or refresh) in the run log.
+
+        :param dict run_log_dict:
+                The run log returned from start_run_log.
+        :param tuple args:
+                Positional arguments passed to the workflow.
+        :param dict kwargs:
+                Keyword arguments passed to the workflow.
+        :return: tuple:
+                The cache key (None if the run is not cached), and the cache
+                entry (None unless there was a hit).
+        """
+        if not self.use_cache or self.request not in self.registry.request_cache_ttls:
+            return None, None
+        cache_key = result_cache.get_cache_key(self.action_type, self.request, args, kwargs)
+        cache_entry = None if self.refresh_cache else \
+            result_cache.get_result_cache().get(cache_key)
+        if self.refresh_cache:
+            run_log_dict['cache'] = 'refresh'
+        else:
+            run_log_dict['cache'] = 'miss' if cache_entry is None else 'hit'
+        metrics_utils.CACHE_LOOKUPS_TOTAL.inc(self.request, run_log_dict['cache'])
+        return cache_key, cache_entry
+
+    def store_cached_result(
+            self,
+            cache_key,
+            result
+    ):
+        """
+        Function that caches a successful workflow result. Results that
+        cannot be stored (e.g. are not JSON serializable) are not cached.
+
+        :param str cache_key:
+                Key returned from lookup_cached_result, or None if not cached.
+        :param result:
+                The workflow result.
+        """
+        if cache_key is None or (isinstance(result, dict) and result.get('exit_status', 0)):
+            return
+        try:
+            result_cache.get_result_cache().put(
+                cache_key,
+                result,
+                self.registry.request_cache_ttls[self.request]
+            )
+        except (OSError, TypeError, ValueError) as cache_error:
+            print(f'Result of {self.request} was not cached: {cache_error!r}')
+
+    def describe_bad_arguments(
+            self,
+            kwargs
+    ):
+        """Function that builds the error message for a workflow called with bad arguments."""
+        return (
+            f"Encountered error when trying to run {self.request}. "
+            "You may be missing additional arguments, or have too many.\n"
+            f"The additional_arguments passed in for action_type='{self.action_type}'"
+            f" and request='{self.request}' were {kwargs}.\n\n The built additional"
+            f" arguments for this are {dict(self.registry.request_additional_arguments[self.request])}"
+        )
+
+    def execute_action(
+            self,
+            *args,
+            **kwargs
+    ):
+        """
+        Function that will execute the instantiated action requested of chatt_bot.
+
+        :param tuple args:
+                All passed in positional arguments.
+        :param dict kwargs:
+                All passed in keyword arguments.
+        :return: dict:
+                The run log of the executed action.
+        """
+        with timing_utils.record_spans(self.request) as root_span:
+            # Check (and convert) the workflow arguments, once per dispatch.
+            if self.check_arguments:
+                with timing_utils.span('check_arguments'):
+                    kwargs = check_additional_arguments(
+                        self.request,
+                        **kwargs
+                    )
+            run_log_dict = self.start_run_log()
+            with timing_utils.span('cache_lookup'):
+                cache_key, cache_entry = self.lookup_cached_result(run_log_dict, args, kwargs)
+            if cache_entry is not None:
+                run_log_dict['result'] = cache_entry['result']
+            else:
+                # Every action_type/request dispatches through the registry's workflow table.
+                with timing_utils.span('load_workflow'):
+                    workflow = load_request_workflow(self.request)
+                try:
+                    with timing_utils.span('workflow'):
+                        run_log_dict['result'] = self.run_workflow(
+                            workflow,
+                            run_log_dict,
+                            *args,
+                            **kwargs
+                        )
+                except TypeError as bad_arguments:
+                    raise TypeError(self.describe_bad_arguments(kwargs)) from bad_arguments
+                with timing_utils.span('cache_store'):
+                    self.store_cached_result(cache_key, run_log_dict['result'])
+        return self.finish_run_log(run_log_dict, root_span)
+
+    async def execute_action_async(
+            self,
+            *args,
+            **kwargs
+    ):
+        """
+        Coroutine that executes the instantiated action on the running event loop.
+
+        Coroutine workflows (such as the async variant a request may declare) are
+        awaited directly; blocking workflows, and profiled runs, are offloaded to
+        the bounded executor of async_utils, as is writing the run history.
+
+        :param tuple args:
+                All passed in positional arguments.
+        :param dict kwargs:
+                All passed in keyword arguments.
+        :return: dict:
+                The run log of the executed action.
+        """
+        with timing_utils.record_spans(self.request) as root_span:
+            # Check (and convert) the workflow arguments, once per dispatch.
+            if self.check_arguments:
+                with timing_utils.span('check_arguments'):
+                    kwargs = check_additional_arguments(
+                        self.request,
+                        **kwargs
+                    )
+            run_log_dict = self.start_run_log()
+            with timing_utils.span('cache_lookup'):
+                cache_key, cache_entry = await async_utils.run_blocking(
+                    self.lookup_cached_result,
+                    run_log_dict,
+                    args,
+                    kwargs
+                )
+            if cache_entry is not None:
+                run_log_dict['result'] = cache_entry['result']
+            else:
+                with timing_utils.span('load_workflow'):
+                    workflow = load_request_workflow(self.request, use_async=True)
+                try:
+                    with timing_utils.span('workflow'):
+                        if inspect.iscoroutinefunction(workflow) and not self.profile:
+                            run_log_dict['result'] = await workflow(*args, **kwargs)
+                        else:
+                            run_log_dict['result'] = await async_utils.run_blocking(
+                                self.run_workflow,
+                                workflow,
+                                run_log_dict,
+                                *args,
+                                **kwargs
+                            )
+                except TypeError as bad_arguments:
+                    raise TypeError(self.describe_bad_arguments(kwargs)) from bad_arguments
+                with timing_utils.span('cache_store'):
+                    await async_utils.run_blocking(
+                        self.store_cached_result,
+                        cache_key,
+                        run_log_dict['result']
+                    )
+        return await async_utils.run_blocking(self.finish_run_log, run_log_dict, root_span)
+
+    def run_workflow(
+            self,
+            workflow,
+            run_log_dict,
+            *args,
+            **kwargs
+    ):
+        """
+        Function that calls a workflow, under cProfile if profile was requested.
+        Coroutine workflows are run to completion on a new event loop.
+
+        :param function workflow:
+                The workflow to call.
+        :param dict run_log_dict:
+                The run log, which records where the profile stats were saved.
+        :param tuple args:
+                Positional arguments passed to the workflow.
+        :param dict kwargs:
+                Keyword arguments passed to the workflow.
+        :return:
+                The workflow's result.
+        """
+        if inspect.iscoroutinefunction(workflow):
+            workflow = async_utils.run_coroutine_function(workflow)
+        if not self.profile:
+            return workflow(*args, **kwargs)
+        run_log_dict['profile'] = os.path.join(
+            bot_utils.setup_bot_folders(),
+            f"{self.request}_{datetime.datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')}.prof"
+        )
+        result, self.profile_summary = timing_utils.profile_call(
+            run_log_dict['profile'],
+            workflow,
+            *args,
+            **kwargs
+        )
+        return result
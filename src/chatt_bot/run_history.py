@@ -0,0 +1,364 @@
+"""
+Module that contains the append-only run history store of chatt_bot,
+an indexed SQLite database under the bot run folder.
+"""
+# Native libraries
+import atexit
+import contextlib
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+# Custom modules
+from chatt_bot import bot_utils
+
+SYNCHRONOUS_MODES = ['OFF', 'NORMAL', 'FULL']
+
+
+def parse_history_time(
+        time_text
+):
+    """
+    Function that parses a history filter time, either ISO format
+    (e.g. '2026-10-12' or '2026-10-12T08:30') or relative to now
+    (e.g. '30m', '12h', '7d').
+
+    :param str time_text:
+            The time to parse.
+    :return: float:
+            The time as a POSIX timestamp, or None if time_text is None.
+    """
+    if time_text is None:
+        return None
+    relative_match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([mhd])\s*', str(time_text).lower())
+    if relative_match is not None:
+        amount, unit = float(relative_match.group(1)), relative_match.group(2)
+        unit_seconds = {'m': 60, 'h': 3600, 'd': 86400}[unit]
+        return datetime.datetime.now().timestamp() - amount * unit_seconds
+    try:
+        return datetime.datetime.fromisoformat(str(time_text).strip()).timestamp()
+    except ValueError as bad_time:
+        raise ValueError(
+            f"Time '{time_text}' must be ISO format (e.g. '2026-10-12') "
+            "or relative (e.g. '30m', '12h', '7d')."
+        ) from bad_time
+
+
+class RunHistoryStore:
+    """
+    Class that appends run logs to an indexed SQLite database, in batches,
+    and answers filtered/aggregate queries over them.
+    """
+    def __init__(
+            self,
+            database_location=None,
+            batch_size=1,
+            synchronous='NORMAL'
+    ):
+        """
+        Initialization function, that opens (and if needed creates) the database.
+
+        :param str database_location:
+                Location of the SQLite database. If None, stored in the bot run folder.
+        :param int batch_size:
+                Number of run logs buffered before they are written in one transaction.
+        :param str synchronous:
+                SQLite fsync policy: 'OFF' (fastest), 'NORMAL' or 'FULL' (safest).
+        """
+        self.database_location = os.path.join(
+            bot_utils.setup_bot_folders(),
+            'run_history.sqlite3'
+        ) if database_location is None else database_location
+        self.batch_size = max(int(batch_size), 1)
+        synchronous = str(synchronous).strip().upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"Parameter 'synchronous' must be one of {SYNCHRONOUS_MODES}."
+            )
+        self._pending_runs = []
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.database_location,
+            timeout=30,
+            check_same_thread=False
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(f'PRAGMA synchronous={synchronous}')
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                'id INTEGER PRIMARY KEY, '
+                'action_type TEXT NOT NULL, '
+                'request TEXT NOT NULL, '
+                'start_time REAL NOT NULL, '
+                'end_time REAL, '
+                'run_time REAL, '
+                'exit_status INTEGER, '
+                'run_log TEXT)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS runs_request_start ON runs (request, start_time)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS runs_start ON runs (start_time)'
+            )
+            # Lets percentiles seek straight to the k-th run_time of a request.
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS runs_request_run_time '
+                'ON runs (action_type, request, run_time)'
+            )
+
+    def append(
+            self,
+            run_log_dict,
+            start_time,
+            end_time
+    ):
+        """
+        Function that appends a run log, writing once batch_size runs are buffered.
+
+        :param dict run_log_dict:
+                The run log of an executed action.
+        :param datetime.datetime start_time:
+                When the action started.
+        :param datetime.datetime end_time:
+                When the action ended.
+        """
+        exit_status = run_log_dict.get('exit_status')
+        with self._lock:
+            self._pending_runs.append((
+                run_log_dict['action_type'],
+                run_log_dict['request'],
+                start_time.timestamp(),
+                end_time.timestamp(),
+                (end_time - start_time).total_seconds(),
+                exit_status if isinstance(exit_status, int) else None,
+                json.dumps(run_log_dict, default=str)
+            ))
+            if len(self._pending_runs) >= self.batch_size:
+                self._write_pending_runs()
+
+    def _write_pending_runs(
+            self
+    ):
+        """Function that writes buffered runs in one transaction. Caller holds the lock."""
+        if not self._pending_runs:
+            return
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO runs (action_type, request, start_time, end_time, '
+                'run_time, exit_status, run_log) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._pending_runs
+            )
+        self._pending_runs = []
+
+    def flush(
+            self
+    ):
+        """Function that writes every buffered run."""
+        with self._lock:
+            self._write_pending_runs()
+
+    @contextlib.contextmanager
+    def batched(
+            self,
+            batch_size
+    ):
+        """
+        Context manager that buffers at least batch_size runs per write while
+        it is open, then writes every buffered run and restores the batch size.
+
+        :param int batch_size:
+                Number of run logs buffered before they are written in one transaction.
+        """
+        with self._lock:
+            previous_batch_size = self.batch_size
+            self.batch_size = max(int(batch_size), previous_batch_size)
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.batch_size = previous_batch_size
+                self._write_pending_runs()
+
+    @staticmethod
+    def build_filters(
+            action_type=None,
+            request=None,
+            since=None,
+            until=None
+    ):
+        """
+        Function that builds the WHERE clause shared by history queries.
+
+        :return: tuple:
+                (WHERE clause, parameters).
+        """
+        conditions = []
+        parameters = []
+        for column, operator, value in (
+                ('action_type', '=', action_type),
+                ('request', '=', request),
+                ('start_time', '>=', parse_history_time(since)),
+                ('start_time', '<', parse_history_time(until))
+        ):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                parameters.append(value)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        return where_clause, parameters
+
+    def query(
+            self,
+            action_type=None,
+            request=None,
+            since=None,
+            until=None,
+            limit=20
+    ):
+        """
+        Function that returns the most recent runs matching the filters.
+
+        :param str action_type:
+                Only runs of this action_type.
+        :param str request:
+                Only runs of this request.
+        :param str since:
+                Only runs started at or after this time (see parse_history_time).
+        :param str until:
+                Only runs started before this time (see parse_history_time).
+        :param int limit:
+                Maximum number of runs returned.
+        :return: list:
+                Dicts of the matching runs, most recent first.
+        """
+        self.flush()
+        where_clause, parameters = self.build_filters(action_type, request, since, until)
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT action_type, request, start_time, run_time, exit_status '
+                f'FROM runs {where_clause} ORDER BY start_time DESC LIMIT ?',
+                parameters + [int(limit)]
+            ).fetchall()
+        return [
+            {
+                'action_type': row[0],
+                'request': row[1],
+                'start_time': datetime.datetime.fromtimestamp(row[2]).strftime('%c'),
+                'run_time': row[3],
+                'exit_status': row[4]
+            }
+            for row in rows
+        ]
+
+    def aggregate(
+            self,
+            action_type=None,
+            request=None,
+            since=None,
+            until=None
+    ):
+        """
+        Function that aggregates run times per action_type/request.
+
+        :param str action_type:
+                Only runs of this action_type.
+        :param str request:
+                Only runs of this request.
+        :param str since:
+                Only runs started at or after this time (see parse_history_time).
+        :param str until:
+                Only runs started before this time (see parse_history_time).
+        :return: list:
+                Dicts with the count, mean, p50, p95 and max run_time of each
+                action_type/request.
+        """
+        self.flush()
+        where_clause, parameters = self.build_filters(action_type, request, since, until)
+        aggregates = []
+        with self._lock:
+            groups = self._connection.execute(
+                'SELECT action_type, request, COUNT(*), AVG(run_time), MAX(run_time) '
+                f'FROM runs {where_clause} GROUP BY action_type, request ORDER BY request',
+                parameters
+            ).fetchall()
+            for group_action_type, group_request, run_count, mean_time, max_time in groups:
+                group_where, group_parameters = self.build_filters(
+                    group_action_type, group_request, since, until
+                )
+                percentiles = {}
+                # Percentiles are read straight off the sorted rows, not loaded into memory.
+                for percentile in (50, 95):
+                    percentiles[f'p{percentile}'] = self._connection.execute(
+                        f'SELECT run_time FROM runs {group_where} '
+                        'ORDER BY run_time LIMIT 1 OFFSET ?',
+                        group_parameters + [min(run_count * percentile // 100, run_count - 1)]
+                    ).fetchone()[0]
+                aggregates.append({
+                    'action_type': group_action_type,
+                    'request': group_request,
+                    'count': run_count,
+                    'mean': mean_time,
+                    'p50': percentiles['p50'],
+                    'p95': percentiles['p95'],
+                    'max': max_time
+                })
+        return aggregates
+
+    def close(
+            self
+    ):
+        """Function that writes every buffered run and closes the database."""
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+
+_RUN_HISTORY_STORE = None
+_RUN_HISTORY_LOCK = threading.Lock()
+
+
+def get_run_history_store(
+        **kwargs
+):
+    """
+    Function that returns the process-wide run history store, opening it on first use.
+
+    :param dict kwargs:
+            Passed to RunHistoryStore when the store is first opened.
+    :return: RunHistoryStore:
+            The shared run history store.
+    """
+    global _RUN_HISTORY_STORE  # pylint: disable=global-statement
+    with _RUN_HISTORY_LOCK:
+        if _RUN_HISTORY_STORE is None:
+            _RUN_HISTORY_STORE = RunHistoryStore(**kwargs)
+        return _RUN_HISTORY_STORE
+
+
+def close_run_history_store():
+    """Function that closes the process-wide run history store, if one was opened."""
+    global _RUN_HISTORY_STORE  # pylint: disable=global-statement
+    with _RUN_HISTORY_LOCK:
+        if _RUN_HISTORY_STORE is not None:
+            _RUN_HISTORY_STORE.close()
+            _RUN_HISTORY_STORE = None
+
+
+def forget_run_history_store():
+    """
+    Function that drops the store inherited from a parent process, without
+    touching its SQLite connection or buffered runs (the parent owns both),
+    so a forked child opens its own store on first use.
+    """
+    global _RUN_HISTORY_STORE, _RUN_HISTORY_LOCK  # pylint: disable=global-statement
+    _RUN_HISTORY_STORE = None
+    _RUN_HISTORY_LOCK = threading.Lock()
+
+
+# Write buffered runs when the interpreter exits.
+atexit.register(close_run_history_store)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=forget_run_history_store)
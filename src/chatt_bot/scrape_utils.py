@@ -0,0 +1,318 @@
+"""
+Module that contains the HTML scraping engine of chatt_bot, built to keep
+memory low on large listing pages: partial trees, a faster parser when
+available, and records yielded one at a time.
+"""
+# Native libraries
+import functools
+import glob
+import importlib.util
+import io
+import os
+import time
+import tracemalloc
+import warnings
+# Non-native libraries
+from bs4 import BeautifulSoup as bs
+from bs4 import SoupStrainer
+import soupsieve
+
+
+@functools.lru_cache(maxsize=None)
+def is_lxml_available():
+    """Function that checks whether the optional lxml parser is installed."""
+    return importlib.util.find_spec('lxml') is not None
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser_backend():
+    """
+    Function that picks the fastest available BeautifulSoup parser.
+
+    :return: str:
+            'lxml' if lxml is installed, otherwise 'html.parser'.
+    """
+    return 'lxml' if is_lxml_available() else 'html.parser'
+
+
+def get_page_source(
+        source
+):
+    """
+    Function that returns the HTML of a page source.
+
+    :param source:
+            HTML as str/bytes, a selenium driver (uses page_source),
+            or a requests.Response (uses content).
+    :return: str,bytes:
+            The page HTML.
+    """
+    if isinstance(source, (str, bytes)):
+        return source
+    if hasattr(source, 'page_source'):
+        return source.page_source
+    if hasattr(source, 'content'):
+        return source.content
+    raise TypeError(
+        "Parameter 'source' must be HTML (str/bytes), a selenium driver, "
+        "or a requests.Response."
+    )
+
+
+def parse_page(
+        source,
+        parse_only=None,
+        parse_only_attrs=None,
+        parser=None
+):
+    """
+    Function that parses a page, optionally into a partial tree holding only
+    the targeted elements (and their children).
+
+    :param source:
+            HTML as str/bytes, a selenium driver, or a requests.Response.
+    :param str,list parse_only:
+            Tag name(s) to keep. If None, the full tree is built.
+    :param dict parse_only_attrs:
+            Attributes the kept tags must have, e.g. {'class': 'listing'}.
+    :param str parser:
+            BeautifulSoup parser. If None, uses get_parser_backend.
+    :return: bs4.BeautifulSoup:
+            The parsed (partial) tree.
+    """
+    strainer = None if parse_only is None else SoupStrainer(parse_only, attrs=parse_only_attrs or {})
+    return bs(
+        get_page_source(source),
+        get_parser_backend() if parser is None else parser,
+        parse_only=strainer
+    )
+
+
+def compile_fields(
+        fields
+):
+    """
+    Function that compiles field selectors once, so they are not re-parsed per record.
+
+    :param dict fields:
+            Maps field names to a CSS selector (text is extracted) or a
+            (CSS selector, attribute) tuple. An empty selector means the record itself.
+    :return: list:
+            Tuples of (field name, compiled selector or None, attribute or None).
+    """
+    compiled_fields = []
+    for field_name, field_spec in fields.items():
+        selector, attribute = (field_spec, None) if isinstance(field_spec, str) else field_spec
+        compiled_fields.append(
+            (field_name, soupsieve.compile(selector) if selector else None, attribute)
+        )
+    return compiled_fields
+
+
+def extract_fields(
+        record,
+        compiled_fields
+):
+    """
+    Function that extracts named values out of a single record element.
+
+    :param bs4.element.Tag record:
+            The record element.
+    :param list compiled_fields:
+            Fields returned from compile_fields.
+    :return: dict:
+            The field values (None where the selector matched nothing).
+    """
+    record_values = {}
+    for field_name, compiled_selector, attribute in compiled_fields:
+        field_element = record if compiled_selector is None else compiled_selector.select_one(record)
+        if field_element is None:
+            record_values[field_name] = None
+        elif attribute is None:
+            record_values[field_name] = field_element.get_text(' ', strip=True)
+        else:
+            record_values[field_name] = field_element.get(attribute)
+    return record_values
+
+
+def iter_records_streaming(
+        page_source,
+        record_tag,
+        compiled_fields,
+        record_attrs,
+        parser
+):
+    """
+    Generator that parses records incrementally with lxml, clearing each
+    record (and everything before it) once yielded.
+    """
+    # Import lxml only for the streaming path; it is an optional dependency.
+    from lxml import etree  # pylint: disable=import-outside-toplevel
+    if isinstance(page_source, str):
+        page_source = page_source.encode('utf-8')
+    for _, element in etree.iterparse(
+            io.BytesIO(page_source),
+            events=('end',),
+            tag=record_tag,
+            html=True,
+            recover=True
+    ):
+        if record_matches(element.attrib, record_attrs):
+            # Fields are read off a tiny tree built from just this record.
+            record = bs(etree.tostring(element), parser).find(record_tag)
+            yield extract_fields(record, compiled_fields)
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def record_matches(
+        element_attrs,
+        record_attrs
+):
+    """
+    Function that checks an element's attributes against the wanted record attributes.
+    For 'class', the wanted value must be one of the element's classes.
+    """
+    for attr_name, attr_value in (record_attrs or {}).items():
+        element_value = element_attrs.get(attr_name)
+        if element_value is None:
+            return False
+        if attr_name == 'class':
+            if attr_value not in element_value.split():
+                return False
+        elif element_value != attr_value:
+            return False
+    return True
+
+
+def iter_records(
+        source,
+        record_tag,
+        fields,
+        record_attrs=None,
+        parser=None,
+        stream=False
+):
+    """
+    Generator that yields one dict per record element found on a page.
+
+    :param source:
+            HTML as str/bytes, a selenium driver, or a requests.Response.
+    :param str record_tag:
+            Tag name of record elements, e.g. 'tr' or 'article'.
+    :param dict fields:
+            Maps field names to a CSS selector (text is extracted) or a
+            (CSS selector, attribute) tuple, relative to the record.
+    :param dict record_attrs:
+            Attributes record elements must have, e.g. {'class': 'listing'}.
+    :param str parser:
+            BeautifulSoup parser. If None, uses get_parser_backend.
+    :param bool stream:
+            If False (fastest), a partial tree holding only record elements is
+            built, and each record is freed once yielded. If True, the page is
+            parsed incrementally with lxml, so memory stays bounded by a single
+            record even on pages too large to hold as a tree, at a CPU cost.
+            Without lxml installed, falls back to stream=False with a warning.
+    """
+    parser = get_parser_backend() if parser is None else parser
+    compiled_fields = compile_fields(fields)
+    page_source = get_page_source(source)
+    if stream and not is_lxml_available():
+        warnings.warn(
+            "Streaming records needs the optional lxml package (pip install lxml); "
+            "parsing a partial tree instead."
+        )
+        stream = False
+    if stream:
+        yield from iter_records_streaming(
+            page_source, record_tag, compiled_fields, record_attrs, parser
+        )
+        return
+    # Strain on the tag name only; attribute strainers drop the records' children
+    # in recent bs4 releases, so attributes are matched on the partial tree instead.
+    page_tree = parse_page(
+        page_source,
+        parse_only=record_tag,
+        parser=parser
+    )
+    for record in page_tree.find_all(record_tag, attrs=record_attrs or {}):
+        yield extract_fields(record, compiled_fields)
+        record.decompose()
+
+
+def scrape_page_files(
+        page_files,
+        record_tag,
+        fields,
+        **kwargs
+):
+    """
+    Function that scrapes saved page files, returning the number of records found.
+
+    :param list page_files:
+            Locations of saved pages.
+    :param str record_tag:
+            See iter_records.
+    :param dict fields:
+            See iter_records.
+    :param dict kwargs:
+            Passed to iter_records.
+    :return: int:
+            Number of records found.
+    """
+    record_count = 0
+    for page_file in page_files:
+        with open(page_file, 'rb') as saved_page:
+            for _ in iter_records(saved_page.read(), record_tag, fields, **kwargs):
+                record_count += 1
+    return record_count
+
+
+def benchmark_corpus(
+        corpus_folder,
+        record_tag,
+        fields,
+        pattern='*.htm*',
+        measure_memory=True,
+        **kwargs
+):
+    """
+    Function that scrapes every saved page of a local corpus, reporting speed and memory.
+
+    :param str corpus_folder:
+            Folder holding the saved pages.
+    :param str record_tag:
+            See iter_records.
+    :param dict fields:
+            See iter_records.
+    :param str pattern:
+            Glob pattern selecting the page files.
+    :param bool measure_memory:
+            Whether to run a second, traced pass measuring peak memory.
+            Tracing slows parsing, so it is kept out of the timed pass.
+    :param dict kwargs:
+            Passed to iter_records (record_attrs, parser, stream).
+    :return: dict:
+            Pages and records scraped, elapsed seconds, pages per second,
+            and peak traced Python memory in MB (None if not measured).
+    """
+    page_files = sorted(glob.glob(os.path.join(corpus_folder, pattern)))
+    start_time = time.perf_counter()
+    record_count = scrape_page_files(page_files, record_tag, fields, **kwargs)
+    elapsed = time.perf_counter() - start_time
+    peak_memory_mb = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            scrape_page_files(page_files, record_tag, fields, **kwargs)
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return {
+        'pages': len(page_files),
+        'records': record_count,
+        'elapsed': elapsed,
+        'pages_per_second': len(page_files) / max(elapsed, 1e-9),
+        'peak_memory_mb': peak_memory_mb
+    }
@@ -1,11 +1,24 @@
 """Module containing custom selenium-related utilites."""
 # Native libraries
+import concurrent.futures
+import contextlib
+import functools
+import json
 import os
 import random as rand
+import re
+import subprocess
 import textwrap
+import threading
 import time
+import uuid
 # Custom modules
+from chatt_bot import async_utils
+from chatt_bot import bot_utils
 from chatt_bot import directory_utils
+from chatt_bot import generic_utils
+from chatt_bot import metrics_utils
+from chatt_bot import timing_utils
 # Non-native libraries
 from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
@@ -28,6 +41,7 @@ class ReadyMadeSeleniumDriver:
             **kwargs
         )
 
+@timing_utils.timed('selenium_utils.create_chrome_driver')
 def create_chrome_driver(
         driver_path=None,
         is_headless=False
@@ -40,7 +54,9 @@ def create_chrome_driver(
     __________
     :param str driver_path:
             Path that holds the chrome driver executable. If not given,
-            the driver path must be in Windows PATH.
+            the driver path must be in Windows PATH. If given, but no file
+            exists there, a driver matching the installed chrome is resolved
+            through resolve_chrome_driver_path.
     :param bool is_headless:
             Boolean flag, decides if the driver will be run as headless.
     :return: Selenium.webdriver.Chrome:
@@ -63,20 +79,475 @@ def create_chrome_driver(
         chrome_options.add_argument(
             "--headless"
         )
-    # If the driver_path is specified, use it.
+    # If the driver_path is specified, use it (resolving it if it does not exist).
     if driver_path is None:
         driver = webdriver.Chrome(
             options=chrome_options
         )
     else:
+        if not os.path.isfile(driver_path):
+            driver_path = resolve_chrome_driver_path()
         driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(driver_path),
             options=chrome_options
         )
     # Return chrome driver.
     return driver
 
 
+_RESOLVED_DRIVER_PATHS = {}
+_RESOLVED_DRIVER_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def get_chrome_version():
+    """
+    Returns the version of the locally installed chrome browser.
+
+    :return: str:
+            The chrome version (e.g. '126.0.6478.126'), or None if not found.
+    """
+    version_commands = [
+        ['reg', 'query', 'HKEY_CURRENT_USER\\Software\\Google\\Chrome\\BLBeacon',
+         '/v', 'version'],
+        ['google-chrome', '--version'],
+        ['google-chrome-stable', '--version'],
+        ['chromium', '--version'],
+        ['chromium-browser', '--version'],
+        ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version']
+    ]
+    for version_command in version_commands:
+        try:
+            version_output = subprocess.run(
+                version_command,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=False
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        version_match = re.search(r'\d+\.\d+\.\d+\.\d+', version_output)
+        if version_match is not None:
+            return version_match.group(0)
+    return None
+
+
+def get_driver_cache_location():
+    """
+    Returns the location of the file caching resolved chrome driver paths.
+
+    :return: str:
+            The path to the driver cache file.
+    """
+    return os.path.join(
+        bot_utils.setup_bot_cache_folder(),
+        'chromedriver_paths.json'
+    )
+
+
+def resolve_chrome_driver_path(
+        browser_version=None
+):
+    """
+    Returns a chrome driver executable matching the installed chrome,
+    installing it through ChromeDriverManager only when no cached
+    driver exists for that browser version.
+
+    :param str browser_version:
+            The chrome version to resolve for. If None, detected via get_chrome_version.
+    :return: str:
+            The path to the chrome driver executable.
+    """
+    browser_version = get_chrome_version() if browser_version is None else browser_version
+    version_key = 'unknown' if browser_version is None else browser_version
+    with _RESOLVED_DRIVER_LOCK:
+        # Fastest path: already resolved within this process.
+        resolved_path = _RESOLVED_DRIVER_PATHS.get(version_key)
+        if resolved_path is not None and os.path.isfile(resolved_path):
+            return resolved_path
+        if browser_version is None:
+            # Without a version, a cached driver can't be checked against the
+            # browser, so only the manager can resolve it.
+            resolved_path = ChromeDriverManager().install()
+            _RESOLVED_DRIVER_PATHS[version_key] = resolved_path
+            return resolved_path
+        # Next fastest: resolved by a previous process, and still on disk.
+        cache_location = get_driver_cache_location()
+        try:
+            with open(cache_location, 'r', encoding='utf-8') as cache_file:
+                driver_cache = json.load(cache_file)
+        except (OSError, ValueError):
+            driver_cache = {}
+        cached_entry = driver_cache.get(version_key, {})
+        resolved_path = cached_entry.get('driver_path')
+        if resolved_path is None or not os.path.isfile(resolved_path) or \
+                cached_entry.get('browser_version') != browser_version:
+            # Cached driver missing or mismatched, so fall back to the manager.
+            resolved_path = ChromeDriverManager().install()
+            driver_cache[version_key] = {
+                'driver_path': resolved_path,
+                'browser_version': browser_version
+            }
+            try:
+                temporary_location = f'{cache_location}.{uuid.uuid4().hex}.tmp'
+                with open(temporary_location, 'w', encoding='utf-8') as cache_file:
+                    json.dump(driver_cache, cache_file, indent=1)
+                os.replace(temporary_location, cache_location)
+            except OSError:
+                pass
+        _RESOLVED_DRIVER_PATHS[version_key] = resolved_path
+        return resolved_path
+
+
+def get_driver_memory_mb(
+        driver
+):
+    """
+    Function that reports the JavaScript heap used by a driver's current page.
+
+    :param Selenium.webdriver driver:
+            A selenium webdriver.
+    :return: float:
+            Used heap size in megabytes, or None if the browser does not report it.
+    """
+    used_heap = driver.execute_script(
+        'return window.performance && performance.memory ? '
+        'performance.memory.usedJSHeapSize : null;'
+    )
+    return None if used_heap is None else used_heap / (1024 * 1024)
+
+
+class ChromeDriverPool(generic_utils.VerboseAttributes):
+    """
+    Class that keeps a bounded set of warm headless drivers, which are
+    borrowed and returned instead of launching a browser per use.
+    """
+    def __init__(
+            self,
+            size=2,
+            max_uses=50,
+            max_memory_mb=None,
+            driver_factory=None,
+            verbose=False,
+            **kwargs
+    ):
+        """
+        Initialization function, that sets up (but does not launch) the pool.
+
+        :param int size:
+                Maximum number of drivers alive at once.
+        :param int max_uses:
+                Number of checkouts after which a driver is recycled.
+        :param float max_memory_mb:
+                JavaScript heap ceiling, in megabytes, after which a driver
+                is recycled. If None, memory is not checked.
+        :param callable driver_factory:
+                Callable returning a new driver. If None, creates headless
+                chrome drivers via create_chrome_driver.
+        :param bool verbose:
+                Specifies whether user wants all print out statements.
+        :param dict kwargs:
+                Passed to create_chrome_driver when driver_factory is None.
+        """
+        super().__init__(verbose=verbose)
+        self.size = generic_utils.cast_integer(size, 'size')
+        if self.size < 1:
+            raise ValueError("Parameter 'size' must be greater than zero.")
+        self.max_uses = generic_utils.cast_integer(max_uses, 'max_uses')
+        self.max_memory_mb = max_memory_mb
+        if driver_factory is None:
+            kwargs.setdefault('is_headless', True)
+            driver_factory = functools.partial(create_chrome_driver, **kwargs)
+        self.driver_factory = driver_factory
+        self._idle_drivers = []
+        self._driver_uses = {}
+        self._alive = 0
+        self._checked_out = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def in_use(
+            self
+    ):
+        """Number of drivers currently checked out."""
+        return self._checked_out
+
+    @property
+    def alive(
+            self
+    ):
+        """Number of drivers currently alive or launching (idle or checked out)."""
+        return self._alive
+
+    def warm(
+            self
+    ):
+        """Function that launches drivers until the pool is full."""
+        with self._condition:
+            launches = self.size - self._alive
+            self._alive += launches
+        for _ in range(launches):
+            try:
+                new_driver = self.driver_factory()
+            except Exception:
+                self._release_slot()
+                raise
+            with self._condition:
+                self._driver_uses[id(new_driver)] = 0
+                self._idle_drivers.append(new_driver)
+                self._condition.notify()
+
+    def checkout(
+            self,
+            timeout=None
+    ):
+        """
+        Function that borrows a healthy driver, launching one if the pool has room.
+
+        Only taking an idle driver or reserving a slot happens under the lock;
+        launching, health checks and quitting happen outside it, so they run
+        in parallel and never hold up checkin.
+
+        :param float timeout:
+                Seconds to wait for a driver to be returned. If None, waits forever.
+        :return: Selenium.webdriver:
+                A driver, which must be handed back with checkin.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._closed and not self._idle_drivers and \
+                        self._alive >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0 or \
+                            not self._condition.wait(timeout=remaining):
+                        raise TimeoutError(
+                            f"No driver was returned to the pool within {timeout} seconds."
+                        )
+                if self._closed:
+                    raise RuntimeError("The driver pool has been closed.")
+                pooled_driver = self._idle_drivers.pop() if self._idle_drivers else None
+                if pooled_driver is None:
+                    # Reserve a slot, so other checkouts can't overfill the pool.
+                    self._alive += 1
+            if pooled_driver is not None:
+                if self.is_healthy(pooled_driver):
+                    return self._lend(pooled_driver)
+                self._discard(pooled_driver)
+                continue
+            try:
+                pooled_driver = self.driver_factory()
+            except Exception:
+                self._release_slot()
+                raise
+            with self._condition:
+                self._driver_uses[id(pooled_driver)] = 0
+            return self._lend(pooled_driver)
+
+    def _lend(
+            self,
+            pooled_driver
+    ):
+        """Function that records a driver as checked out, unless the pool closed meanwhile."""
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                self._driver_uses[id(pooled_driver)] += 1
+                self._checked_out += 1
+        if closed:
+            self._discard(pooled_driver)
+            raise RuntimeError("The driver pool has been closed.")
+        return pooled_driver
+
+    def _release_slot(
+            self
+    ):
+        """Function that frees the slot of a driver that failed to launch."""
+        with self._condition:
+            self._alive -= 1
+            self._condition.notify()
+
+    def checkin(
+            self,
+            pooled_driver,
+            discard=False
+    ):
+        """
+        Function that returns a driver to the pool, resetting or recycling it.
+
+        :param Selenium.webdriver pooled_driver:
+                A driver received from checkout.
+        :param bool discard:
+                If True, the driver is quit instead of being reused.
+        """
+        recycle = discard or self._closed or \
+            self._driver_uses.get(id(pooled_driver), 0) >= self.max_uses
+        if not recycle:
+            try:
+                reset_driver(pooled_driver)
+                if self.max_memory_mb is not None:
+                    memory_mb = get_driver_memory_mb(pooled_driver)
+                    recycle = memory_mb is not None and memory_mb > self.max_memory_mb
+            except Exception:  # pylint: disable=broad-except
+                recycle = True
+        with self._condition:
+            self._checked_out -= 1
+            # A driver returned after close is quit, not pooled.
+            recycle = recycle or self._closed
+            if not recycle:
+                self._idle_drivers.append(pooled_driver)
+                self._condition.notify()
+        if recycle:
+            self._discard(pooled_driver)
+
+    @contextlib.contextmanager
+    def driver(
+            self,
+            timeout=None
+    ):
+        """
+        Context manager that borrows a driver and always returns it.
+
+        :param float timeout:
+                Seconds to wait for a driver to be returned. If None, waits forever.
+        """
+        pooled_driver = self.checkout(timeout=timeout)
+        discard = False
+        try:
+            yield pooled_driver
+        except Exception:
+            # A failing workflow may leave the browser in a bad state.
+            discard = True
+            raise
+        finally:
+            self.checkin(pooled_driver, discard=discard)
+
+    @staticmethod
+    def is_healthy(
+            pooled_driver
+    ):
+        """
+        Function that checks a driver still responds.
+
+        :param Selenium.webdriver pooled_driver:
+                The driver to check.
+        :return: bool:
+                True if the driver responds to a simple command.
+        """
+        try:
+            pooled_driver.current_url  # pylint: disable=pointless-statement
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def _discard(
+            self,
+            pooled_driver
+    ):
+        """Function that forgets a driver, freeing its slot, then quits it outside the lock."""
+        with self._condition:
+            self._driver_uses.pop(id(pooled_driver), None)
+            self._alive -= 1
+            self._condition.notify()
+        try:
+            pooled_driver.quit()
+        except Exception:  # pylint: disable=broad-except
+            pass
+        if self.verbose:
+            print('Recycled a pooled driver.')
+
+    def close(
+            self
+    ):
+        """Function that quits every idle driver, and any driver returned later."""
+        with self._condition:
+            self._closed = True
+            idle_drivers, self._idle_drivers = self._idle_drivers, []
+            self._condition.notify_all()
+        for idle_driver in idle_drivers:
+            self._discard(idle_driver)
+
+
+def reset_driver(
+        driver
+):
+    """
+    Function that clears a driver's state between uses: extra tabs,
+    cookies, local/session storage, and the current page.
+
+    :param Selenium.webdriver driver:
+            The driver to reset.
+    """
+    window_handles = driver.window_handles
+    for extra_handle in window_handles[1:]:
+        driver.switch_to.window(extra_handle)
+        driver.close()
+    driver.switch_to.window(window_handles[0])
+    driver.delete_all_cookies()
+    driver.execute_script(
+        'try { window.localStorage.clear(); window.sessionStorage.clear(); } '
+        'catch (storage_error) {}'
+    )
+    driver.get('about:blank')
+
+
+_DRIVER_POOL = None
+_DRIVER_POOL_LOCK = threading.Lock()
+
+
+def get_driver_pool(
+        **kwargs
+):
+    """
+    Function that returns the process-wide driver pool, creating it on first use.
+
+    :param dict kwargs:
+            Passed to ChromeDriverPool when the pool is first created.
+    :return: ChromeDriverPool:
+            The shared driver pool.
+    """
+    global _DRIVER_POOL  # pylint: disable=global-statement
+    with _DRIVER_POOL_LOCK:
+        if _DRIVER_POOL is None:
+            _DRIVER_POOL = ChromeDriverPool(**kwargs)
+        return _DRIVER_POOL
+
+
+def close_driver_pool():
+    """Function that closes the process-wide driver pool, if one was created."""
+    global _DRIVER_POOL  # pylint: disable=global-statement
+    with _DRIVER_POOL_LOCK:
+        if _DRIVER_POOL is not None:
+            _DRIVER_POOL.close()
+            _DRIVER_POOL = None
+
+
+def get_driver_pool_utilisation():
+    """
+    Function that reads the process-wide driver pool's utilisation, for metrics.
+
+    :return: dict:
+            Drivers checked out, alive, and the pool size (empty if no pool exists).
+    """
+    driver_pool = _DRIVER_POOL
+    if driver_pool is None:
+        return {}
+    return {
+        ('in_use',): driver_pool.in_use,
+        ('alive',): driver_pool.alive,
+        ('size',): driver_pool.size
+    }
+
+
+metrics_utils.register_metric(metrics_utils.CallbackGauge(
+    'chatt_bot_driver_pool_drivers',
+    'Drivers of the shared driver pool, by state.',
+    get_driver_pool_utilisation,
+    ('state',)
+))
+
 
 def get_driver_path():
     """
@@ -99,34 +570,171 @@ def get_driver_path():
         )
     return driver_path
 
+DEFAULT_WAIT_TIMEOUT = 15
+DEFAULT_POLL_FREQUENCY = 0.1
+DEFAULT_NETWORK_IDLE_TIME = 0.5
+
+
+class ThrottlePolicy:
+    """
+    Class that adds opt-in, human-like random pauses between browser actions,
+    making website calls seem more like a natural user's behavior.
+    """
+    def __init__(
+            self,
+            min_seconds=3,
+            max_seconds=6
+    ):
+        """
+        Initialization function, that needs the pause bounds.
+
+        :param float min_seconds:
+                Shortest pause, in seconds.
+        :param float max_seconds:
+                Longest pause, in seconds.
+        """
+        if not 0 <= min_seconds <= max_seconds:
+            raise ValueError(
+                "Parameters must satisfy 0 <= min_seconds <= max_seconds."
+            )
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+
+    def pause(
+            self
+    ):
+        """Function that sleeps for a random time between the pause bounds."""
+        time.sleep(
+            rand.uniform(
+                self.min_seconds,
+                self.max_seconds
+            )
+        )
+
+
+def document_is_ready(
+        driver
+):
+    """
+    Expected condition that holds once the page's document.readyState is complete.
+
+    :param Selenium.webdriver driver:
+            A selenium webdriver.
+    :return: bool:
+            True if the document finished loading.
+    """
+    return driver.execute_script('return document.readyState;') == 'complete'
+
+
+def get_resource_count(
+        driver
+):
+    """
+    Function that counts the network resources the current page finished loading.
+
+    :param Selenium.webdriver driver:
+            A selenium webdriver.
+    :return: int:
+            Number of completed resource entries.
+    """
+    return driver.execute_script(
+        "return window.performance ? "
+        "performance.getEntriesByType('resource').length : 0;"
+    )
+
+
+@timing_utils.timed('selenium_utils.wait_for_page_ready')
+def wait_for_page_ready(
+        driver,
+        expected_condition=None,
+        timeout=DEFAULT_WAIT_TIMEOUT,
+        poll_frequency=DEFAULT_POLL_FREQUENCY,
+        network_idle_time=DEFAULT_NETWORK_IDLE_TIME
+):
+    """
+    Function that returns as soon as the driver's page is settled: the document
+    is loaded, no new network resources completed for network_idle_time,
+    and expected_condition (if given) holds.
+
+    :param Selenium.webdriver driver:
+            A selenium webdriver, with an active GET call.
+    :param expected_conditions expected_condition:
+            Optional, caller-supplied condition that must also hold.
+    :param float timeout:
+            Upper bound, in seconds, on the whole wait.
+    :param float poll_frequency:
+            Seconds between checks.
+    :param float network_idle_time:
+            Seconds without newly completed resources for the network to count
+            as idle. If 0, network activity is not checked.
+    """
+    deadline = time.monotonic() + timeout
+    WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=poll_frequency
+    ).until(document_is_ready)
+    # Wait until the number of completed resources stops changing.
+    if network_idle_time > 0:
+        resource_count = get_resource_count(driver)
+        idle_since = time.monotonic()
+        while time.monotonic() - idle_since < network_idle_time:
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(poll_frequency)
+            latest_resource_count = get_resource_count(driver)
+            if latest_resource_count != resource_count:
+                resource_count = latest_resource_count
+                idle_since = time.monotonic()
+    if expected_condition is not None:
+        WebDriverWait(
+            driver,
+            max(deadline - time.monotonic(), 0),
+            poll_frequency=poll_frequency
+        ).until(expected_condition)
+
+
+@timing_utils.timed('selenium_utils.save_driver_screenshot')
 def save_driver_screenshot(
         driver,
         save_path_location,
-        screenshot_name
+        screenshot_name,
+        expected_condition=None,
+        wait_time=DEFAULT_WAIT_TIMEOUT,
+        poll_frequency=DEFAULT_POLL_FREQUENCY,
+        throttle=None
 ):
     """
     Function that takes in an active Selenium driver, a file location;
-    and saves a screenshot of the driver.
+    and saves a screenshot of the driver once its page is settled.
     :param Selenium.webdriver driver:
     A Selenium webdriver. Driver must have active GET call.
     :param str save_path_location:
     Folder path location to store saved screenshot.
     :param str screenshot_name:
     Name given to saved screenshot.
+    :param expected_conditions expected_condition:
+    Optional condition that must hold before the screenshot is taken.
+    :param float wait_time:
+    Upper bound, in seconds, on waiting for the page to settle.
+    :param float poll_frequency:
+    Seconds between readiness checks.
+    :param ThrottlePolicy throttle:
+    Optional policy adding a human-like pause before the screenshot.
     """
     # Ensures that get call fully loaded javascript objects,
-    # buy waiting a couple of seconds. Second benefit is that
-    # it makes it seem that website calls are more randomized,
-    # mimicking a natural user's behavior.
-    time.sleep(
-        rand.randint(
-            3,
-            6
-        )
+    # returning as soon as the page is settled.
+    wait_for_page_ready(
+        driver,
+        expected_condition=expected_condition,
+        timeout=wait_time,
+        poll_frequency=poll_frequency
     )
+    if throttle is not None:
+        throttle.pause()
     # Save the screenshot.
     driver.save_screenshot(
-        f"{save_path_location}\\{screenshot_name}.png"
+        os.path.join(save_path_location, f"{screenshot_name}.png")
     )
 
 def driver_get_call(
@@ -134,7 +742,9 @@ def driver_get_call(
         url,
         expected_condition=None,
         wait_time=None,
-        implicitly_wait=False
+        implicitly_wait=False,
+        poll_frequency=DEFAULT_POLL_FREQUENCY,
+        throttle=None
 ):
     """
     Function that executes an HTTP GET call through a Selenium Driver.
@@ -147,37 +757,177 @@ def driver_get_call(
             The url to be used in GET.
     :param expected_conditions expected_condition:
             The customized expected condition. Only used if implicitly_wait == False.
+            If None, waits until the page is settled (see wait_for_page_ready).
     :param int wait_time:
-            The wait_time, in seconds, to wait for the expected condition to arise.
-            If None, then will wait between a random interval of 10 to 15 seconds.
+            The upper bound, in seconds, to wait for the expected condition to arise.
+            The wait returns as soon as the condition holds.
+            If None, then uses DEFAULT_WAIT_TIMEOUT.
     :param bool implicitly_wait:
             Boolean flag, stating whether the driver employs an implicit wait.
-            If False, url requires a passed in expected_condition.
+            If False, waits on expected_condition and page readiness.
+    :param float poll_frequency:
+            Seconds between condition checks.
+    :param ThrottlePolicy throttle:
+            Optional policy adding a human-like pause before the GET call.
     """
-    # If the driver does not implement an implicit wait,
-    # then generate a wait time between 10 and 15 seconds.
+    wait_time = DEFAULT_WAIT_TIMEOUT if wait_time is None else int(wait_time)
+    if throttle is not None:
+        throttle.pause()
     if implicitly_wait:
-        if wait_time is None:
-            wait_time = rand.randint(
-                10,
-                15
-            )
-        else:
-            wait_time = int(wait_time)
         driver.implicitly_wait(wait_time)
-        driver.get(url)
+        with timing_utils.span('selenium_utils.driver_get'):
+            driver.get(url)
     # If the driver does not implement an implicit wait -- it waits on an expected condition.
     if not implicitly_wait:
-        if wait_time is None:
-            wait_time = rand.randint(
-                10,
-                15
-            )
-        else:
-            wait_time = int(wait_time)
-        driver.get(url)
-        # Try to wait for the expected condition.
-        WebDriverWait(
+        with timing_utils.span('selenium_utils.driver_get'):
+            driver.get(url)
+        # Try to wait for the page, and the expected condition.
+        wait_for_page_ready(
             driver,
-            wait_time
-        ).until(expected_condition)
+            expected_condition=expected_condition,
+            timeout=wait_time,
+            poll_frequency=poll_frequency
+        )
+
+
+async def driver_get_call_async(
+        driver,
+        url,
+        **kwargs
+):
+    """
+    Coroutine that runs driver_get_call on the bounded executor of async_utils,
+    so the event loop keeps serving other actions while the page loads.
+
+    :param Selenium.webdriver driver:
+            A selenium webdriver.
+    :param str url:
+            The url to be used in GET.
+    :param dict kwargs:
+            Passed to driver_get_call.
+    """
+    await async_utils.run_blocking(driver_get_call, driver, url, **kwargs)
+
+
+def write_screenshot(
+        screenshot_png,
+        screenshot_path
+):
+    """
+    Function that writes encoded screenshot bytes to disk.
+
+    :param bytes screenshot_png:
+            The PNG-encoded screenshot.
+    :param str screenshot_path:
+            Location of the PNG file to write.
+    :return: float:
+            Seconds spent writing.
+    """
+    start_time = time.perf_counter()
+    with open(screenshot_path, 'wb') as screenshot_file:
+        screenshot_file.write(screenshot_png)
+    return time.perf_counter() - start_time
+
+
+def capture_screenshots(
+        screenshot_jobs,
+        save_path_location,
+        driver_pool=None,
+        drivers=4,
+        writers=2,
+        wait_time=DEFAULT_WAIT_TIMEOUT,
+        poll_frequency=DEFAULT_POLL_FREQUENCY,
+        throttle=None
+):
+    """
+    Function that screenshots many urls across a pool of headless drivers.
+    Page loads run on the drivers while finished screenshots are written
+    to disk on separate writer threads.
+
+    :param iterable screenshot_jobs:
+            Tuples of (url, screenshot_name) or (url, screenshot_name, expected_condition).
+    :param str save_path_location:
+            Folder path location to store saved screenshots.
+    :param ChromeDriverPool driver_pool:
+            Pool to borrow drivers from. If None, a pool of size drivers is
+            created for this call and closed afterwards.
+    :param int drivers:
+            Number of pages loaded at once.
+    :param int writers:
+            Number of threads writing screenshots to disk.
+    :param float wait_time:
+            Upper bound, in seconds, on waiting for each page to settle.
+    :param float poll_frequency:
+            Seconds between readiness checks.
+    :param ThrottlePolicy throttle:
+            Optional policy adding a human-like pause before each page load.
+    :return: list:
+            Manifest of dicts, in job order, with each url's screenshot path,
+            status, error, and load/capture/write timings.
+    """
+    owns_pool = driver_pool is None
+    if owns_pool:
+        driver_pool = ChromeDriverPool(size=drivers)
+    os.makedirs(save_path_location, exist_ok=True)
+
+    def capture_single_screenshot(
+            screenshot_job
+    ):
+        """Function that loads one url on a borrowed driver, handing the PNG to a writer."""
+        url, screenshot_name, *optional_condition = screenshot_job
+        manifest_entry = {
+            'url': url,
+            'name': screenshot_name,
+            'path': os.path.join(save_path_location, f"{screenshot_name}.png"),
+            'status': 'ok',
+            'error': None,
+            'load_time': None,
+            'capture_time': None,
+            'write_time': None
+        }
+        try:
+            with driver_pool.driver() as driver:
+                start_time = time.perf_counter()
+                driver_get_call(
+                    driver,
+                    url,
+                    expected_condition=optional_condition[0] if optional_condition else None,
+                    wait_time=wait_time,
+                    poll_frequency=poll_frequency,
+                    throttle=throttle
+                )
+                load_end_time = time.perf_counter()
+                screenshot_png = driver.get_screenshot_as_png()
+                manifest_entry['load_time'] = load_end_time - start_time
+                manifest_entry['capture_time'] = time.perf_counter() - load_end_time
+            # The driver is already back in the pool while the PNG is written.
+            manifest_entry['write_time'] = writer_pool.submit(
+                write_screenshot,
+                screenshot_png,
+                manifest_entry['path']
+            )
+        except Exception as screenshot_error:  # pylint: disable=broad-except
+            manifest_entry['status'] = 'error'
+            manifest_entry['error'] = f'{type(screenshot_error).__name__}: {screenshot_error}'
+        return manifest_entry
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=writers) as writer_pool:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=drivers) as capture_pool:
+                manifest = list(capture_pool.map(
+                    timing_utils.bind_context(capture_single_screenshot),
+                    screenshot_jobs
+                ))
+            # Resolve the pending writes into timings (or failures).
+            for manifest_entry in manifest:
+                if isinstance(manifest_entry['write_time'], concurrent.futures.Future):
+                    try:
+                        manifest_entry['write_time'] = manifest_entry['write_time'].result()
+                    except OSError as write_error:
+                        manifest_entry['write_time'] = None
+                        manifest_entry['status'] = 'error'
+                        manifest_entry['error'] = f'{type(write_error).__name__}: {write_error}'
+    finally:
+        if owns_pool:
+            driver_pool.close()
+    return manifest
@@ -0,0 +1,213 @@
+"""
+Module that contains the span/timer API of chatt_bot, which records nested
+phase timings of a run into its run log, and the opt-in profiling hooks.
+
+Spans are only recorded inside record_spans (which execute_action opens), so
+outside of a run, entering a span costs a single context variable lookup.
+"""
+# Native libraries
+import contextvars
+import functools
+import time
+
+_CURRENT_SPAN = contextvars.ContextVar('chatt_bot_current_span', default=None)
+
+
+class Span:
+    """Class that holds the timing of one phase, and of the phases nested in it."""
+    __slots__ = ('name', 'start', 'elapsed', 'children')
+
+    def __init__(
+            self,
+            name
+    ):
+        """
+        Initialization function, that starts the span's clock.
+
+        :param str name:
+                Name of the timed phase.
+        """
+        self.name = name
+        self.start = time.perf_counter()
+        self.elapsed = None
+        self.children = []
+
+    def to_dict(
+            self
+    ):
+        """
+        Function that converts the span, and its nested spans, to plain dicts.
+
+        :return: dict:
+                The span name, elapsed seconds and nested spans.
+        """
+        return {
+            'name': self.name,
+            'elapsed': self.elapsed,
+            'children': [child.to_dict() for child in self.children]
+        }
+
+
+class span:  # pylint: disable=invalid-name
+    """
+    Context manager that times a phase as a child of the current span.
+    Does nothing (beyond one lookup) when no spans are being recorded.
+    """
+    __slots__ = ('name', '_span', '_token')
+
+    def __init__(
+            self,
+            name
+    ):
+        """
+        Initialization function.
+
+        :param str name:
+                Name of the timed phase.
+        """
+        self.name = name
+        self._span = None
+        self._token = None
+
+    def __enter__(
+            self
+    ):
+        parent_span = _CURRENT_SPAN.get()
+        if parent_span is None:
+            return None
+        self._span = Span(self.name)
+        # Appending to a list is atomic, so spans from worker threads can share a parent.
+        parent_span.children.append(self._span)
+        self._token = _CURRENT_SPAN.set(self._span)
+        return self._span
+
+    def __exit__(
+            self,
+            *exc_info
+    ):
+        if self._span is not None:
+            self._span.elapsed = time.perf_counter() - self._span.start
+            _CURRENT_SPAN.reset(self._token)
+            self._span = None
+
+
+def timed(
+        name
+):
+    """
+    Decorator that times every call of a function as a span.
+
+    :param str name:
+            Name of the timed phase.
+    :return: function:
+            The decorator.
+    """
+    def decorator(
+            func
+    ):
+        @functools.wraps(func)
+        def wrapper(
+                *args,
+                **kwargs
+        ):
+            if _CURRENT_SPAN.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class record_spans:  # pylint: disable=invalid-name
+    """Context manager that opens a root span, recording every span nested in it."""
+    __slots__ = ('root_span', '_token')
+
+    def __init__(
+            self,
+            name
+    ):
+        """
+        Initialization function.
+
+        :param str name:
+                Name of the root phase, e.g. the request being run.
+        """
+        self.root_span = Span(name)
+        self._token = None
+
+    def __enter__(
+            self
+    ):
+        self.root_span.start = time.perf_counter()
+        self._token = _CURRENT_SPAN.set(self.root_span)
+        return self.root_span
+
+    def __exit__(
+            self,
+            *exc_info
+    ):
+        self.root_span.elapsed = time.perf_counter() - self.root_span.start
+        _CURRENT_SPAN.reset(self._token)
+
+
+def bind_context(
+        func
+):
+    """
+    Function that binds a callable to the caller's current span, so spans
+    opened while it runs in a worker thread nest under the submitting span.
+
+    :param function func:
+            The callable to run in a worker thread.
+    :return: function:
+            The callable, run under the caller's current span.
+    """
+    parent_span = _CURRENT_SPAN.get()
+    if parent_span is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(
+            *args,
+            **kwargs
+    ):
+        token = _CURRENT_SPAN.set(parent_span)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _CURRENT_SPAN.reset(token)
+    return wrapper
+
+
+def profile_call(
+        profile_location,
+        func,
+        *args,
+        **kwargs
+):
+    """
+    Function that runs a callable under cProfile, saving the stats to disk.
+
+    :param str profile_location:
+            Location the profile stats (pstats format) are saved to.
+    :param function func:
+            The callable to profile.
+    :param tuple args:
+            Positional arguments passed to func.
+    :param dict kwargs:
+            Keyword arguments passed to func.
+    :return: tuple:
+            The callable's result, and a summary of the top functions by cumulative time.
+    """
+    # Import the profiler lazily, so importing spans (done on every startup) doesn't pay for it.
+    import cProfile  # pylint: disable=import-outside-toplevel
+    import io  # pylint: disable=import-outside-toplevel
+    import pstats  # pylint: disable=import-outside-toplevel
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(profile_location)
+    summary_stream = io.StringIO()
+    pstats.Stats(profiler, stream=summary_stream).sort_stats('cumulative').print_stats(15)
+    return result, summary_stream.getvalue()
@@ -0,0 +1,23 @@
+"""
+Shared pytest setup: tests import chatt_bot from src/, and run from a
+temporary folder, since bot folders are created relative to the working
+directory on non-Windows systems.
+"""
+# Native libraries
+import os
+import sys
+# Non-native libraries
+import pytest
+
+SRC_LOCATION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_LOCATION)
+
+
+@pytest.fixture(autouse=True)
+def isolated_working_directory(
+        tmp_path,
+        monkeypatch
+):
+    """Fixture that runs each test from its own temporary folder."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
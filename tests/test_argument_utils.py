@@ -0,0 +1,168 @@
+"""
+Tests for the argument specs of workflows: parsing them, coercing values to
+their types, and reporting every invalid argument at once.
+"""
+# Custom modules
+from chatt_bot import argument_utils
+from chatt_bot import robot_actions
+# Non-native libraries
+import pytest
+
+
+def test_string_spec_parsing():
+    field = argument_utils.ArgumentField('command', 'str or list, required')
+    assert field.type_names == ('str', 'list')
+    assert field.required
+    assert field.default is None
+    field = argument_utils.ArgumentField('timeout', 'float, optional')
+    assert field.type_names == ('float',)
+    assert not field.required
+
+
+def test_string_spec_defaults():
+    assert argument_utils.ArgumentField('workers', 'int, optional, default=4').default == 4
+    assert argument_utils.ArgumentField(
+        'mode', 'str, optional, default=fast'
+    ).default == 'fast'
+    assert argument_utils.ArgumentField(
+        'names', 'list, optional, default=["a", "b"]'
+    ).default == ['a', 'b']
+
+
+def test_dict_spec_parsing():
+    field = argument_utils.ArgumentField('workers', {'type': 'int'})
+    assert field.type_names == ('int',)
+    # Without a default, a dict spec is required unless it says otherwise.
+    assert field.required
+    field = argument_utils.ArgumentField('workers', {'type': ['int', 'float'], 'default': 4})
+    assert field.type_names == ('int', 'float')
+    assert not field.required
+    assert field.default == 4
+
+
+def test_unknown_type_accepts_anything():
+    field = argument_utils.ArgumentField('note', 'free text, optional')
+    assert field.type_names == ()
+    assert field.coerce(object) is object
+
+
+@pytest.mark.parametrize('spec, value, expected', [
+    ('int', '5', 5),
+    ('int', ' 7 ', 7),
+    ('int', 2.0, 2),
+    ('float', '2.5', 2.5),
+    ('float', 3, 3),
+    ('bool', 'yes', True),
+    ('bool', 'Off', False),
+    ('bool', 1, True),
+    ('list', '[1, 2]', [1, 2]),
+    ('list', (1, 2), [1, 2]),
+    ('dict', '{"a": 1}', {'a': 1}),
+    ('str or list', ['a'], ['a']),
+    ('str or list', 5, '5'),
+    ('int or str', 'five', 'five')
+])
+def test_coercion(
+        spec,
+        value,
+        expected
+):
+    assert argument_utils.ArgumentField('value', spec).coerce(value) == expected
+
+
+@pytest.mark.parametrize('spec, value', [
+    ('int', 2.5),
+    ('int', 'five'),
+    ('int', [1]),
+    ('bool', 'maybe'),
+    ('list', '{"a": 1}'),
+    ('list', 'not json'),
+    ('dict', '[1]')
+])
+def test_coercion_errors(
+        spec,
+        value
+):
+    with pytest.raises(ValueError, match=r"argument 'value' must be"):
+        argument_utils.ArgumentField('value', spec).coerce(value)
+
+
+def test_bool_only_accepted_for_bool():
+    assert argument_utils.ArgumentField('flag', 'bool').coerce(True) is True
+    assert argument_utils.ArgumentField('count', 'int or bool').coerce(True) is True
+    assert argument_utils.ArgumentField('ratio', 'float').coerce(False) == 0.0
+
+
+def test_schema_fills_defaults_and_coerces():
+    schema = argument_utils.ArgumentSchema('some_request', {
+        'command': 'str or list, required',
+        'timeout': 'float, optional',
+        'max_parallel': 'int, optional, default=4'
+    })
+    assert schema.validate({'command': 'echo', 'timeout': '1.5'}) == {
+        'command': 'echo',
+        'timeout': 1.5,
+        'max_parallel': 4
+    }
+    assert schema.validate({'command': 'echo', 'max_parallel': '2'})['max_parallel'] == 2
+
+
+def test_schema_reports_every_error_at_once():
+    schema = argument_utils.ArgumentSchema('some_request', {
+        'command': 'str or list, required',
+        'url': 'str, required',
+        'timeout': 'float, optional',
+        'max_parallel': 'int, optional'
+    })
+    with pytest.raises(ValueError) as schema_error:
+        schema.validate({'colour': 'red', 'url': '', 'timeout': 'soon', 'max_parallel': 3})
+    error_message = str(schema_error.value)
+    assert error_message.startswith("Invalid additional arguments for request 'some_request': ")
+    assert "unknown argument(s) ['colour']" in error_message
+    assert "missing the required argument 'command'" in error_message
+    assert "argument 'url' cannot be in [None, '']" in error_message
+    assert "argument 'timeout' must be float, got 'soon'" in error_message
+    assert "argument 'max_parallel'" not in error_message
+
+
+def test_schema_without_fields_passes_through():
+    schema = argument_utils.ArgumentSchema('some_request', {})
+    kwargs = {'anything': None, 'count': '3'}
+    assert schema.validate(kwargs) == kwargs
+    assert schema.validate(kwargs) is not kwargs
+
+
+def test_check_additional_arguments_uses_registry_spec():
+    assert robot_actions.check_additional_arguments(
+        'gen_comm',
+        command='echo hi',
+        timeout='2.5',
+        max_parallel='3'
+    ) == {'command': 'echo hi', 'timeout': 2.5, 'max_parallel': 3}
+    with pytest.raises(ValueError, match="missing the required argument 'command'"):
+        robot_actions.check_additional_arguments('gen_comm', timeout=1)
+
+
+@pytest.mark.parametrize('add_args, expected', [
+    ({'command': 'ls'}, {'command': 'ls'}),
+    ('', {}),
+    ('{"command": "ls", "timeout": 2}', {'command': 'ls', 'timeout': 2}),
+    ("{'command': ['ls', '-l'], 'timeout': 2}", {'command': ['ls', '-l'], 'timeout': 2}),
+    ('{command: echo hi, timeout: 2}', {'command': 'echo hi', 'timeout': '2'}),
+    ('url: http://localhost:8000', {'url': 'http://localhost:8000'}),
+    ('command: echo a,b', {'command': 'echo a,b'}),
+    ('command: echo a, b, timeout: 2', {'command': 'echo a, b', 'timeout': '2'})
+])
+def test_parse_additional_arguments(
+        add_args,
+        expected
+):
+    assert robot_actions.parse_additional_arguments(add_args) == expected
+
+
+@pytest.mark.parametrize('add_args', ['[1, 2]', '"command"', '3', 'echo a, command: b'])
+def test_parse_additional_arguments_rejects_non_dict(
+        add_args
+):
+    with pytest.raises(ValueError, match='must be a dictionary'):
+        robot_actions.parse_additional_arguments(add_args)
@@ -0,0 +1,110 @@
+"""
+Tests for batch runs of job files: validation, execution on each kind of
+pool, exit-status aggregation, and batched run history writes.
+"""
+# Native libraries
+import json
+# Custom modules
+from chatt_bot import bot_batch
+from chatt_bot import run_history
+# Non-native libraries
+import pytest
+
+
+def write_job_file(
+        job_file_location,
+        jobs
+):
+    """Function that writes jobs as a JSON lines job file."""
+    with open(job_file_location, 'w', encoding='utf-8') as job_file:
+        for job in jobs:
+            job_file.write(json.dumps(job) + '\n')
+    return str(job_file_location)
+
+
+@pytest.fixture
+def history_store(
+        tmp_path,
+        monkeypatch
+):
+    """Fixture that swaps the shared run history store for one in a temporary database."""
+    store = run_history.RunHistoryStore(str(tmp_path / 'run_history.sqlite3'))
+    monkeypatch.setattr(run_history, '_RUN_HISTORY_STORE', store)
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize('pool_options', [
+    {},
+    {'use_processes': True},
+    {'use_async': True}
+])
+def test_batch_aggregates_exit_statuses(
+        tmp_path,
+        history_store,
+        pool_options
+):
+    job_file_path = write_job_file(tmp_path / 'jobs.jsonl', [
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'command': 'echo one'}},
+        {'action_type': 'command', 'request': 'gen_comm', 'add_args': {'command': 'exit 3'}},
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'command': 'echo three'}}
+    ])
+    summary = bot_batch.run_batch(job_file_path, max_workers=2, quiet=True, **pool_options)
+    assert (summary['jobs'], summary['succeeded'], summary['failed']) == (3, 2, 1)
+    with open(summary['batch_log'], 'r', encoding='utf-8') as batch_log_file:
+        batch_entries = sorted(
+            (json.loads(line) for line in batch_log_file),
+            key=lambda batch_entry: batch_entry['line_number']
+        )
+    assert [batch_entry['status'] for batch_entry in batch_entries] == ['ok', 'failed', 'ok']
+    assert [batch_entry['exit_status'] for batch_entry in batch_entries] == [0, 3, 0]
+    assert batch_entries[1]['error'] == 'Exited with status 3.'
+
+
+def test_batch_validates_every_job_before_running(
+        tmp_path,
+        history_store
+):
+    job_file_path = write_job_file(tmp_path / 'jobs.jsonl', [
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'command': 'touch ran'}},
+        {'action_type': 'c', 'request': 'no_such_request'},
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'timeout': 'soon'}}
+    ])
+    with pytest.raises(ValueError, match='2 job') as bad_jobs:
+        bot_batch.run_batch(job_file_path, quiet=True)
+    assert 'Line 2' in str(bad_jobs.value) and 'Line 3' in str(bad_jobs.value)
+    assert not (tmp_path / 'ran').exists()
+    assert history_store.query() == []
+
+
+def test_batch_rejects_invalid_json(
+        tmp_path
+):
+    job_file_location = tmp_path / 'jobs.jsonl'
+    job_file_location.write_text('{"action_type": "c"}\n\n{not json\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='Line 3'):
+        bot_batch.read_job_file(str(job_file_location))
+
+
+def test_batch_writes_history_in_batches(
+        tmp_path,
+        history_store,
+        monkeypatch
+):
+    job_file_path = write_job_file(tmp_path / 'jobs.jsonl', [
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'command': f'echo {job}'}}
+        for job in range(5)
+    ])
+    history_writes = []
+    write_pending_runs = history_store._write_pending_runs  # pylint: disable=protected-access
+
+    def count_writes():
+        history_writes.append(len(history_store._pending_runs))  # pylint: disable=protected-access
+        write_pending_runs()
+    monkeypatch.setattr(history_store, '_write_pending_runs', count_writes)
+    # The store was opened before the batch, writing each run as it ends.
+    assert history_store.batch_size == 1
+    bot_batch.run_batch(job_file_path, quiet=True)
+    assert [run_count for run_count in history_writes if run_count] == [5]
+    assert history_store.batch_size == 1
+    assert len(history_store.query()) == 5
@@ -0,0 +1,138 @@
+"""
+Tests for the interval and cron parsing of the scheduler, and the validation
+of schedule files.
+"""
+# Native libraries
+import datetime
+import json
+# Custom modules
+from chatt_bot import bot_scheduler
+# Non-native libraries
+import pytest
+
+
+def test_parse_interval_units():
+    assert bot_scheduler.parse_interval(300) == 300
+    assert bot_scheduler.parse_interval('1.5') == 1.5
+    assert bot_scheduler.parse_interval('30s') == 30
+    assert bot_scheduler.parse_interval('5m') == 300
+    assert bot_scheduler.parse_interval(' 2H ') == 7200
+    assert bot_scheduler.parse_interval('1d') == 86400
+
+
+@pytest.mark.parametrize('interval', [0, '-5', '5w', 'often', ''])
+def test_parse_interval_rejects(
+        interval
+):
+    with pytest.raises(ValueError):
+        bot_scheduler.parse_interval(interval)
+
+
+@pytest.mark.parametrize('field_text, expected', [
+    ('*', set(range(0, 60))),
+    ('5', {5}),
+    ('10-14', {10, 11, 12, 13, 14}),
+    ('*/15', {0, 15, 30, 45}),
+    ('0-30/10', {0, 10, 20, 30}),
+    ('50/5', {50, 55}),
+    ('1,2,40-42', {1, 2, 40, 41, 42})
+])
+def test_parse_cron_field(
+        field_text,
+        expected
+):
+    assert bot_scheduler.parse_cron_field(field_text, 'minute', 0, 59) == expected
+
+
+@pytest.mark.parametrize('field_text', ['60', '5-1', '*/0', 'a', '1-', ''])
+def test_parse_cron_field_rejects(
+        field_text
+):
+    with pytest.raises(ValueError):
+        bot_scheduler.parse_cron_field(field_text, 'minute', 0, 59)
+
+
+def test_day_of_week_zero_and_seven_are_sunday():
+    assert bot_scheduler.CronExpression('0 0 * * 0').days_of_week == {0}
+    assert bot_scheduler.CronExpression('0 0 * * 7').days_of_week == {0}
+    assert bot_scheduler.CronExpression('0 0 * * 5-7').days_of_week == {0, 5, 6}
+    # 2026-10-17 is a Saturday, so the next Sunday midnight is the 18th.
+    saturday = datetime.datetime(2026, 10, 17, 12, 0)
+    for expression in ['0 0 * * 0', '0 0 * * 7']:
+        assert bot_scheduler.CronExpression(expression).next_after(saturday) == \
+            datetime.datetime(2026, 10, 18, 0, 0)
+
+
+def test_next_after_steps_and_ranges():
+    cron = bot_scheduler.CronExpression('*/5 8-18 * * 1-5')
+    # Strictly after the moment, rounded up to the next matching minute.
+    assert cron.next_after(datetime.datetime(2026, 10, 14, 9, 5)) == \
+        datetime.datetime(2026, 10, 14, 9, 10)
+    assert cron.next_after(datetime.datetime(2026, 10, 14, 9, 7, 30)) == \
+        datetime.datetime(2026, 10, 14, 9, 10)
+    # After hours on a Friday, the next firing is Monday morning.
+    assert cron.next_after(datetime.datetime(2026, 10, 16, 18, 55)) == \
+        datetime.datetime(2026, 10, 19, 8, 0)
+
+
+def test_next_after_rolls_over_months_and_years():
+    cron = bot_scheduler.CronExpression('30 6 1 1,7 *')
+    assert cron.next_after(datetime.datetime(2026, 3, 2)) == \
+        datetime.datetime(2026, 7, 1, 6, 30)
+    assert cron.next_after(datetime.datetime(2026, 7, 1, 6, 30)) == \
+        datetime.datetime(2027, 1, 1, 6, 30)
+
+
+def test_restricted_day_of_month_or_day_of_week():
+    # As in cron, the 13th OR any Friday.
+    cron = bot_scheduler.CronExpression('0 12 13 * 5')
+    assert cron.next_after(datetime.datetime(2026, 10, 10)) == \
+        datetime.datetime(2026, 10, 13, 12, 0)
+    assert cron.next_after(datetime.datetime(2026, 10, 13, 12, 0)) == \
+        datetime.datetime(2026, 10, 16, 12, 0)
+
+
+def test_leap_day_fires():
+    assert bot_scheduler.CronExpression('0 0 29 2 *').next_after(
+        datetime.datetime(2026, 10, 17)
+    ) == datetime.datetime(2028, 2, 29, 0, 0)
+
+
+@pytest.mark.parametrize('expression', ['* * * *', '* * * * * *', '61 * * * *', '* * 0 * *'])
+def test_cron_expression_rejects_bad_fields(
+        expression
+):
+    with pytest.raises(ValueError):
+        bot_scheduler.CronExpression(expression)
+
+
+@pytest.mark.parametrize('expression', ['0 0 31 4 *', '0 0 30 2 *'])
+def test_cron_expression_rejects_never_firing(
+        expression
+):
+    with pytest.raises(ValueError, match='never fires'):
+        bot_scheduler.CronExpression(expression)
+
+
+def test_schedule_requires_one_of_interval_or_cron():
+    job = {'action_type': 'command', 'request': 'gen_comm', 'add_args': {'command': 'echo'}}
+    with pytest.raises(ValueError):
+        bot_scheduler.Schedule(job)
+    with pytest.raises(ValueError):
+        bot_scheduler.Schedule(job, interval='5m', cron='* * * * *')
+    schedule = bot_scheduler.Schedule(job, interval='5m')
+    assert schedule.next_fire_time(1000.0) == 1300.0
+
+
+def test_read_schedule_file_reports_never_firing_cron(
+        tmp_path
+):
+    schedule_file = tmp_path / 'schedules.jsonl'
+    schedule_file.write_text('\n'.join(json.dumps(schedule_record) for schedule_record in [
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'command': 'echo'},
+         'interval': '5m'},
+        {'action_type': 'c', 'request': 'gen_comm', 'add_args': {'command': 'echo'},
+         'cron': '0 0 31 4 *'}
+    ]), encoding='utf-8')
+    with pytest.raises(ValueError, match=r'1 schedule\(s\) failed validation:\nLine 2: .*never fires'):
+        bot_scheduler.read_schedule_file(str(schedule_file))
@@ -0,0 +1,108 @@
+"""
+Tests for the chatt_bot server: its socket, and requests sent to it.
+"""
+# Native libraries
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+# Custom modules
+from chatt_bot import bot_server
+from conftest import SRC_LOCATION
+# Non-native libraries
+import pytest
+
+
+@pytest.fixture
+def running_server(
+        tmp_path
+):
+    """Fixture that serves requests on a temporary socket until the test ends."""
+    socket_path = str(tmp_path / 'chatt_bot.sock')
+    server = bot_server.BotServer(socket_path=socket_path, preload=False)
+    server_thread = threading.Thread(target=server.serve_until_shutdown, daemon=True)
+    server_thread.start()
+    try:
+        yield server
+    finally:
+        bot_server.send_request({'command': 'shutdown'}, socket_path=socket_path)
+        server_thread.join(timeout=10)
+
+
+def test_socket_is_owner_only(
+        running_server
+):
+    assert stat.S_IMODE(os.stat(running_server.socket_path).st_mode) == 0o600
+
+
+def test_refuses_running_server_socket(
+        running_server
+):
+    with pytest.raises(OSError, match='already listening'):
+        bot_server.BotServer(socket_path=running_server.socket_path, preload=False)
+    assert bot_server.is_server_running(running_server.socket_path)
+
+
+def test_replaces_stale_socket(
+        tmp_path
+):
+    socket_path = str(tmp_path / 'stale.sock')
+    # A socket file nobody listens on, as left behind by a crashed server.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(socket_path)
+    assert not bot_server.is_server_running(socket_path)
+    server = bot_server.BotServer(socket_path=socket_path, preload=False)
+    try:
+        assert bot_server.is_server_running(socket_path)
+    finally:
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+@pytest.fixture
+def server_process(
+        tmp_path
+):
+    """Fixture that runs the server in its own process, as 'chatt_bot serve' does."""
+    socket_path = str(tmp_path / 'chatt_bot.sock')
+    cli_environment = dict(os.environ, PYTHONPATH=SRC_LOCATION)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'chatt_bot.chatt_bot_cli', 'serve', '--socket-path', socket_path],
+        env=cli_environment,
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not bot_server.is_server_running(socket_path):
+            assert server.poll() is None and time.monotonic() < deadline
+            time.sleep(0.05)
+        yield socket_path, cli_environment
+    finally:
+        bot_server.send_request({'command': 'shutdown'}, socket_path=socket_path)
+        server.wait(timeout=30)
+
+
+@pytest.mark.parametrize('command, exit_code', [('echo x', 0), ('echo x; exit 2', 2)])
+def test_send_exits_with_command_status(
+        server_process,
+        command,
+        exit_code
+):
+    socket_path, cli_environment = server_process
+    completed = subprocess.run(
+        [
+            sys.executable, '-m', 'chatt_bot.chatt_bot_cli', 'send', 'c', 'gen_comm',
+            '--add-args', json.dumps({'command': command}),
+            '--socket-path', socket_path
+        ],
+        capture_output=True,
+        text=True,
+        env=cli_environment,
+        check=False
+    )
+    assert completed.returncode == exit_code
+    assert 'x' in completed.stdout
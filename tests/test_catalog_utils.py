@@ -0,0 +1,51 @@
+"""
+Tests that the action catalog resolves names exactly as the action registry does.
+"""
+# Custom modules
+from chatt_bot import catalog_utils
+from chatt_bot import robot_actions
+# Non-native libraries
+import pytest
+
+
+@pytest.fixture
+def registry_and_catalog():
+    """Fixture that builds the registry, and a catalog snapshot of it."""
+    registry = robot_actions.get_registry()
+    return registry, catalog_utils.build_catalog(registry, 'fingerprint')
+
+
+@pytest.mark.parametrize('action_type,request_name', [
+    ('command', 'gen_comm'),
+    (' C ', "'GEN_COMM'"),
+    ('w', 'gen_comm'),
+    ('unknown', 'gen_comm'),
+    ('c', 'unknown')
+])
+def test_catalog_resolves_like_registry(
+        registry_and_catalog,
+        action_type,
+        request_name
+):
+    registry, catalog = registry_and_catalog
+    try:
+        built_action = registry.resolve_action_type(action_type)
+        expected = (built_action, registry.resolve_request(built_action, request_name))
+    except ValueError as registry_error:
+        expected = str(registry_error)
+    try:
+        resolved = catalog_utils.resolve_catalog_request(catalog, action_type, request_name)
+    except ValueError as catalog_error:
+        resolved = str(catalog_error)
+    assert resolved == expected
+
+
+def test_catalog_snapshot_leaves_no_temp_file(
+        tmp_path,
+        monkeypatch
+):
+    catalog_location = tmp_path / 'catalog.json'
+    monkeypatch.setattr(catalog_utils, 'get_catalog_location', lambda: str(catalog_location))
+    catalog = catalog_utils.load_catalog()
+    assert catalog_utils.load_catalog() == catalog
+    assert [path.name for path in tmp_path.iterdir()] == ['catalog.json']
@@ -0,0 +1,79 @@
+"""
+Benchmark of the download engine against a local HTTP server, reporting
+MB/s (run with -s to see the report).
+"""
+# Native libraries
+import functools
+import hashlib
+import http.server
+import os
+import threading
+# Custom modules
+from chatt_bot import download_utils
+# Non-native libraries
+import pytest
+
+FILE_COUNT = 8
+FILE_SIZE = 8 * 1024 * 1024
+
+
+class QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Class that serves files without logging each request."""
+    def log_message(  # pylint: disable=arguments-differ
+            self,
+            *args
+    ):
+        pass
+
+
+@pytest.fixture
+def served_files(
+        tmp_path
+):
+    """Fixture that serves FILE_COUNT random files, yielding their urls and digests."""
+    served_folder = tmp_path / 'served'
+    served_folder.mkdir()
+    file_digests = {}
+    for file_number in range(FILE_COUNT):
+        file_bytes = os.urandom(FILE_SIZE)
+        (served_folder / f'file_{file_number}.bin').write_bytes(file_bytes)
+        file_digests[f'file_{file_number}.bin'] = hashlib.sha256(file_bytes).hexdigest()
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        functools.partial(QuietRequestHandler, directory=str(served_folder))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}', file_digests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_download_throughput(
+        tmp_path,
+        served_files
+):
+    base_url, file_digests = served_files
+    manifest = [
+        {
+            'url': f'{base_url}/{file_name}',
+            'path': str(tmp_path / 'downloads' / file_name),
+            'checksum': file_digest
+        }
+        for file_name, file_digest in file_digests.items()
+    ]
+    (tmp_path / 'downloads').mkdir()
+    summary = download_utils.DownloadManager(
+        state_location=str(tmp_path / 'download_state.json'),
+        max_workers=4,
+        max_per_host=4
+    ).run(manifest)
+    print(
+        f"\n{summary['downloaded']} files, {summary['bytes'] / (1024 * 1024):.0f} MB "
+        f"at {summary['throughput_mb_s']:.1f} MB/s"
+    )
+    assert summary['downloaded'] == FILE_COUNT
+    assert summary['failed'] == 0
+    assert summary['bytes'] == FILE_COUNT * FILE_SIZE
+    assert summary['throughput_mb_s'] > 0
@@ -0,0 +1,190 @@
+"""
+Tests for the resumable and segmented download paths, against a local
+server that honours Range requests.
+"""
+# Native libraries
+import hashlib
+import http.server
+import json
+import os
+import re
+import threading
+# Custom modules
+from chatt_bot import download_utils
+# Non-native libraries
+import pytest
+
+FILE_SIZE = 1024 * 1024 + 123
+SEGMENTS = 4
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Class that serves one in-memory file, honouring single byte ranges."""
+    file_bytes = b''
+    range_requests = []
+
+    def log_message(  # pylint: disable=arguments-differ
+            self,
+            *args
+    ):
+        pass
+
+    def send_file(
+            self,
+            send_body
+    ):
+        """Function that sends the whole file, or the range requested."""
+        range_match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if range_match is None:
+            self.send_response(200)
+            body = self.file_bytes
+        else:
+            self.range_requests.append(self.headers['Range'])
+            range_start = int(range_match.group(1))
+            range_end = int(range_match.group(2) or len(self.file_bytes) - 1)
+            if range_start >= len(self.file_bytes):
+                self.send_response(416)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = self.file_bytes[range_start:range_end + 1]
+            self.send_response(206)
+            self.send_header(
+                'Content-Range', f'bytes {range_start}-{range_end}/{len(self.file_bytes)}'
+            )
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(  # pylint: disable=invalid-name
+            self
+    ):
+        self.send_file(send_body=True)
+
+    def do_HEAD(  # pylint: disable=invalid-name
+            self
+    ):
+        self.send_file(send_body=False)
+
+
+@pytest.fixture
+def served_file(
+        tmp_path
+):
+    """Fixture that serves a random file, yielding its url, bytes and digest."""
+    file_bytes = os.urandom(FILE_SIZE)
+    handler = type('ServedFileHandler', (RangeRequestHandler,), {
+        'file_bytes': file_bytes,
+        'range_requests': []
+    })
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield (
+            f'http://127.0.0.1:{server.server_address[1]}/file.bin',
+            file_bytes,
+            hashlib.sha256(file_bytes).hexdigest(),
+            handler.range_requests
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_segmented_download(
+        tmp_path,
+        served_file
+):
+    url, file_bytes, file_digest, range_requests = served_file
+    local_file_name = str(tmp_path / 'file.bin')
+    download_result = download_utils.download_file(
+        url, local_file_name, checksum=file_digest, segments=SEGMENTS
+    )
+    assert download_result['bytes'] == FILE_SIZE
+    assert download_result['resumed_from'] == 0
+    assert len(range_requests) == SEGMENTS
+    with open(local_file_name, 'rb') as local_file:
+        assert local_file.read() == file_bytes
+    assert sorted(os.listdir(tmp_path)) == ['file.bin']
+
+
+def test_segmented_download_resumes_finished_segments(
+        tmp_path,
+        served_file
+):
+    url, file_bytes, file_digest, range_requests = served_file
+    local_file_name = str(tmp_path / 'file.bin')
+    segment_size = -(-FILE_SIZE // SEGMENTS)
+    # An interrupted download that finished its first segment.
+    with open(f'{local_file_name}.part', 'wb') as part_file:
+        part_file.write(file_bytes[:segment_size])
+        part_file.truncate(FILE_SIZE)
+    with open(f'{local_file_name}.part.json', 'w', encoding='utf-8') as progress_file:
+        json.dump({
+            'url': url,
+            'content_length': FILE_SIZE,
+            'segment_size': segment_size,
+            'done_segments': [0]
+        }, progress_file)
+    download_result = download_utils.download_file(
+        url, local_file_name, checksum=file_digest, segments=SEGMENTS
+    )
+    assert download_result['resumed_from'] == segment_size
+    assert download_result['bytes'] == FILE_SIZE - segment_size
+    assert len(range_requests) == SEGMENTS - 1
+    with open(local_file_name, 'rb') as local_file:
+        assert local_file.read() == file_bytes
+
+
+@pytest.mark.parametrize('progress_text', ['{"url": "http://', '', '[1, 2]'])
+def test_unreadable_progress_starts_over(
+        tmp_path,
+        served_file,
+        progress_text
+):
+    url, file_bytes, file_digest, _ = served_file
+    local_file_name = str(tmp_path / 'file.bin')
+    with open(f'{local_file_name}.part', 'wb') as part_file:
+        part_file.write(b'\0' * 1000)
+    with open(f'{local_file_name}.part.json', 'w', encoding='utf-8') as progress_file:
+        progress_file.write(progress_text)
+    download_result = download_utils.download_file(
+        url, local_file_name, checksum=file_digest, segments=SEGMENTS
+    )
+    assert download_result['resumed_from'] == 0
+    assert download_result['bytes'] == FILE_SIZE
+    with open(local_file_name, 'rb') as local_file:
+        assert local_file.read() == file_bytes
+
+
+def test_single_stream_resumes_part_file(
+        tmp_path,
+        served_file
+):
+    url, file_bytes, file_digest, range_requests = served_file
+    local_file_name = str(tmp_path / 'file.bin')
+    with open(f'{local_file_name}.part', 'wb') as part_file:
+        part_file.write(file_bytes[:5000])
+    download_result = download_utils.download_file(url, local_file_name, checksum=file_digest)
+    assert download_result['resumed_from'] == 5000
+    assert download_result['bytes'] == FILE_SIZE - 5000
+    assert range_requests == ['bytes=5000-']
+    with open(local_file_name, 'rb') as local_file:
+        assert local_file.read() == file_bytes
+
+
+def test_single_stream_restarts_oversized_part_file(
+        tmp_path,
+        served_file
+):
+    url, file_bytes, file_digest, _ = served_file
+    local_file_name = str(tmp_path / 'file.bin')
+    # Range not satisfiable, so the .part file is discarded.
+    with open(f'{local_file_name}.part', 'wb') as part_file:
+        part_file.write(b'\0' * (FILE_SIZE + 10))
+    download_result = download_utils.download_file(url, local_file_name, checksum=file_digest)
+    assert download_result['resumed_from'] == 0
+    with open(local_file_name, 'rb') as local_file:
+        assert local_file.read() == file_bytes
@@ -0,0 +1,160 @@
+"""
+Tests for the conditional-request HTTP cache, against a local server that
+answers If-None-Match with 304 Not Modified.
+"""
+# Native libraries
+import http.server
+import os
+import threading
+import types
+# Custom modules
+from chatt_bot import download_utils
+from chatt_bot import http_utils
+# Non-native libraries
+import pytest
+
+FILE_BYTES = b'unchanged upstream data\n' * 1000
+FILE_ETAG = '"v1"'
+
+
+class ConditionalRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Class that serves one resource with an ETag, logging every request."""
+    seen_requests = []
+
+    def log_message(  # pylint: disable=arguments-differ
+            self,
+            *args
+    ):
+        pass
+
+    def send_resource(
+            self,
+            send_body
+    ):
+        """Function that sends the resource, or 304 if the client's copy matches."""
+        self.seen_requests.append((self.command, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == FILE_ETAG:
+            self.send_response(304)
+            self.send_header('ETag', FILE_ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', FILE_ETAG)
+        self.send_header('Content-Length', str(len(FILE_BYTES)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(FILE_BYTES)
+
+    def do_GET(  # pylint: disable=invalid-name
+            self
+    ):
+        self.send_resource(send_body=True)
+
+    def do_HEAD(  # pylint: disable=invalid-name
+            self
+    ):
+        self.send_resource(send_body=False)
+
+
+@pytest.fixture
+def served_resource():
+    """Fixture that serves the resource, yielding its url and the requests seen."""
+    handler = type('ServedResourceHandler', (ConditionalRequestHandler,), {'seen_requests': []})
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}/data.txt', handler.seen_requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def http_cache(
+        tmp_path,
+        monkeypatch
+):
+    """Fixture that swaps the shared HTTP cache for one in a temporary folder."""
+    cache = http_utils.HttpCache(cache_location=str(tmp_path / 'http_cache.json'))
+    monkeypatch.setattr(http_utils, '_HTTP_CACHE', cache)
+    return cache
+
+
+def test_download_hit_skips_rewriting_file(
+        tmp_path,
+        served_resource,
+        http_cache
+):
+    url, seen_requests = served_resource
+    local_file_name = str(tmp_path / 'data.txt')
+    first_result = download_utils.download_file(url, local_file_name, use_cache=True)
+    assert not first_result['skipped']
+    first_stat = os.stat(local_file_name)
+    second_result = download_utils.download_file(url, local_file_name, use_cache=True)
+    assert second_result['skipped']
+    assert second_result['bytes'] == 0
+    second_stat = os.stat(local_file_name)
+    assert (second_stat.st_ino, second_stat.st_mtime_ns) == \
+        (first_stat.st_ino, first_stat.st_mtime_ns)
+    assert seen_requests == [('GET', None), ('GET', FILE_ETAG)]
+    # The validators were persisted, so a new process revalidates too.
+    reloaded_cache = http_utils.HttpCache(cache_location=http_cache.cache_location)
+    assert reloaded_cache.lookup('GET', url, required_file=local_file_name)['etag'] == FILE_ETAG
+
+
+def test_changed_file_is_downloaded_again(
+        tmp_path,
+        served_resource,
+        http_cache
+):
+    url, seen_requests = served_resource
+    local_file_name = str(tmp_path / 'data.txt')
+    download_utils.download_file(url, local_file_name, use_cache=True)
+    with open(local_file_name, 'ab') as local_file:
+        local_file.write(b'edited locally')
+    assert not download_utils.download_file(url, local_file_name, use_cache=True)['skipped']
+    assert seen_requests == [('GET', None), ('GET', None)]
+    with open(local_file_name, 'rb') as local_file:
+        assert local_file.read() == FILE_BYTES
+
+
+def test_head_and_get_are_cached_apart(
+        served_resource,
+        http_cache
+):
+    url, seen_requests = served_resource
+    with http_utils.HttpClient() as http_client:
+        for method in ['HEAD', 'GET', 'HEAD', 'GET']:
+            with http_cache.conditional_request(http_client, method, url) as (status_code, _):
+                assert status_code == 200
+    assert sorted(http_cache.entries) == [f'GET {url}', f'HEAD {url}']
+    # Each method revalidates only its own entry.
+    assert seen_requests == [('HEAD', None), ('GET', None), ('HEAD', FILE_ETAG), ('GET', FILE_ETAG)]
+
+
+def test_evicts_least_recently_used_by_size(
+        tmp_path
+):
+    response = types.SimpleNamespace(status_code=200, headers={'ETag': FILE_ETAG})
+    cache = http_utils.HttpCache(cache_location=str(tmp_path / 'http_cache.json'))
+    cache.store('GET', 'https://example.com/0', response)
+    entry_size = http_utils.get_entry_size(
+        'GET https://example.com/0',
+        cache.entries['GET https://example.com/0']
+    )
+    # Room for ten entries, whose sizes differ by a few bytes of timestamp.
+    cache.max_bytes = entry_size * 10 + 50
+    for url_number in range(1, 10):
+        cache.store('GET', f'https://example.com/{url_number}', response)
+    assert len(cache.entries) == 10
+    # Using the first entry keeps it past the next eviction.
+    cache.lookup('GET', 'https://example.com/0')['last_access'] += 1000
+    for url_number in range(10, 13):
+        cache.store('GET', f'https://example.com/{url_number}', response)
+    cache.flush()
+    assert os.path.getsize(cache.cache_location) <= cache.max_bytes
+    assert 'GET https://example.com/0' in cache.entries
+    assert 'GET https://example.com/1' not in cache.entries
+    assert 'GET https://example.com/12' in cache.entries
+    reloaded_cache = http_utils.HttpCache(cache_location=cache.cache_location)
+    assert sorted(reloaded_cache.entries) == sorted(cache.entries)
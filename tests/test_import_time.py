@@ -0,0 +1,47 @@
+"""
+Tests that the CLI's describe path never imports the workflow stack.
+"""
+# Native libraries
+import os
+import subprocess
+import sys
+# Custom modules
+from conftest import SRC_LOCATION
+
+HEAVY_MODULES = {'selenium', 'bs4', 'requests', 'webdriver_manager'}
+
+
+def get_imported_modules(
+        *cli_args
+):
+    """
+    Function that runs the CLI under -X importtime in a new interpreter.
+
+    :return: set:
+            Top-level names of every module imported.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'chatt_bot.chatt_bot_cli', *cli_args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=SRC_LOCATION)
+    )
+    return {
+        line.rsplit('|', 1)[-1].strip().split('.')[0]
+        for line in completed.stderr.splitlines()
+        if line.startswith('import time:')
+    }
+
+
+def test_describe_skips_workflow_stack():
+    # The first run builds the catalog snapshot, the second reads it.
+    for _ in range(2):
+        imported_modules = get_imported_modules('kickoff', 'c', 'gen_comm', '--describe')
+        assert not HEAVY_MODULES & imported_modules
+
+
+def test_help_skips_workflow_stack():
+    imported_modules = get_imported_modules('--help')
+    assert not HEAVY_MODULES & imported_modules
+    assert 'chatt_bot' in imported_modules
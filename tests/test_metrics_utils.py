@@ -0,0 +1,99 @@
+"""
+Tests for the sharded metrics: updates from many threads, merged into the
+Prometheus text exposition format, while the threads run and after they end.
+"""
+# Native libraries
+import threading
+# Custom modules
+from chatt_bot import metrics_utils
+# Non-native libraries
+import pytest
+
+THREAD_COUNT = 8
+UPDATE_COUNT = 1000
+
+
+@pytest.fixture
+def registered_metrics(
+        monkeypatch
+):
+    """Fixture that registers a counter and a histogram in an empty metrics registry."""
+    monkeypatch.setattr(metrics_utils, '_METRICS', {})
+    counter = metrics_utils.register_metric(metrics_utils.Counter(
+        'test_requests_total', 'Requests handled.', ('method',)
+    ))
+    histogram = metrics_utils.register_metric(metrics_utils.Histogram(
+        'test_duration_seconds', 'Request durations.', ('method',), buckets=(0.1, 1)
+    ))
+    return counter, histogram
+
+
+def get_expected_metrics(
+        rounds
+):
+    """Function that renders the metrics page expected after rounds of every thread's updates."""
+    updates = THREAD_COUNT * UPDATE_COUNT * rounds
+    return (
+        '# HELP test_duration_seconds Request durations.\n'
+        '# TYPE test_duration_seconds histogram\n'
+        f'test_duration_seconds_bucket{{method="GET",le="0.1"}} {updates // 2}\n'
+        f'test_duration_seconds_bucket{{method="GET",le="1"}} {updates}\n'
+        f'test_duration_seconds_bucket{{method="GET",le="+Inf"}} {updates}\n'
+        f'test_duration_seconds_sum{{method="GET"}} '
+        f'{metrics_utils.format_value(updates // 2 * (0.0625 + 0.5))}\n'
+        f'test_duration_seconds_count{{method="GET"}} {updates}\n'
+        '# HELP test_requests_total Requests handled.\n'
+        '# TYPE test_requests_total counter\n'
+        f'test_requests_total{{method="GET"}} {updates}\n'
+        f'test_requests_total{{method="POST"}} {updates * 2}\n'
+    )
+
+
+def test_threaded_updates_are_rendered(
+        registered_metrics
+):
+    counter, histogram = registered_metrics
+    updated = threading.Barrier(THREAD_COUNT + 1)
+    rendered = threading.Barrier(THREAD_COUNT + 1)
+
+    def update_metrics():
+        for update_number in range(UPDATE_COUNT):
+            counter.inc('GET')
+            counter.inc('POST', amount=2)
+            # Half the observations fall in the first bucket, half in the second.
+            histogram.observe(0.0625 if update_number % 2 else 0.5, 'GET')
+        updated.wait()
+        rendered.wait()
+
+    for completed_rounds in range(1, 3):
+        worker_threads = [
+            threading.Thread(target=update_metrics) for _ in range(THREAD_COUNT)
+        ]
+        for worker_thread in worker_threads:
+            worker_thread.start()
+        # Rendered while every thread's shard is live, on top of the ended threads' total.
+        updated.wait()
+        assert metrics_utils.render_metrics() == get_expected_metrics(completed_rounds)
+        rendered.wait()
+        for worker_thread in worker_threads:
+            worker_thread.join()
+        # Ended threads' shards are folded into the retired total, not lost.
+        assert metrics_utils.render_metrics() == get_expected_metrics(completed_rounds)
+
+
+def test_label_values_are_escaped(
+        registered_metrics
+):
+    counter, _ = registered_metrics
+    counter.inc('say "hi"\\\n', amount=0.5)
+    assert 'test_requests_total{method="say \\"hi\\"\\\\\\n"} 0.5\n' in \
+        metrics_utils.render_metrics()
+
+
+def test_register_metric_returns_existing(
+        registered_metrics
+):
+    counter, _ = registered_metrics
+    assert metrics_utils.register_metric(
+        metrics_utils.Counter('test_requests_total', 'Other help.')
+    ) is counter
@@ -0,0 +1,86 @@
+"""
+Tests for the plugin manifest: plugins are imported once, and a plugin that
+fails to load is tried again on the next start-up.
+"""
+# Native libraries
+import importlib
+import importlib.metadata
+import sys
+# Custom modules
+from chatt_bot import plugin_utils
+# Non-native libraries
+import pytest
+
+PLUGIN_MODULE = '''
+from chatt_bot import plugin_utils
+
+
+@plugin_utils.register_workflow('say_hello', action_type='command')
+def say_hello():
+    """Says hello."""
+    return 'hello'
+'''
+
+
+@pytest.fixture
+def plugin_entry_point(
+        tmp_path,
+        monkeypatch
+):
+    """Fixture that installs one fake plugin, whose module does not exist yet."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_point = importlib.metadata.EntryPoint(
+        'hello_plugin', 'chatt_bot_hello_plugin', plugin_utils.PLUGIN_ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(
+        plugin_utils,
+        'get_plugin_entry_points',
+        lambda: [('chatt-bot-hello', '1.0', entry_point)]
+    )
+    yield tmp_path / 'chatt_bot_hello_plugin.py'
+    sys.modules.pop('chatt_bot_hello_plugin', None)
+
+
+def test_failed_plugin_is_retried(
+        plugin_entry_point
+):
+    with pytest.warns(UserWarning, match="Skipping chatt_bot plugin 'hello_plugin'"):
+        assert plugin_utils.get_plugin_workflow_specs() == []
+    assert not plugin_utils.is_plugin_manifest_complete()
+    # The import error is fixed without reinstalling the plugin.
+    plugin_entry_point.write_text(PLUGIN_MODULE, encoding='utf-8')
+    importlib.invalidate_caches()
+    workflow_specs = plugin_utils.get_plugin_workflow_specs()
+    assert [workflow_spec['request'] for workflow_spec in workflow_specs] == ['say_hello']
+    assert workflow_specs[0]['target'] == 'chatt_bot_hello_plugin:say_hello'
+    assert plugin_utils.is_plugin_manifest_complete()
+
+
+def test_manifest_is_read_without_importing(
+        plugin_entry_point,
+        monkeypatch
+):
+    plugin_entry_point.write_text(PLUGIN_MODULE, encoding='utf-8')
+    workflow_specs = plugin_utils.get_plugin_workflow_specs()
+
+    def refuse_import(
+            entry_point
+    ):
+        raise AssertionError(f'{entry_point.name} was imported again.')
+    monkeypatch.setattr(plugin_utils, 'load_entry_point_specs', refuse_import)
+    assert plugin_utils.get_plugin_workflow_specs() == workflow_specs
+
+
+def test_unwritable_manifest_is_built_in_memory(
+        plugin_entry_point,
+        tmp_path,
+        monkeypatch
+):
+    plugin_entry_point.write_text(PLUGIN_MODULE, encoding='utf-8')
+    monkeypatch.setattr(
+        plugin_utils,
+        'get_manifest_location',
+        lambda: str(tmp_path / 'missing_folder' / 'workflow_plugins.json')
+    )
+    assert len(plugin_utils.get_plugin_workflow_specs()) == 1
+    assert not plugin_utils.is_plugin_manifest_complete()
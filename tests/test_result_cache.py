@@ -0,0 +1,223 @@
+"""
+Tests for the result cache: canonical keys, expiry, artifact copies, least
+recently used eviction by size, and cached BotAction runs.
+"""
+# Native libraries
+import os
+import time
+# Custom modules
+from chatt_bot import plugin_utils
+from chatt_bot import result_cache
+from chatt_bot import robot_actions
+from chatt_bot import run_history
+# Non-native libraries
+import pytest
+
+
+def set_last_used(
+        cache,
+        cache_key,
+        last_used
+):
+    """Function that backdates when a cache entry was last used."""
+    os.utime(
+        os.path.join(cache.cache_location, cache_key, result_cache.RESULT_FILE_NAME),
+        (last_used, last_used)
+    )
+
+
+def test_cache_key_is_canonical():
+    cache_key = result_cache.get_cache_key(
+        'command', 'gen_comm', (), {'command': ['ls', '-l'], 'timeout': 2}
+    )
+    assert cache_key == result_cache.get_cache_key(
+        'command', 'gen_comm', [], {'timeout': 2, 'command': ('ls', '-l')}
+    )
+    assert cache_key != result_cache.get_cache_key(
+        'command', 'gen_comm', (), {'command': ['ls', '-l'], 'timeout': 3}
+    )
+    assert cache_key != result_cache.get_cache_key(
+        'command', 'other_request', (), {'command': ['ls', '-l'], 'timeout': 2}
+    )
+    assert cache_key != result_cache.get_cache_key(
+        'command', 'gen_comm', ('ls',), {'command': ['ls', '-l'], 'timeout': 2}
+    )
+
+
+def test_cache_key_hashes_unserializable_arguments():
+    assert result_cache.get_cache_key('a', 'b', (), {'value': {1, 2}}) == \
+        result_cache.get_cache_key('a', 'b', (), {'value': {1, 2}})
+
+
+def test_put_then_get(
+        tmp_path
+):
+    cache = result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    assert cache.get('missing') is None
+    cache.put('key', {'rows': [1, 2, 3]}, ttl=60)
+    cache_entry = cache.get('key')
+    assert cache_entry['result'] == {'rows': [1, 2, 3]}
+    assert cache_entry['expires'] - cache_entry['created'] == 60
+    # Storing again replaces the entry.
+    cache.put('key', {'rows': []}, ttl=60)
+    assert cache.get('key')['result'] == {'rows': []}
+    assert not [name for name in os.listdir(cache.cache_location) if name.endswith('.tmp')]
+
+
+def test_expired_entry_is_removed(
+        tmp_path
+):
+    cache = result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    cache.put('key', 'result', ttl=-1)
+    assert cache.get('key') is None
+    assert not os.path.exists(os.path.join(cache.cache_location, 'key'))
+
+
+def test_artifacts_are_copied(
+        tmp_path
+):
+    cache = result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    artifact = tmp_path / 'screenshot.png'
+    artifact.write_bytes(b'png bytes')
+    cache.put('key', {'artifacts': [str(artifact)]}, ttl=60)
+    artifact.unlink()
+    cached_artifacts = cache.get('key')['result']['artifacts']
+    assert len(cached_artifacts) == 1
+    assert cached_artifacts[0].startswith(os.path.join(cache.cache_location, 'key'))
+    with open(cached_artifacts[0], 'rb') as cached_file:
+        assert cached_file.read() == b'png bytes'
+
+
+def test_evicts_least_recently_used_by_size(
+        tmp_path
+):
+    cache = result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    payload = 'x' * 1000
+    for cache_key in ['oldest', 'middle', 'newest']:
+        cache.put(cache_key, payload, ttl=60)
+    entry_size = result_cache.get_folder_size(os.path.join(cache.cache_location, 'oldest'))
+    now = time.time()
+    set_last_used(cache, 'oldest', now - 300)
+    set_last_used(cache, 'middle', now - 200)
+    set_last_used(cache, 'newest', now - 100)
+    # Reading the oldest entry makes it the most recently used.
+    assert cache.get('oldest') is not None
+    # Room for two entries, whose sizes differ by a few bytes of timestamp.
+    cache.max_bytes = entry_size * 2 + 100
+    cache.evict()
+    assert cache.get('middle') is None
+    assert cache.get('oldest') is not None
+    assert cache.get('newest') is not None
+
+
+def test_evicts_expired_before_least_recently_used(
+        tmp_path
+):
+    cache = result_cache.ResultCache(
+        cache_location=str(tmp_path / 'results'),
+        max_bytes=10 ** 6
+    )
+    cache.put('fresh', 'result', ttl=60)
+    cache.put('stale', 'result', ttl=-1)
+    cache.evict()
+    assert sorted(os.listdir(cache.cache_location)) == ['fresh']
+
+
+def test_clear(
+        tmp_path
+):
+    cache = result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    cache.put('key', 'result', ttl=60)
+    cache.clear()
+    assert cache.get('key') is None
+    assert os.listdir(cache.cache_location) == []
+
+
+def test_put_scans_folder_only_past_max_bytes(
+        tmp_path,
+        monkeypatch
+):
+    cache = result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    evictions = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda **kwargs: evictions.append(evict(**kwargs)))
+    cache.put('first', 'x' * 1000, ttl=60)
+    # The first put scans the folder, to learn its size.
+    assert len(evictions) == 1
+    entry_size = result_cache.get_folder_size(os.path.join(cache.cache_location, 'first'))
+    cache.max_bytes = entry_size * 10
+    for entry_number in range(8):
+        cache.put(f'entry_{entry_number}', 'x' * 1000, ttl=60)
+    assert len(evictions) == 1
+    # Replacing an entry doesn't grow the cache.
+    cache.put('first', 'x' * 1000, ttl=60)
+    assert len(evictions) == 1
+    cache.put('entry_8', 'x' * 1000, ttl=60)
+    cache.put('entry_9', 'x' * 1000, ttl=60)
+    assert len(evictions) == 2
+    # Eviction leaves headroom under max_bytes.
+    assert len(os.listdir(cache.cache_location)) < 10
+
+
+@pytest.fixture
+def cached_workflow(
+        tmp_path,
+        monkeypatch
+):
+    """Fixture that registers a cacheable workflow, yielding the calls it gets."""
+    workflow_calls = []
+
+    def sum_rows(
+            rows
+    ):
+        workflow_calls.append(rows)
+        return {'total': sum(rows)}
+    builtin_workflows = robot_actions.get_builtin_workflows
+    monkeypatch.setattr(robot_actions, 'get_builtin_workflows', lambda: builtin_workflows() + [
+        plugin_utils.create_workflow_spec(
+            'sum_rows',
+            'tests:sum_rows',
+            arguments={'rows': 'list, required'},
+            cache_ttl=60
+        )
+    ])
+    monkeypatch.setattr(
+        robot_actions,
+        'load_request_workflow',
+        lambda request, use_async=False: sum_rows
+    )
+    monkeypatch.setattr(
+        result_cache,
+        '_RESULT_CACHE',
+        result_cache.ResultCache(cache_location=str(tmp_path / 'results'))
+    )
+    history_store = run_history.RunHistoryStore(str(tmp_path / 'run_history.sqlite3'))
+    monkeypatch.setattr(run_history, '_RUN_HISTORY_STORE', history_store)
+    robot_actions.get_registry.cache_clear()
+    robot_actions.get_argument_schema.cache_clear()
+    yield workflow_calls
+    robot_actions.get_registry.cache_clear()
+    robot_actions.get_argument_schema.cache_clear()
+    history_store.close()
+
+
+def test_bot_action_miss_hit_and_refresh(
+        cached_workflow
+):
+    first_run = robot_actions.BotAction('w', 'sum_rows').execute_action(rows=[1, 2, 3])
+    assert (first_run['cache'], first_run['result']) == ('miss', {'total': 6})
+    second_run = robot_actions.BotAction('w', 'sum_rows').execute_action(rows=[1, 2, 3])
+    assert (second_run['cache'], second_run['result']) == ('hit', {'total': 6})
+    assert cached_workflow == [[1, 2, 3]]
+    # Other arguments are another cache entry.
+    assert robot_actions.BotAction('w', 'sum_rows').execute_action(rows=[4])['cache'] == 'miss'
+    refreshed_run = robot_actions.BotAction(
+        'w', 'sum_rows', refresh_cache=True
+    ).execute_action(rows=[1, 2, 3])
+    assert (refreshed_run['cache'], refreshed_run['result']) == ('refresh', {'total': 6})
+    assert cached_workflow == [[1, 2, 3], [4], [1, 2, 3]]
+    uncached_run = robot_actions.BotAction(
+        'w', 'sum_rows', use_cache=False
+    ).execute_action(rows=[1, 2, 3])
+    assert 'cache' not in uncached_run
+    assert len(cached_workflow) == 4
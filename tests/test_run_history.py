@@ -0,0 +1,185 @@
+"""
+Tests for the run history store, against a temporary database: batched
+writes, filtered queries, aggregates, and the store reset in forked children.
+"""
+# Native libraries
+import datetime
+import os
+# Custom modules
+from chatt_bot import run_history
+# Non-native libraries
+import pytest
+
+START_TIME = datetime.datetime(2026, 10, 12, 8, 30)
+
+
+@pytest.fixture
+def history_store(
+        tmp_path
+):
+    """Fixture that opens a run history store in a temporary database, buffering three runs."""
+    store = run_history.RunHistoryStore(str(tmp_path / 'run_history.sqlite3'), batch_size=3)
+    yield store
+    store.close()
+
+
+def append_run(
+        store,
+        request,
+        run_seconds,
+        start_time=START_TIME,
+        exit_status=0
+):
+    """Function that appends a run of a command request, lasting run_seconds."""
+    store.append(
+        {'action_type': 'command', 'request': request, 'exit_status': exit_status},
+        start_time,
+        start_time + datetime.timedelta(seconds=run_seconds)
+    )
+
+
+def count_written_runs(
+        database_location
+):
+    """Function that counts the runs written to a database, from a new connection."""
+    reader = run_history.RunHistoryStore(database_location)
+    try:
+        return reader._connection.execute(  # pylint: disable=protected-access
+            'SELECT COUNT(*) FROM runs'
+        ).fetchone()[0]
+    finally:
+        reader.close()
+
+
+def test_runs_are_written_in_batches(
+        history_store
+):
+    append_run(history_store, 'gen_comm', 1)
+    append_run(history_store, 'gen_comm', 2)
+    assert count_written_runs(history_store.database_location) == 0
+    append_run(history_store, 'gen_comm', 3)
+    assert count_written_runs(history_store.database_location) == 3
+    append_run(history_store, 'gen_comm', 4)
+    history_store.flush()
+    assert count_written_runs(history_store.database_location) == 4
+
+
+def test_batched_restores_batch_size(
+        history_store
+):
+    with history_store.batched(10):
+        for run_number in range(5):
+            append_run(history_store, 'gen_comm', run_number)
+        assert count_written_runs(history_store.database_location) == 0
+    assert count_written_runs(history_store.database_location) == 5
+    assert history_store.batch_size == 3
+
+
+def test_query_filters_and_orders(
+        history_store
+):
+    for day in range(5):
+        append_run(
+            history_store,
+            'gen_comm' if day % 2 else 'other',
+            day,
+            start_time=START_TIME + datetime.timedelta(days=day),
+            exit_status=day
+        )
+    # Queries read runs still buffered.
+    assert [run['exit_status'] for run in history_store.query()] == [4, 3, 2, 1, 0]
+    assert [run['exit_status'] for run in history_store.query(request='gen_comm')] == [3, 1]
+    assert [run['exit_status'] for run in history_store.query(
+        since='2026-10-13', until='2026-10-15'
+    )] == [2, 1]
+    assert [run['exit_status'] for run in history_store.query(limit=2)] == [4, 3]
+    assert history_store.query(action_type='workflow') == []
+    assert history_store.query(request='other', limit=1)[0] == {
+        'action_type': 'command',
+        'request': 'other',
+        'start_time': (START_TIME + datetime.timedelta(days=4)).strftime('%c'),
+        'run_time': 4.0,
+        'exit_status': 4
+    }
+
+
+def test_aggregate(
+        history_store
+):
+    for run_seconds in range(1, 21):
+        append_run(history_store, 'gen_comm', run_seconds)
+    append_run(history_store, 'other', 7)
+    aggregates = history_store.aggregate()
+    assert aggregates == [
+        {
+            'action_type': 'command',
+            'request': 'gen_comm',
+            'count': 20,
+            'mean': 10.5,
+            'p50': 11.0,
+            'p95': 20.0,
+            'max': 20.0
+        },
+        {
+            'action_type': 'command',
+            'request': 'other',
+            'count': 1,
+            'mean': 7.0,
+            'p50': 7.0,
+            'p95': 7.0,
+            'max': 7.0
+        }
+    ]
+    assert history_store.aggregate(request='other') == aggregates[1:]
+    assert history_store.aggregate(since='2026-10-13') == []
+
+
+def test_parse_history_time():
+    assert run_history.parse_history_time(None) is None
+    assert run_history.parse_history_time('2026-10-12T08:30') == START_TIME.timestamp()
+    assert abs(
+        run_history.parse_history_time('12h')
+        - (datetime.datetime.now().timestamp() - 12 * 3600)
+    ) < 5
+    with pytest.raises(ValueError, match='ISO format'):
+        run_history.parse_history_time('yesterday')
+
+
+def test_synchronous_mode_is_checked(
+        tmp_path
+):
+    with pytest.raises(ValueError, match='synchronous'):
+        run_history.RunHistoryStore(str(tmp_path / 'run_history.sqlite3'), synchronous='SOMETIMES')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Needs os.fork.')
+def test_forked_child_opens_its_own_store(
+        tmp_path,
+        monkeypatch
+):
+    parent_store = run_history.RunHistoryStore(
+        str(tmp_path / 'run_history.sqlite3'),
+        batch_size=10
+    )
+    monkeypatch.setattr(run_history, '_RUN_HISTORY_STORE', parent_store)
+    append_run(parent_store, 'gen_comm', 1)
+    child_pid = os.fork()
+    if child_pid == 0:
+        # The child drops the parent's store, so opens (and writes to) its own.
+        child_status = 0
+        try:
+            if run_history._RUN_HISTORY_STORE is not None:  # pylint: disable=protected-access
+                child_status = 1
+            elif run_history.get_run_history_store(
+                    database_location=str(tmp_path / 'child.sqlite3')
+            ) is parent_store:
+                child_status = 2
+        except Exception:  # pylint: disable=broad-except
+            child_status = 3
+        os._exit(child_status)  # pylint: disable=protected-access
+    _, wait_status = os.waitpid(child_pid, 0)
+    assert os.waitstatus_to_exitcode(wait_status) == 0
+    # The parent's store, and the run it buffered, are untouched.
+    assert run_history.get_run_history_store() is parent_store
+    parent_store.close()
+    assert count_written_runs(parent_store.database_location) == 1
@@ -0,0 +1,49 @@
+"""
+Benchmark of the scraping engine against a saved-pages corpus, reporting
+pages/sec and peak memory (run with -s to see the report).
+"""
+# Custom modules
+from chatt_bot import scrape_utils
+
+CORPUS_PAGES = 10
+RECORDS_PER_PAGE = 200
+
+
+def write_corpus(
+        corpus_folder
+):
+    """Function that saves a corpus of listing pages, like those the workflows scrape."""
+    rows = ''.join(
+        f'<tr class="listing"><td class="name">Place {row}</td>'
+        f'<td><a href="/place/{row}">details</a></td></tr>'
+        '<tr class="ad"><td>Sponsored</td></tr>'
+        for row in range(RECORDS_PER_PAGE)
+    )
+    for page_number in range(CORPUS_PAGES):
+        (corpus_folder / f'page_{page_number}.html').write_text(
+            f'<html><head><title>Listings</title></head><body><table>{rows}</table></body></html>',
+            encoding='utf-8'
+        )
+
+
+def test_benchmark_corpus(
+        tmp_path
+):
+    write_corpus(tmp_path)
+    fields = {'name': 'td.name', 'link': ('a', 'href')}
+    for stream in (False, True):
+        benchmark = scrape_utils.benchmark_corpus(
+            str(tmp_path),
+            'tr',
+            fields,
+            record_attrs={'class': 'listing'},
+            stream=stream
+        )
+        print(
+            f"\nstream={stream}: {benchmark['pages_per_second']:.1f} pages/s, "
+            f"peak memory {benchmark['peak_memory_mb']:.1f} MB"
+        )
+        assert benchmark['pages'] == CORPUS_PAGES
+        assert benchmark['records'] == CORPUS_PAGES * RECORDS_PER_PAGE
+        assert benchmark['pages_per_second'] > 0
+        assert benchmark['peak_memory_mb'] > 0
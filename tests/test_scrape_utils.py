@@ -0,0 +1,49 @@
+"""
+Tests for the scraping engine: both record paths give the same records, and
+streaming falls back without lxml.
+"""
+# Custom modules
+from chatt_bot import scrape_utils
+# Non-native libraries
+import pytest
+
+PAGE = (
+    '<html><body><table>'
+    '<tr class="listing featured"><td class="name">Rock City</td>'
+    '<td><a href="/place/1">details</a></td></tr>'
+    '<tr class="ad"><td class="name">Sponsored</td></tr>'
+    '<tr class="listing"><td class="name">Ruby Falls</td><td>no link</td></tr>'
+    '</table></body></html>'
+)
+FIELDS = {'name': 'td.name', 'link': ('a', 'href')}
+EXPECTED_RECORDS = [
+    {'name': 'Rock City', 'link': '/place/1'},
+    {'name': 'Ruby Falls', 'link': None}
+]
+
+
+@pytest.mark.parametrize('parser', ['html.parser', None])
+def test_partial_tree_records(
+        parser
+):
+    assert list(scrape_utils.iter_records(
+        PAGE, 'tr', FIELDS, record_attrs={'class': 'listing'}, parser=parser
+    )) == EXPECTED_RECORDS
+
+
+def test_streamed_records():
+    pytest.importorskip('lxml')
+    assert list(scrape_utils.iter_records(
+        PAGE, 'tr', FIELDS, record_attrs={'class': 'listing'}, stream=True
+    )) == EXPECTED_RECORDS
+
+
+def test_stream_falls_back_without_lxml(
+        monkeypatch
+):
+    monkeypatch.setattr(scrape_utils, 'is_lxml_available', lambda: False)
+    with pytest.warns(UserWarning, match='lxml'):
+        assert list(scrape_utils.iter_records(
+            PAGE, 'tr', FIELDS, record_attrs={'class': 'listing'},
+            parser='html.parser', stream=True
+        )) == EXPECTED_RECORDS
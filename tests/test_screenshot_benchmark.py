@@ -0,0 +1,116 @@
+"""
+Benchmark comparing the wall time of save_driver_screenshot with the old
+fixed 3-6 second sleep against waiting for the page to be ready (run with -s
+to see the report). Needs a local Chrome, so it is skipped where none is installed.
+"""
+# Native libraries
+import functools
+import http.server
+import os
+import shutil
+import threading
+import time
+# Custom modules
+from chatt_bot import selenium_utils
+# Non-native libraries
+import pytest
+
+PAGE_COUNT = 4
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+pytestmark = pytest.mark.skipif(
+    not any(shutil.which(chrome_binary) for chrome_binary in CHROME_BINARIES),
+    reason='Chrome is not installed.'
+)
+
+
+class QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Class that serves files without logging each request."""
+    def log_message(  # pylint: disable=arguments-differ
+            self,
+            *args
+    ):
+        pass
+
+
+@pytest.fixture
+def page_urls(
+        tmp_path
+):
+    """Fixture that serves PAGE_COUNT pages which finish rendering after a short delay."""
+    served_folder = tmp_path / 'served'
+    served_folder.mkdir()
+    for page_number in range(PAGE_COUNT):
+        (served_folder / f'page_{page_number}.html').write_text(
+            f'<html><body><h1>Page {page_number}</h1><div id="late"></div>'
+            '<script>setTimeout(function () {'
+            'document.getElementById("late").textContent = "ready";}, 300);</script>'
+            '</body></html>',
+            encoding='utf-8'
+        )
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        functools.partial(QuietRequestHandler, directory=str(served_folder))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield [
+            f'http://127.0.0.1:{server.server_address[1]}/page_{page_number}.html'
+            for page_number in range(PAGE_COUNT)
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def time_screenshots(
+        driver,
+        page_urls,
+        save_path_location,
+        throttle=None
+):
+    """
+    Function that loads each page, timing only the screenshot call.
+
+    :return: float:
+            Seconds spent in save_driver_screenshot.
+    """
+    os.makedirs(save_path_location)
+    screenshot_time = 0.0
+    for page_number, page_url in enumerate(page_urls):
+        selenium_utils.driver_get_call(driver, page_url)
+        start_time = time.perf_counter()
+        selenium_utils.save_driver_screenshot(
+            driver,
+            save_path_location,
+            f'page_{page_number}',
+            throttle=throttle
+        )
+        screenshot_time += time.perf_counter() - start_time
+    return screenshot_time
+
+
+def test_screenshot_wall_time(
+        tmp_path,
+        page_urls
+):
+    driver = selenium_utils.create_chrome_driver(is_headless=True)
+    try:
+        # Before: the fixed 3-6 second sleep ahead of every screenshot.
+        sleep_time = time_screenshots(
+            driver,
+            page_urls,
+            str(tmp_path / 'fixed_sleep'),
+            throttle=selenium_utils.ThrottlePolicy(3, 6)
+        )
+        # After: waiting only until the page is ready.
+        ready_time = time_screenshots(driver, page_urls, str(tmp_path / 'readiness_wait'))
+    finally:
+        driver.quit()
+    print(
+        f'\n{PAGE_COUNT} screenshots: fixed sleep {sleep_time:.1f}s, '
+        f'readiness wait {ready_time:.1f}s'
+    )
+    for screenshot_folder in ['fixed_sleep', 'readiness_wait']:
+        assert len(list((tmp_path / screenshot_folder).glob('*.png'))) == PAGE_COUNT
+    assert ready_time < sleep_time
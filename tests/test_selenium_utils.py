@@ -0,0 +1,299 @@
+"""
+Tests for the selenium helpers that don't need a browser: chrome driver
+resolution, and the driver pool (run against fake drivers).
+"""
+# Native libraries
+import json
+import os
+import threading
+import types
+# Custom modules
+from chatt_bot import selenium_utils
+# Non-native libraries
+import pytest
+
+
+@pytest.fixture
+def driver_manager(
+        tmp_path,
+        monkeypatch
+):
+    """Fixture that resolves drivers to a fake executable, caching in a temporary folder."""
+    driver_path = tmp_path / 'chromedriver'
+    driver_path.write_text('', encoding='utf-8')
+    installs = []
+
+    def install():
+        installs.append(str(driver_path))
+        return str(driver_path)
+    # Stands in for ChromeDriverManager, counting installs.
+    monkeypatch.setattr(
+        selenium_utils,
+        'ChromeDriverManager',
+        lambda: types.SimpleNamespace(install=install)
+    )
+    monkeypatch.setattr(
+        selenium_utils,
+        'get_driver_cache_location',
+        lambda: str(tmp_path / 'chromedriver_paths.json')
+    )
+    monkeypatch.setattr(selenium_utils, '_RESOLVED_DRIVER_PATHS', {})
+    return str(driver_path), installs, str(tmp_path / 'chromedriver_paths.json')
+
+
+def test_resolved_driver_is_cached_on_disk(
+        driver_manager,
+        monkeypatch
+):
+    driver_path, installs, cache_location = driver_manager
+    assert selenium_utils.resolve_chrome_driver_path('120.0.1') == driver_path
+    with open(cache_location, 'r', encoding='utf-8') as cache_file:
+        assert json.load(cache_file) == {
+            '120.0.1': {'driver_path': driver_path, 'browser_version': '120.0.1'}
+        }
+    # A new process reads the cache instead of asking the manager.
+    monkeypatch.setattr(selenium_utils, '_RESOLVED_DRIVER_PATHS', {})
+    assert selenium_utils.resolve_chrome_driver_path('120.0.1') == driver_path
+    assert len(installs) == 1
+    assert [name for name in os.listdir(os.path.dirname(cache_location))
+            if name.endswith('.tmp')] == []
+
+
+def test_new_browser_version_is_resolved_again(
+        driver_manager
+):
+    _, installs, cache_location = driver_manager
+    selenium_utils.resolve_chrome_driver_path('120.0.1')
+    selenium_utils.resolve_chrome_driver_path('121.0.2')
+    assert len(installs) == 2
+    with open(cache_location, 'r', encoding='utf-8') as cache_file:
+        assert sorted(json.load(cache_file)) == ['120.0.1', '121.0.2']
+
+
+def test_unknown_browser_version_is_not_cached_on_disk(
+        driver_manager,
+        monkeypatch
+):
+    driver_path, installs, cache_location = driver_manager
+    monkeypatch.setattr(selenium_utils, 'get_chrome_version', lambda: None)
+    assert selenium_utils.resolve_chrome_driver_path() == driver_path
+    assert not os.path.exists(cache_location)
+    # Another process can't check a cached driver, so asks the manager again.
+    monkeypatch.setattr(selenium_utils, '_RESOLVED_DRIVER_PATHS', {})
+    selenium_utils.resolve_chrome_driver_path()
+    assert len(installs) == 2
+
+
+class FakeDriver:
+    """Class that stands in for a chrome driver, recording what the pool does to it."""
+    def __init__(
+            self,
+            heap_bytes=0
+    ):
+        self.heap_bytes = heap_bytes
+        self.healthy = True
+        self.quit_calls = 0
+        self.reset_calls = 0
+        self.window_handles = ['main']
+        self.switch_to = types.SimpleNamespace(window=lambda handle: None)
+
+    @property
+    def current_url(
+            self
+    ):
+        """The current page, which fails once the browser has died."""
+        if not self.healthy:
+            raise ConnectionError('The browser is gone.')
+        return 'about:blank'
+
+    def delete_all_cookies(
+            self
+    ):
+        pass
+
+    def execute_script(
+            self,
+            script
+    ):
+        """Function that answers the pool's heap query, ignoring other scripts."""
+        return self.heap_bytes if 'usedJSHeapSize' in script else None
+
+    def get(
+            self,
+            url
+    ):
+        """Function that counts the pool's resets, which end on about:blank."""
+        if url == 'about:blank':
+            self.reset_calls += 1
+
+    def quit(
+            self
+    ):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def launched_drivers():
+    """Fixture that lists every fake driver the pool launches."""
+    return []
+
+
+@pytest.fixture
+def make_pool(
+        launched_drivers
+):
+    """Fixture that builds pools launching fake drivers, closing them after the test."""
+    pools = []
+
+    def make(
+            heap_bytes=0,
+            **kwargs
+    ):
+        def driver_factory():
+            launched_drivers.append(FakeDriver(heap_bytes=heap_bytes))
+            return launched_drivers[-1]
+        pools.append(selenium_utils.ChromeDriverPool(driver_factory=driver_factory, **kwargs))
+        return pools[-1]
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_checkout_reuses_returned_driver(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=2)
+    assert pool.alive == 0
+    first_driver = pool.checkout()
+    assert (pool.alive, pool.in_use) == (1, 1)
+    pool.checkin(first_driver)
+    assert first_driver.reset_calls == 1
+    assert pool.checkout() is first_driver
+    assert len(launched_drivers) == 1
+
+
+def test_warm_launches_until_full(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=3)
+    pool.warm()
+    assert pool.alive == 3
+    assert len(launched_drivers) == 3
+    pool.warm()
+    assert len(launched_drivers) == 3
+
+
+def test_recycles_after_max_uses(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=1, max_uses=2)
+    for _ in range(2):
+        with pool.driver() as pooled_driver:
+            assert pooled_driver is launched_drivers[0]
+    assert launched_drivers[0].quit_calls == 1
+    with pool.driver() as pooled_driver:
+        assert pooled_driver is launched_drivers[1]
+    assert pool.alive == 1
+
+
+def test_recycles_over_memory_ceiling(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=1, max_memory_mb=1, heap_bytes=2 * 1024 * 1024)
+    with pool.driver():
+        pass
+    assert launched_drivers[0].quit_calls == 1
+    assert pool.alive == 0
+
+
+def test_replaces_dead_idle_driver(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=1)
+    with pool.driver():
+        pass
+    launched_drivers[0].healthy = False
+    assert pool.checkout() is launched_drivers[1]
+    assert launched_drivers[0].quit_calls == 1
+    assert pool.alive == 1
+
+
+def test_failing_use_discards_driver(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=1)
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError('The workflow failed.')
+    assert launched_drivers[0].quit_calls == 1
+    assert (pool.alive, pool.in_use) == (0, 0)
+
+
+def test_checkout_waits_for_a_free_driver(
+        make_pool
+):
+    pool = make_pool(size=1)
+    pooled_driver = pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.05)
+    threading.Timer(0.1, pool.checkin, args=(pooled_driver,)).start()
+    assert pool.checkout(timeout=10) is pooled_driver
+
+
+def test_failed_launch_frees_its_slot():
+    def failing_factory():
+        raise OSError('chrome is not installed')
+    pool = selenium_utils.ChromeDriverPool(size=1, driver_factory=failing_factory)
+    with pytest.raises(OSError):
+        pool.checkout(timeout=1)
+    assert pool.alive == 0
+
+
+def test_close_quits_idle_and_returned_drivers(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=2)
+    idle_driver = pool.checkout()
+    borrowed_driver = pool.checkout()
+    pool.checkin(idle_driver)
+    pool.close()
+    assert idle_driver.quit_calls == 1
+    assert borrowed_driver.quit_calls == 0
+    pool.checkin(borrowed_driver)
+    assert borrowed_driver.quit_calls == 1
+    assert pool.alive == 0
+    with pytest.raises(RuntimeError):
+        pool.checkout(timeout=1)
+
+
+def test_concurrent_use_stays_within_size(
+        make_pool,
+        launched_drivers
+):
+    pool = make_pool(size=2, max_uses=7)
+    alive_counts = []
+    alive_counts_lock = threading.Lock()
+
+    def use_pool():
+        for _ in range(25):
+            with pool.driver(timeout=30):
+                with alive_counts_lock:
+                    alive_counts.append(pool.alive)
+    worker_threads = [threading.Thread(target=use_pool) for _ in range(8)]
+    for worker_thread in worker_threads:
+        worker_thread.start()
+    for worker_thread in worker_threads:
+        worker_thread.join()
+    assert max(alive_counts) <= 2
+    assert len(alive_counts) == 200
+    pool.close()
+    # Every launched driver was quit exactly once, either recycled or at close.
+    assert [fake_driver.quit_calls for fake_driver in launched_drivers] == \
+        [1] * len(launched_drivers)